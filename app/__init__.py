@@ -31,6 +31,12 @@ def create_app():
         database_url = database_url.replace('postgres://', 'postgresql://', 1)
     app.config['SQLALCHEMY_DATABASE_URI'] = database_url
     app.config['SQLALCHEMY_TRACK_MODIFICATIONS'] = False
+    # Use PostgreSQL COPY for bulk roster imports/exports (set PG_COPY=false to force the generic path)
+    app.config['PG_COPY_ENABLED'] = os.environ.get('PG_COPY', 'true').lower() in ['1', 'true', 'yes', 'on']
+    # Comma-separated rink names counted as home games in the standings (e.g., HOME_RINKS="Bayonne Rink,Bayonne Rink 2")
+    app.config['HOME_RINKS'] = [rink.strip() for rink in os.environ.get('HOME_RINKS', '').split(',') if rink.strip()]
+    # Live score streams per process; each holds a worker thread, so keep this below gunicorn's --threads
+    app.config['LIVE_STREAM_LIMIT'] = int(os.environ.get('LIVE_STREAM_LIMIT', 4))
     
     # UAT flag for gated UI rollouts
     # Set env var UAT_UI=true to enable the redesigned mobile UI in UAT
@@ -80,6 +86,14 @@ def create_app():
         # Create all database tables
         db.create_all()
 
+        # Pick the roster full-text search backend (FTS5 / tsvector, created by migration)
+        from app.search_utils import init_search_index
+        init_search_index(app)
+
+        # Offline bulk data commands (flask roster/contacts/files ...)
+        from app.cli import register_cli
+        register_cli(app)
+
         # Expose UAT flag to all templates
         @app.context_processor
         def inject_uat_flag():
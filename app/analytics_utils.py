@@ -0,0 +1,357 @@
+"""
+Advanced player metrics.
+
+For every (player, team) pair of a season the metrics are rolling 5-game
+point averages, goals by period and goal-type shares. They are computed for
+the whole season in three set-based queries: one per-game points series
+averaged with a window function, one goal breakdown grouped by period and
+goal type, and one player lookup. No per-player loop touches the database.
+
+The season's metrics are cached as one JSON payload in a
+PlayerAnalyticsSnapshot row. Mapper hooks drop the cached season when its
+games, goals or assists change, and drop every season when players or team
+memberships change. The analytics endpoint serves the stored payload.
+"""
+
+import json
+from collections import defaultdict
+from datetime import datetime
+
+from sqlalchemy import event
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import Session, object_session
+
+from app import db
+from app.models import Player, PlayerTeam, Game, Goal, Assist, PlayerAnalyticsSnapshot
+
+# Number of games in the rolling point average
+ROLLING_WINDOW = 5
+# Goal.period values and their labels (4 is overtime)
+PERIOD_LABELS = {1: '1', 2: '2', 3: '3', 4: 'OT'}
+# Label for goals recorded without a goal type
+UNKNOWN_GOAL_TYPE = 'unspecified'
+
+# Columns that move a game in or out of a (player, team) series
+ANALYTICS_GAME_FIELDS = ('team_name', 'season', 'game_date', 'game_status')
+# Player columns copied into the payload or deciding its teams
+ANALYTICS_PLAYER_FIELDS = ('first_name', 'last_name', 'jersey_number', 'team')
+
+
+def _season_games(season):
+    return [Game.season == season, Game.game_status == 'completed']
+
+
+def _per_game_counts(model, player_column, label):
+    # Goals or assists per (player, game)
+    return db.select(
+        model.game_id.label('game_id'),
+        player_column.label('player_id'),
+        db.func.count(model.id).label(label)
+    ).group_by(model.game_id, player_column).subquery(f'game_{label}')
+
+
+def player_game_points_query(season):
+    """
+    Build the per-game points series of every (player, team) pair in a season.
+
+    Every completed game of a team yields a row for each of its players (zero
+    when they did not score), and rolling_points is AVG(points) over the
+    pair's last ROLLING_WINDOW games via a ROWS window frame.
+
+    Args:
+        season: Season of the games (Game.season), e.g., "2024-25"
+
+    Returns:
+        Select: player_id, team_name, game_id, game_date, goals, assists,
+        points and rolling_points, ordered by pair and game date
+    """
+    memberships = db.union(
+        db.select(Player.id.label('player_id'), Player.team.label('team_name')),
+        db.select(PlayerTeam.player_id, PlayerTeam.team_name)
+    ).subquery('player_teams')
+    goal_counts = _per_game_counts(Goal, Goal.scorer_id, 'goals')
+    assist_counts = _per_game_counts(Assist, Assist.assister_id, 'assists')
+
+    goals = db.func.coalesce(goal_counts.c.goals, 0)
+    assists = db.func.coalesce(assist_counts.c.assists, 0)
+    points = goals + assists
+    game_order = (Game.game_date, Game.id)
+    return db.select(
+        memberships.c.player_id,
+        memberships.c.team_name,
+        Game.id.label('game_id'),
+        Game.game_date,
+        goals.label('goals'),
+        assists.label('assists'),
+        points.label('points'),
+        db.func.avg(points).over(
+            partition_by=(memberships.c.player_id, memberships.c.team_name),
+            order_by=game_order,
+            rows=(-(ROLLING_WINDOW - 1), 0)
+        ).label('rolling_points')
+    ).select_from(memberships) \
+        .join(Game, Game.team_name == memberships.c.team_name) \
+        .outerjoin(goal_counts, db.and_(goal_counts.c.game_id == Game.id,
+                                        goal_counts.c.player_id == memberships.c.player_id)) \
+        .outerjoin(assist_counts, db.and_(assist_counts.c.game_id == Game.id,
+                                          assist_counts.c.player_id == memberships.c.player_id)) \
+        .where(*_season_games(season)) \
+        .order_by(memberships.c.player_id, memberships.c.team_name, *game_order)
+
+
+def goal_breakdown_query(season):
+    """
+    Count a season's goals per scorer, team, period and goal type.
+
+    Returns:
+        Select: player_id, team_name, period, goal_type and goals
+    """
+    return db.select(
+        Goal.scorer_id.label('player_id'),
+        Game.team_name,
+        Goal.period,
+        Goal.goal_type,
+        db.func.count(Goal.id).label('goals')
+    ).join(Game, Goal.game_id == Game.id) \
+        .where(*_season_games(season)) \
+        .group_by(Goal.scorer_id, Game.team_name, Goal.period, Goal.goal_type)
+
+
+def _period_label(period):
+    return PERIOD_LABELS.get(period, str(period))
+
+
+def _shares(counts):
+    """Turn {key: count} into {key: {'goals': count, 'share': fraction}}."""
+    total = sum(counts.values())
+    return {key: {'goals': count, 'share': round(count / total, 3) if total else 0.0}
+            for key, count in sorted(counts.items())}
+
+
+def _per_game(total, games):
+    return round(total / games, 2) if games else 0.0
+
+
+def compute_player_analytics(season):
+    """
+    Compute the advanced metrics of every (player, team) pair in a season.
+
+    Args:
+        season: Season of the games (Game.season), e.g., "2024-25"
+
+    Returns:
+        dict: season, rolling_window, players (one entry per pair, sorted by
+        points) and club-wide period and goal-type totals
+    """
+    series = defaultdict(list)
+    for row in db.session.execute(player_game_points_query(season)):
+        series[(row.player_id, row.team_name)].append({
+            'game_id': row.game_id,
+            'game_date': row.game_date.isoformat() if hasattr(row.game_date, 'isoformat') else str(row.game_date),
+            'goals': int(row.goals),
+            'assists': int(row.assists),
+            'points': int(row.points),
+            'rolling_points': round(float(row.rolling_points), 2)
+        })
+
+    periods = defaultdict(lambda: defaultdict(int))
+    goal_types = defaultdict(lambda: defaultdict(int))
+    club_periods = defaultdict(int)
+    club_goal_types = defaultdict(int)
+    for row in db.session.execute(goal_breakdown_query(season)):
+        key = (row.player_id, row.team_name)
+        period = _period_label(row.period)
+        goal_type = row.goal_type or UNKNOWN_GOAL_TYPE
+        periods[key][period] += row.goals
+        goal_types[key][goal_type] += row.goals
+        club_periods[period] += row.goals
+        club_goal_types[goal_type] += row.goals
+
+    player_ids = sorted({player_id for player_id, _ in series})
+    players = {player.id: player for player in db.session.execute(
+        db.select(Player.id, Player.first_name, Player.last_name, Player.jersey_number)
+        .where(Player.id.in_(player_ids))
+    )} if player_ids else {}
+
+    entries = []
+    for (player_id, team_name), games in series.items():
+        player = players.get(player_id)
+        if player is None:
+            continue
+        goals = sum(game['goals'] for game in games)
+        assists = sum(game['assists'] for game in games)
+        entries.append({
+            'player_id': player_id,
+            'name': f"{player.first_name} {player.last_name}",
+            'jersey_number': player.jersey_number,
+            'team_name': team_name,
+            'games_played': len(games),
+            'goals': goals,
+            'assists': assists,
+            'points': goals + assists,
+            'goals_per_game': _per_game(goals, len(games)),
+            'points_per_game': _per_game(goals + assists, len(games)),
+            'rolling_points_avg': games[-1]['rolling_points'],
+            'rolling_points': games,
+            'periods': _shares(periods.get((player_id, team_name), {})),
+            'goal_types': _shares(goal_types.get((player_id, team_name), {}))
+        })
+    entries.sort(key=lambda entry: (-entry['points'], -entry['rolling_points_avg'], entry['name'], entry['team_name']))
+
+    return {
+        'season': season,
+        'rolling_window': ROLLING_WINDOW,
+        'players': entries,
+        'totals': {
+            'periods': _shares(club_periods),
+            'goal_types': _shares(club_goal_types)
+        }
+    }
+
+
+### Cache maintenance ###
+
+def invalidate_player_analytics(seasons=None):
+    """
+    Drop cached analytics so they are recomputed on the next read.
+
+    Writes go through Core statements so this is safe to call while a flush is
+    finishing.
+
+    Args:
+        seasons: Iterable of seasons to drop, or None to drop every season
+    """
+    snapshot_table = PlayerAnalyticsSnapshot.__table__
+    if seasons is None:
+        db.session.execute(snapshot_table.delete())
+        return
+    seasons = sorted({season for season in seasons if season})
+    if seasons:
+        db.session.execute(snapshot_table.delete().where(snapshot_table.c.season.in_(seasons)))
+
+
+def mark_analytics_dirty(session, seasons=(), game_ids=(), all_seasons=False):
+    """Queue seasons (or the seasons of games) whose cached analytics must be dropped when the session next flushes."""
+    if all_seasons:
+        session.info['dirty_analytics_all'] = True
+    session.info.setdefault('dirty_analytics_seasons', set()).update(season for season in seasons if season)
+    session.info.setdefault('dirty_analytics_games', set()).update(
+        game_id for game_id in game_ids if game_id is not None)
+
+
+def _attribute_values(target, attribute):
+    """Return the current value of an attribute plus any value it replaced."""
+    history = db.inspect(target).attrs[attribute].history
+    values = set(history.added or ()) | set(history.unchanged or ()) | set(history.deleted or ())
+    values.add(getattr(target, attribute))
+    return values
+
+
+def _attribute_changed(target, attribute):
+    return db.inspect(target).attrs[attribute].history.has_changes()
+
+
+def _player_changed(mapper, connection, target):
+    session = object_session(target)
+    if session is not None:
+        mark_analytics_dirty(session, all_seasons=True)
+
+
+def _player_updated(mapper, connection, target):
+    # Tuition, contact and equipment edits do not show up in the metrics
+    if any(_attribute_changed(target, field) for field in ANALYTICS_PLAYER_FIELDS):
+        _player_changed(mapper, connection, target)
+
+
+def _game_changed(mapper, connection, target):
+    session = object_session(target)
+    if session is not None:
+        mark_analytics_dirty(session, seasons=_attribute_values(target, 'season'))
+
+
+def _game_updated(mapper, connection, target):
+    # Scores, rink and notes do not change the per-player metrics
+    if any(_attribute_changed(target, field) for field in ANALYTICS_GAME_FIELDS):
+        _game_changed(mapper, connection, target)
+
+
+def _game_event_changed(mapper, connection, target):
+    session = object_session(target)
+    if session is not None:
+        mark_analytics_dirty(session, game_ids=_attribute_values(target, 'game_id'))
+
+
+for _model, _insert_delete_listener, _update_listener in (
+        (Player, _player_changed, _player_updated), (PlayerTeam, _player_changed, _player_changed),
+        (Game, _game_changed, _game_updated),
+        (Goal, _game_event_changed, _game_event_changed), (Assist, _game_event_changed, _game_event_changed)):
+    event.listen(_model, 'after_insert', _insert_delete_listener)
+    event.listen(_model, 'after_delete', _insert_delete_listener)
+    event.listen(_model, 'after_update', _update_listener)
+
+
+@event.listens_for(Session, 'after_flush_postexec')
+def _invalidate_dirty_analytics(session, flush_context):
+    all_seasons = session.info.pop('dirty_analytics_all', False)
+    seasons = session.info.pop('dirty_analytics_seasons', set())
+    game_ids = session.info.pop('dirty_analytics_games', set())
+    if all_seasons:
+        invalidate_player_analytics()
+        return
+    if game_ids:
+        # Goals and assists only carry their game; deleted games were queued by season already
+        seasons |= set(session.execute(
+            db.select(Game.season).where(Game.id.in_(sorted(game_ids))).distinct()).scalars())
+    if seasons:
+        invalidate_player_analytics(seasons)
+
+
+### Analytics read path ###
+
+def _stored_payload(season):
+    return db.session.execute(
+        db.select(PlayerAnalyticsSnapshot.payload).where(PlayerAnalyticsSnapshot.season == season)
+    ).scalar()
+
+
+def get_player_analytics_json(season):
+    """
+    Read a season's analytics payload as JSON text, computing and caching it if missing.
+
+    Args:
+        season: Season of the games (Game.season), e.g., "2024-25"
+
+    Returns:
+        str: JSON-encoded payload as built by compute_player_analytics()
+    """
+    payload = _stored_payload(season)
+    if payload is not None:
+        return payload
+
+    payload = json.dumps(compute_player_analytics(season))
+    try:
+        db.session.execute(PlayerAnalyticsSnapshot.__table__.insert().values(
+            season=season, payload=payload, refreshed_at=datetime.utcnow()))
+        db.session.commit()
+    except IntegrityError:
+        # Another request cached the season first; serve theirs
+        db.session.rollback()
+        payload = _stored_payload(season) or payload
+    return payload
+
+
+def get_player_analytics(season, team=None):
+    """
+    Read a season's analytics, optionally only the entries of one team.
+
+    Args:
+        season: Season of the games (Game.season)
+        team: Only keep (player, team) entries of this team (totals stay club-wide)
+
+    Returns:
+        dict: Payload as built by compute_player_analytics()
+    """
+    analytics = json.loads(get_player_analytics_json(season))
+    if team:
+        analytics['players'] = [entry for entry in analytics['players'] if entry['team_name'] == team]
+    return analytics
@@ -0,0 +1,139 @@
+"""
+Set-based bulk actions on players.
+
+Bulk actions run as single UPDATE/DELETE statements over a set of player IDs
+instead of loading and flushing every Player. Core statements skip the ORM
+flush hooks, so each action refreshes the dashboard snapshots and cached
+exports itself. Document files of deleted players are removed from disk on
+a background thread after the delete has been committed. Players with goals
+or assists on a scoresheet are never bulk-deleted, so game history stays
+intact; they are reported back instead.
+"""
+
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+
+from app import db
+from app.models import Player, PlayerDocument, PlayerTeam, PlayerTeamSeasonStats, Goal, Assist
+from app.import_utils import sync_after_bulk_player_write
+
+_cleanup_executor = None
+_cleanup_lock = threading.Lock()
+
+
+def _get_cleanup_executor():
+    global _cleanup_executor
+    with _cleanup_lock:
+        if _cleanup_executor is None:
+            _cleanup_executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix='file-cleanup')
+        return _cleanup_executor
+
+
+def remove_files(paths):
+    """Delete files from disk, logging (not raising) failures."""
+    removed = 0
+    for path in paths:
+        if not path or not os.path.exists(path):
+            continue
+        try:
+            os.remove(path)
+            removed += 1
+        except OSError as e:
+            print(f"Error removing file {path}: {str(e)}")
+    return removed
+
+
+def schedule_file_cleanup(paths):
+    """Remove files on the background cleanup thread."""
+    paths = [path for path in paths if path]
+    if paths:
+        _get_cleanup_executor().submit(remove_files, paths)
+
+
+def _player_teams(player_ids):
+    return set(db.session.execute(
+        db.select(Player.team).where(Player.id.in_(player_ids)).distinct()
+    ).scalars())
+
+
+def bulk_set_paid(player_ids, paid):
+    """
+    Mark players paid or unpaid with one UPDATE statement and commit.
+
+    Args:
+        player_ids: List of player IDs, or a SELECT returning player IDs
+        paid: New tuition status
+
+    Returns:
+        int: Number of players updated
+    """
+    teams = _player_teams(player_ids)
+    player_table = Player.__table__
+    result = db.session.execute(
+        player_table.update()
+        .where(player_table.c.id.in_(player_ids))
+        .values(paid_tuition=paid, paid=paid, updated_at=datetime.utcnow())  # legacy paid kept in step
+    )
+    sync_after_bulk_player_write(teams)
+    db.session.commit()
+    return result.rowcount
+
+
+def _has_scoring(player_column):
+    """Condition true for players recorded as a goal scorer or assister."""
+    return db.or_(
+        db.select(Goal.id).where(Goal.scorer_id == player_column).exists(),
+        db.select(Assist.id).where(Assist.assister_id == player_column).exists()
+    )
+
+
+def bulk_delete_players(player_ids):
+    """
+    Delete players with their document rows, team memberships and stat rollups
+    using bulk DELETE statements, then commit.
+
+    Players with goals or assists are skipped and returned by name. Document
+    files are removed in the background once the delete is committed.
+
+    Args:
+        player_ids: List of player IDs, or a SELECT returning player IDs
+
+    Returns:
+        tuple: (number of players deleted, names of players kept for their goals/assists)
+    """
+    document_table = PlayerDocument.__table__
+    membership_table = PlayerTeam.__table__
+    stats_table = PlayerTeamSeasonStats.__table__
+    player_table = Player.__table__
+
+    kept = [f"{first_name} {last_name}" for first_name, last_name in db.session.execute(
+        db.select(player_table.c.first_name, player_table.c.last_name)
+        .where(player_table.c.id.in_(player_ids), _has_scoring(player_table.c.id))
+        .order_by(player_table.c.last_name, player_table.c.first_name)
+    )]
+    player_ids = db.select(player_table.c.id).where(
+        player_table.c.id.in_(player_ids), db.not_(_has_scoring(player_table.c.id))
+    )
+
+    teams = _player_teams(player_ids)
+    paths = set(db.session.execute(
+        db.select(document_table.c.file_path).where(document_table.c.player_id.in_(player_ids))
+    ).scalars())
+
+    db.session.execute(document_table.delete().where(document_table.c.player_id.in_(player_ids)))
+    db.session.execute(membership_table.delete().where(membership_table.c.player_id.in_(player_ids)))
+    db.session.execute(stats_table.delete().where(stats_table.c.player_id.in_(player_ids)))
+    result = db.session.execute(player_table.delete().where(player_table.c.id.in_(player_ids)))
+    sync_after_bulk_player_write(teams)
+
+    if paths:
+        # Never delete a file another document row still points at
+        paths -= set(db.session.execute(
+            db.select(document_table.c.file_path).where(document_table.c.file_path.in_(list(paths)))
+        ).scalars())
+    db.session.commit()
+
+    schedule_file_cleanup(paths)
+    return result.rowcount, kept
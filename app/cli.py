@@ -0,0 +1,209 @@
+"""
+Flask CLI commands for offline bulk data operations.
+
+    flask roster import players.csv [--upsert] [--workers 4]
+    flask roster export roster.csv[.gz] [--team 12U] [--season 2025-26]
+    flask contacts import contacts.csv --user coach@example.com
+    flask files verify [--workers 8]
+    flask stats rebuild
+
+The commands run the same import/export engines as the web routes, but read
+and write local files, so full-season dumps are not limited by
+MAX_CONTENT_LENGTH or request timeouts.
+"""
+
+import gzip
+import os
+import time
+from concurrent.futures import ThreadPoolExecutor, FIRST_COMPLETED, wait
+
+import click
+from flask import current_app
+from flask.cli import AppGroup
+
+from app import db
+from app.models import User, File, PlayerDocument
+from app.import_utils import get_player_chunk_writer, iter_player_chunks, new_import_stats, add_chunk_counts
+from app.contact_import_utils import import_contacts
+from app.export_utils import write_roster_csv
+from app.export_jobs import invalidate_roster_exports
+from app.dashboard_utils import rebuild_dashboard_snapshots
+from app.stats_utils import rebuild_player_stats
+from app.analytics_utils import invalidate_player_analytics
+from app.standings_utils import clear_team_standings
+
+roster_cli = AppGroup('roster', help='Bulk roster import and export.')
+contacts_cli = AppGroup('contacts', help='Bulk contacts import.')
+files_cli = AppGroup('files', help='Uploaded file maintenance.')
+stats_cli = AppGroup('stats', help='Player statistics and standings maintenance.')
+
+
+def _open_output(path):
+    if path.endswith('.gz'):
+        return gzip.open(path, 'wt', newline='', encoding='utf-8')
+    return open(path, 'w', newline='', encoding='utf-8')
+
+
+def _open_input(path):
+    if path.endswith('.gz'):
+        return gzip.open(path, 'rb')
+    return open(path, 'rb')
+
+
+def _rate(count, elapsed):
+    return count / elapsed if elapsed > 0 else 0.0
+
+
+def _print_errors(errors, limit=20):
+    for error in errors[:limit]:
+        click.echo(f"  {error}", err=True)
+    if len(errors) > limit:
+        click.echo(f"  ... and {len(errors) - limit} more", err=True)
+
+
+def _write_chunk_in_context(app, write_chunk, chunk, upsert, fieldnames):
+    # Each worker thread gets its own app context and therefore its own session
+    with app.app_context():
+        return write_chunk(chunk, upsert=upsert, sync=False, fieldnames=fieldnames)
+
+
+@roster_cli.command('import')
+@click.argument('path', type=click.Path(exists=True, dir_okay=False))
+@click.option('--upsert/--no-upsert', default=False, help='Update players that already exist.')
+@click.option('--chunk-size', type=int, default=None, help='Rows written per chunk.')
+@click.option('--workers', type=int, default=1, show_default=True,
+              help='Chunks written in parallel (PostgreSQL only).')
+def import_roster_command(path, upsert, chunk_size, workers):
+    """Import players from a local CSV (or .csv.gz) file."""
+    write_chunk, default_chunk_size = get_player_chunk_writer()
+    chunk_size = chunk_size or default_chunk_size
+    if workers > 1 and db.engine.dialect.name == 'sqlite':
+        click.echo('SQLite allows one writer at a time; using 1 worker.')
+        workers = 1
+
+    app = current_app._get_current_object()
+    stats = new_import_stats()
+    started = time.perf_counter()
+
+    def report(counts):
+        add_chunk_counts(stats, counts)
+        elapsed = time.perf_counter() - started
+        click.echo(f"chunk {stats['chunks']}: {stats['imported']} imported, {stats['rows']} rows read "
+                   f"({_rate(stats['rows'], elapsed):.0f} rows/s)")
+
+    with _open_input(path) as stream:
+        if workers == 1:
+            for chunk in iter_player_chunks(stream, chunk_size, stats):
+                report(write_chunk(chunk, upsert=upsert, fieldnames=stats['fieldnames']))
+        else:
+            with ThreadPoolExecutor(max_workers=workers, thread_name_prefix='roster-import') as pool:
+                pending = set()
+                for chunk in iter_player_chunks(stream, chunk_size, stats):
+                    pending.add(pool.submit(_write_chunk_in_context, app, write_chunk, chunk, upsert,
+                                            stats['fieldnames']))
+                    if len(pending) >= workers * 2:
+                        # Keep a bounded number of parsed chunks in memory
+                        done, pending = wait(pending, return_when=FIRST_COMPLETED)
+                        for future in done:
+                            report(future.result())
+                for future in pending:
+                    report(future.result())
+            # Chunk writers skipped the per-chunk sync; refresh derived data once. An
+            # upsert can move players off teams the chunks never mention, so rebuild it all
+            rebuild_dashboard_snapshots()
+            rebuild_player_stats()
+            invalidate_player_analytics()
+            invalidate_roster_exports()
+            db.session.commit()
+
+    elapsed = time.perf_counter() - started
+    click.echo(f"Imported {stats['imported']} players ({stats['inserted']} added, {stats['updated']} updated, "
+               f"{stats['unchanged']} unchanged) from {stats['rows']} rows in {elapsed:.2f}s "
+               f"({_rate(stats['rows'], elapsed):.0f} rows/s, {stats['chunks']} chunks, {workers} workers)")
+    if stats['error_count']:
+        click.echo(f"{stats['error_count']} rows had errors:", err=True)
+        _print_errors(stats['errors'])
+
+
+@roster_cli.command('export')
+@click.argument('path', type=click.Path(dir_okay=False, writable=True))
+@click.option('--team', default=None, help='Only players on this team.')
+@click.option('--season', default=None, help='Only players in this season.')
+@click.option('--paid', type=click.Choice(['true', 'false']), default=None, help='Only paid or unpaid players.')
+@click.option('--search', default='', help='Roster search string.')
+def export_roster_command(path, team, season, paid, search):
+    """Export the roster to a local CSV file (gzip-compressed when PATH ends in .gz)."""
+    filters = {'team': team, 'season': season, 'paid': paid, 'search': search}
+    started = time.perf_counter()
+    with _open_output(path) as output:
+        row_count = write_roster_csv(filters, output)
+    elapsed = time.perf_counter() - started
+    size = os.path.getsize(path)
+    click.echo(f"Exported {row_count} players to {path} in {elapsed:.2f}s "
+               f"({_rate(row_count, elapsed):.0f} rows/s, {size / 1024 / 1024:.1f} MB)")
+
+
+@contacts_cli.command('import')
+@click.argument('path', type=click.Path(exists=True, dir_okay=False))
+@click.option('--user', 'email', required=True, help='Email of the user who owns the contacts.')
+def import_contacts_command(path, email):
+    """Import team contacts from a local CSV (or .csv.gz) file."""
+    user = User.query.filter_by(email=email).first()
+    if user is None:
+        raise click.ClickException(f"No user with email {email}")
+
+    with _open_input(path) as stream:
+        stats = import_contacts(stream, user.id)
+    click.echo(f"Imported {stats['inserted'] + stats['updated']} contacts ({stats['inserted']} added, "
+               f"{stats['updated']} updated, {stats['people']} additional people) from {stats['rows']} rows "
+               f"in {stats['elapsed']:.2f}s ({_rate(stats['rows'], stats['elapsed']):.0f} rows/s)")
+    if stats['error_count']:
+        click.echo(f"{stats['error_count']} rows had errors:", err=True)
+        _print_errors(stats['errors'])
+
+
+def _check_file(kind, record_id, path, expected_size):
+    if not path or not os.path.exists(path):
+        return kind, record_id, path, 'missing'
+    if expected_size is not None and os.path.getsize(path) != expected_size:
+        return kind, record_id, path, f"size {os.path.getsize(path)} != {expected_size}"
+    return None
+
+
+@files_cli.command('verify')
+@click.option('--workers', type=int, default=8, show_default=True, help='Files checked in parallel.')
+def verify_files_command(workers):
+    """Check that every uploaded file and player document exists on disk with the recorded size."""
+    records = [('file', record_id, path, size) for record_id, path, size in
+               db.session.query(File.id, File.file_path, File.file_size).all()]
+    records += [('document', record_id, path, size) for record_id, path, size in
+                db.session.query(PlayerDocument.id, PlayerDocument.file_path, PlayerDocument.file_size).all()]
+
+    started = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=max(workers, 1), thread_name_prefix='files-verify') as pool:
+        problems = [result for result in pool.map(lambda record: _check_file(*record), records) if result]
+    elapsed = time.perf_counter() - started
+
+    for kind, record_id, path, problem in problems:
+        click.echo(f"{kind} {record_id}: {problem} ({path})")
+    click.echo(f"Checked {len(records)} files in {elapsed:.2f}s ({_rate(len(records), elapsed):.0f} files/s), "
+               f"{len(problems)} problems")
+    if problems:
+        raise SystemExit(1)
+
+
+@stats_cli.command('rebuild')
+def rebuild_stats_command():
+    """Recompute every player stat rollup and drop the cached team standings."""
+    started = time.perf_counter()
+    row_count = rebuild_player_stats()
+    clear_team_standings()
+    db.session.commit()
+    elapsed = time.perf_counter() - started
+    click.echo(f"Rebuilt {row_count} player stat rows in {elapsed:.2f}s; team standings are recomputed on next view")
+
+
+def register_cli(app):
+    """Attach the bulk data command groups to the app."""
+    for group in (roster_cli, contacts_cli, files_cli, stats_cli):
+        app.cli.add_command(group)
@@ -0,0 +1,206 @@
+"""
+Chunked bulk import of team contacts from CSV.
+
+The upload is decoded incrementally and written in chunks. Contacts are
+matched on (user_id, team_name, age_group), backed by ix_contact_user_team_age,
+so re-importing a league directory updates the existing contacts instead of
+duplicating them. Each chunk costs a fixed handful of statements: one lookup
+of existing contacts, one executemany UPDATE, one INSERT for new contacts and
+one lookup plus one INSERT for their contact people.
+
+Additional contact people come from numbered column groups:
+person1_role, person1_full_name, person1_email, person2_role, ...
+"""
+
+import re
+import time
+from datetime import datetime
+
+from app import db
+from app.models import Contact, ContactPerson
+from app.import_utils import iter_csv_rows
+
+# Rows validated and written per chunk
+CONTACT_IMPORT_CHUNK_SIZE = 500
+
+CONTACT_IMPORT_FIELDS = ['division', 'color', 'coach_full_name', 'coach_email',
+                         'manager_full_name', 'manager_email', 'notes']
+CONTACT_PERSON_ROLES = ['coach', 'manager', 'other']
+
+_PERSON_COLUMN = re.compile(r'^person(\d+)_(role|full_name|email)$')
+
+
+def _clean(row, key):
+    return (row.get(key) or '').strip() or None
+
+
+def parse_contact_row(row):
+    """
+    Validate one CSV row and convert it into contact values and contact people.
+
+    Args:
+        row: Row dict from csv.DictReader
+
+    Returns:
+        tuple: (contact values dict, list of person dicts with role, full_name and email)
+
+    Raises:
+        ValueError: If required fields are missing or a person is incomplete
+    """
+    team_name = _clean(row, 'team_name')
+    age_group = _clean(row, 'age_group')
+    if not team_name or not age_group:
+        raise ValueError('team_name and age_group are required')
+
+    values = {'team_name': team_name, 'age_group': age_group}
+    for field in CONTACT_IMPORT_FIELDS:
+        values[field] = _clean(row, field)
+
+    people = {}
+    for column, value in row.items():
+        match = _PERSON_COLUMN.match(column or '')
+        if match and value and value.strip():
+            people.setdefault(int(match.group(1)), {})[match.group(2)] = value.strip()
+
+    persons = []
+    for number in sorted(people):
+        person = people[number]
+        if not person.get('full_name'):
+            raise ValueError(f'person{number}_full_name is required')
+        role = (person.get('role') or 'other').lower()
+        if role not in CONTACT_PERSON_ROLES:
+            raise ValueError(f"person{number}_role must be one of {', '.join(CONTACT_PERSON_ROLES)}")
+        persons.append({'role': role, 'full_name': person['full_name'], 'email': person.get('email')})
+    return values, persons
+
+
+def write_contact_chunk(entries, user_id):
+    """
+    Upsert a chunk of parsed contacts and add their new contact people, then commit.
+
+    Rows repeating a team/age group within the chunk are merged (later values
+    win, people are combined). Blank cells never overwrite stored values, and
+    people already on a contact (same role and name) are not added again.
+
+    Args:
+        entries: List of (values, persons) tuples from parse_contact_row()
+        user_id: Owner of the imported contacts
+
+    Returns:
+        dict: inserted, updated and people counts
+    """
+    counts = {'inserted': 0, 'updated': 0, 'people': 0}
+    merged = {}
+    for values, persons in entries:
+        key = (values['team_name'], values['age_group'])
+        if key in merged:
+            current, current_persons = merged[key]
+            current.update({field: value for field, value in values.items() if value is not None})
+            current_persons.extend(persons)
+        else:
+            merged[key] = (dict(values), list(persons))
+    if not merged:
+        return counts
+
+    contact_table = Contact.__table__
+    person_table = ContactPerson.__table__
+    now = datetime.utcnow()
+
+    # Existing contacts for this chunk (oldest one wins if the user already has duplicates)
+    contact_ids = {}
+    existing = db.session.execute(
+        db.select(contact_table.c.id, contact_table.c.team_name, contact_table.c.age_group)
+        .where(contact_table.c.user_id == user_id,
+               db.tuple_(contact_table.c.team_name, contact_table.c.age_group).in_(list(merged)))
+        .order_by(contact_table.c.id.desc())
+    ).all()
+    for contact_id, team_name, age_group in existing:
+        contact_ids[(team_name, age_group)] = contact_id
+
+    updates = [{'contact_id': contact_ids[key], **{f'b_{field}': values[field] for field in CONTACT_IMPORT_FIELDS}}
+               for key, (values, _) in merged.items() if key in contact_ids]
+    if updates:
+        db.session.execute(
+            contact_table.update()
+            .where(contact_table.c.id == db.bindparam('contact_id'))
+            .values(updated_at=now, **{
+                field: db.func.coalesce(db.bindparam(f'b_{field}', type_=contact_table.c[field].type),
+                                        contact_table.c[field])
+                for field in CONTACT_IMPORT_FIELDS
+            }),
+            updates
+        )
+        counts['updated'] = len(updates)
+
+    inserts = [dict(values, user_id=user_id, created_at=now, updated_at=now)
+               for key, (values, _) in merged.items() if key not in contact_ids]
+    if inserts:
+        created = db.session.execute(
+            contact_table.insert().returning(contact_table.c.id, contact_table.c.team_name,
+                                             contact_table.c.age_group),
+            inserts
+        ).all()
+        for contact_id, team_name, age_group in created:
+            contact_ids[(team_name, age_group)] = contact_id
+        counts['inserted'] = len(inserts)
+
+    people_by_contact = {contact_ids[key]: persons for key, (_, persons) in merged.items() if persons}
+    if people_by_contact:
+        known = set(db.session.execute(
+            db.select(person_table.c.contact_id, person_table.c.role, db.func.lower(person_table.c.full_name))
+            .where(person_table.c.contact_id.in_(list(people_by_contact)))
+        ).all())
+        new_people = []
+        for contact_id, persons in people_by_contact.items():
+            for person in persons:
+                identity = (contact_id, person['role'], person['full_name'].lower())
+                if identity not in known:
+                    known.add(identity)
+                    new_people.append(dict(person, contact_id=contact_id, created_at=now, updated_at=now))
+        if new_people:
+            db.session.execute(person_table.insert(), new_people)
+        counts['people'] = len(new_people)
+
+    db.session.commit()
+    return counts
+
+
+def import_contacts(stream, user_id, chunk_size=CONTACT_IMPORT_CHUNK_SIZE):
+    """
+    Import contacts from a binary CSV stream in committed chunks.
+
+    Args:
+        stream: Binary file object with the CSV upload
+        user_id: Owner of the imported contacts
+        chunk_size: Number of rows validated and written per chunk
+
+    Returns:
+        dict: inserted, updated, people, error_count, errors (list of
+        messages), chunks, rows and elapsed seconds
+    """
+    stats = {'inserted': 0, 'updated': 0, 'people': 0, 'error_count': 0, 'errors': [],
+             'chunks': 0, 'rows': 0, 'elapsed': 0.0}
+    started = time.perf_counter()
+    chunk = []
+
+    def flush_chunk():
+        for key, count in write_contact_chunk(chunk, user_id).items():
+            stats[key] += count
+        stats['chunks'] += 1
+        chunk.clear()
+
+    for row_num, row in iter_csv_rows(stream):
+        stats['rows'] += 1
+        try:
+            chunk.append(parse_contact_row(row))
+        except Exception as e:
+            stats['errors'].append(f"Row {row_num}: {str(e)}")
+            stats['error_count'] += 1
+            continue
+        if len(chunk) >= chunk_size:
+            flush_chunk()
+
+    if chunk:
+        flush_chunk()
+    stats['elapsed'] = time.perf_counter() - started
+    return stats
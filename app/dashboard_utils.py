@@ -0,0 +1,342 @@
+"""
+Aggregate queries backing the coaches dashboard.
+
+Every per-team card is built from a fixed number of grouped queries instead of
+a handful of queries per team, so the cost of a dashboard hit does not grow
+with the number of teams in the club.
+
+The cards are stored in TeamDashboardSnapshot rows. Mapper hooks on Player,
+Game and PracticePlan record which teams a flush touched and those teams'
+snapshots are recomputed at the end of the flush, so the dashboard itself only
+reads the snapshot table.
+"""
+
+import json
+from datetime import datetime
+
+from sqlalchemy import event
+from sqlalchemy.orm import Session, object_session
+
+from app import db
+from app.models import Player, Game, PracticePlan, Team, TeamDashboardSnapshot
+
+# Number of games shown on the "Latest Game Results" cards
+LATEST_GAMES_LIMIT = 3
+# Number of games used for the win/loss/tie summary
+RECENT_GAMES_LIMIT = 5
+
+
+def get_team_player_counts(team_names=None):
+    """
+    Count players and unpaid players per team in one grouped query.
+
+    Args:
+        team_names: Optional iterable of team names to restrict the query to
+
+    Returns:
+        list: (team, player_count, unpaid_count) tuples
+    """
+    query = db.session.query(
+        Player.team,
+        db.func.count(Player.id),
+        db.func.sum(db.case((Player.paid == False, 1), else_=0))
+    )
+    if team_names is not None:
+        query = query.filter(Player.team.in_(list(team_names)))
+    return [(team, count, unpaid or 0) for team, count, unpaid in query.group_by(Player.team).all()]
+
+
+def get_recent_games_by_team(team_names, limit=RECENT_GAMES_LIMIT, season=None):
+    """
+    Load the last ``limit`` games of every team in a single query.
+
+    Uses ROW_NUMBER() OVER (PARTITION BY team_name ORDER BY game_date DESC)
+    to rank each team's games and keeps only the top ``limit`` rows.
+
+    Args:
+        team_names: Iterable of team names
+        limit: Number of games to keep per team
+        season: Optional season to restrict the games to
+
+    Returns:
+        dict: team name -> list of Game objects, most recent first
+    """
+    team_names = [team for team in team_names if team]
+    games_by_team = {team: [] for team in team_names}
+    if not team_names:
+        return games_by_team
+
+    ranked = db.session.query(
+        Game.id.label('id'),
+        db.func.row_number().over(
+            partition_by=Game.team_name,
+            order_by=(Game.game_date.desc(), Game.id.desc())
+        ).label('rn')
+    ).filter(Game.team_name.in_(team_names))
+    if season:
+        # (team_name, season, game_date) index: only this season's slice is ranked
+        ranked = ranked.filter(Game.season == season)
+    ranked = ranked.subquery()
+
+    games = Game.query.join(ranked, ranked.c.id == Game.id) \
+        .filter(ranked.c.rn <= limit) \
+        .order_by(Game.team_name, ranked.c.rn) \
+        .all()
+
+    for game in games:
+        games_by_team.setdefault(game.team_name, []).append(game)
+    return games_by_team
+
+
+def get_next_practices_by_team(team_names, today):
+    """
+    Find the next upcoming practice plan of every team in a single query.
+
+    Args:
+        team_names: Iterable of team names
+        today: Date from which practices count as upcoming
+
+    Returns:
+        dict: team name -> PracticePlan (teams without one are omitted)
+    """
+    team_names = [team for team in team_names if team]
+    if not team_names:
+        return {}
+
+    ranked = db.session.query(
+        PracticePlan.id.label('id'),
+        Team.name.label('team_name'),
+        db.func.row_number().over(
+            partition_by=Team.name,
+            order_by=(PracticePlan.date.asc(), PracticePlan.id.asc())
+        ).label('rn')
+    ).join(Team, PracticePlan.team_id == Team.id) \
+        .filter(Team.name.in_(team_names)) \
+        .filter(PracticePlan.date >= today) \
+        .subquery()
+
+    rows = db.session.query(PracticePlan, ranked.c.team_name) \
+        .join(ranked, ranked.c.id == PracticePlan.id) \
+        .filter(ranked.c.rn == 1) \
+        .all()
+    return {team_name: plan for plan, team_name in rows}
+
+
+def summarize_results(games):
+    """Count wins, losses and ties in a list of games."""
+    wins = sum(1 for game in games if game.badgers_score > game.opponent_score)
+    losses = sum(1 for game in games if game.badgers_score < game.opponent_score)
+    ties = sum(1 for game in games if game.badgers_score == game.opponent_score)
+    return wins, losses, ties
+
+
+def compute_team_cards(team_names=None, today=None):
+    """
+    Compute dashboard cards straight from the source tables.
+
+    Args:
+        team_names: Optional iterable of team names (defaults to every team with players)
+        today: Date used to find upcoming practices (defaults to today)
+
+    Returns:
+        list: One dict per team with counts, record and recent games of the
+        current season, and next practice
+    """
+    if today is None:
+        today = datetime.now().date()
+
+    counts = get_team_player_counts(team_names)
+    names = [team for team, _, _ in counts]
+    recent_games = get_recent_games_by_team(names, season=Game.season_for_date(today))
+    next_practices = get_next_practices_by_team(names, today)
+
+    cards = []
+    for team, count, unpaid_count in counts:
+        games = recent_games.get(team, [])
+        wins, losses, ties = summarize_results(games)
+        cards.append({
+            'team_name': team,
+            'player_count': count,
+            'unpaid_count': unpaid_count,
+            'wins': wins,
+            'losses': losses,
+            'ties': ties,
+            'recent_games': games,
+            'next_practice': next_practices.get(team)
+        })
+    return cards
+
+
+### Snapshot maintenance ###
+
+def refresh_team_snapshots(team_names, today=None):
+    """
+    Recompute and store the snapshot rows for the given teams.
+
+    Teams that no longer have any players lose their snapshot row. Writes go
+    through Core statements so this is safe to call while a flush is finishing.
+
+    Args:
+        team_names: Iterable of team names to refresh
+        today: Date used to find upcoming practices (defaults to today)
+    """
+    team_names = sorted({team for team in team_names if team})
+    if not team_names:
+        return
+
+    cards = compute_team_cards(team_names, today)
+    snapshot_table = TeamDashboardSnapshot.__table__
+    refreshed_at = datetime.utcnow()
+    rows = []
+    for card in cards:
+        next_practice = card['next_practice']
+        rows.append({
+            'refreshed_at': refreshed_at,
+            'team_name': card['team_name'],
+            'player_count': card['player_count'],
+            'unpaid_count': card['unpaid_count'],
+            'wins': card['wins'],
+            'losses': card['losses'],
+            'ties': card['ties'],
+            'recent_games': json.dumps([{
+                'id': game.id,
+                'opponent_team': game.opponent_team,
+                'game_date': game.game_date.isoformat(),
+                'badgers_score': game.badgers_score,
+                'opponent_score': game.opponent_score
+            } for game in card['recent_games']]),
+            'next_practice_id': next_practice.id if next_practice else None,
+            'next_practice_title': next_practice.title if next_practice else None,
+            'next_practice_date': next_practice.date if next_practice else None
+        })
+
+    db.session.execute(snapshot_table.delete().where(snapshot_table.c.team_name.in_(team_names)))
+    if rows:
+        db.session.execute(snapshot_table.insert(), rows)
+
+
+def rebuild_dashboard_snapshots(today=None):
+    """Recompute the snapshot of every team and drop snapshots of empty teams."""
+    snapshot_table = TeamDashboardSnapshot.__table__
+    db.session.execute(snapshot_table.delete())
+    teams = [team for team, in db.session.query(Player.team).distinct().all()]
+    refresh_team_snapshots(teams, today)
+
+
+def mark_dashboard_teams_dirty(session, *team_names):
+    """Queue teams whose snapshot must be refreshed when the session next flushes."""
+    dirty = session.info.setdefault('dirty_dashboard_teams', set())
+    dirty.update(team for team in team_names if team)
+
+
+def _attribute_values(target, attribute):
+    """Return the current value of an attribute plus any value it replaced."""
+    history = db.inspect(target).attrs[attribute].history
+    values = set(history.added or ()) | set(history.unchanged or ()) | set(history.deleted or ())
+    values.add(getattr(target, attribute))
+    return values
+
+
+def _team_names_for_team_ids(connection, team_ids):
+    team_ids = [team_id for team_id in team_ids if team_id is not None]
+    if not team_ids:
+        return []
+    return connection.execute(db.select(Team.name).where(Team.id.in_(team_ids))).scalars().all()
+
+
+def _player_changed(mapper, connection, target):
+    session = object_session(target)
+    if session is not None:
+        mark_dashboard_teams_dirty(session, *_attribute_values(target, 'team'))
+
+
+def _game_changed(mapper, connection, target):
+    session = object_session(target)
+    if session is not None:
+        mark_dashboard_teams_dirty(session, *_attribute_values(target, 'team_name'))
+
+
+def _practice_plan_changed(mapper, connection, target):
+    session = object_session(target)
+    if session is not None:
+        team_ids = _attribute_values(target, 'team_id')
+        mark_dashboard_teams_dirty(session, *_team_names_for_team_ids(connection, team_ids))
+
+
+def _team_changed(mapper, connection, target):
+    session = object_session(target)
+    if session is not None:
+        mark_dashboard_teams_dirty(session, *_attribute_values(target, 'name'))
+
+
+for _model, _listener in ((Player, _player_changed), (Game, _game_changed),
+                          (PracticePlan, _practice_plan_changed), (Team, _team_changed)):
+    for _event_name in ('after_insert', 'after_update', 'after_delete'):
+        event.listen(_model, _event_name, _listener)
+
+
+@event.listens_for(Session, 'after_flush_postexec')
+def _refresh_dirty_snapshots(session, flush_context):
+    dirty = session.info.pop('dirty_dashboard_teams', None)
+    if dirty:
+        refresh_team_snapshots(dirty)
+
+
+### Dashboard read path ###
+
+def build_dashboard_data(today=None):
+    """
+    Read the per-team dashboard cards from the snapshot table.
+
+    Snapshots are rebuilt on the fly when the table is empty (first run after
+    deploying), when a team's stored next practice is already in the past, or
+    when the snapshot was taken in an earlier season.
+
+    Args:
+        today: Date used to find upcoming practices (defaults to today)
+
+    Returns:
+        dict: team_counts, latest_games and team_stats as used by dashboard.html
+    """
+    if today is None:
+        today = datetime.now().date()
+
+    snapshots = TeamDashboardSnapshot.query.order_by(TeamDashboardSnapshot.team_name).all()
+    season = Game.season_for_date(today)
+    stale = [snapshot.team_name for snapshot in snapshots
+             if (snapshot.next_practice_date and snapshot.next_practice_date < today)
+             or Game.season_for_date(snapshot.refreshed_at.date()) != season]
+    if not snapshots and db.session.query(Player.id).first() is not None:
+        rebuild_dashboard_snapshots(today)
+        db.session.commit()
+        snapshots = TeamDashboardSnapshot.query.order_by(TeamDashboardSnapshot.team_name).all()
+    elif stale:
+        refresh_team_snapshots(stale, today)
+        db.session.commit()
+        snapshots = TeamDashboardSnapshot.query.order_by(TeamDashboardSnapshot.team_name).all()
+
+    team_counts = []
+    latest_games = {}
+    team_stats = {}
+    for snapshot in snapshots:
+        games = snapshot.recent_games_list
+        team_counts.append((snapshot.team_name, snapshot.player_count))
+        latest_games[snapshot.team_name] = games[:LATEST_GAMES_LIMIT]
+        team_stats[snapshot.team_name] = {
+            'player_count': snapshot.player_count,
+            'unpaid_count': snapshot.unpaid_count,
+            'wins': snapshot.wins,
+            'losses': snapshot.losses,
+            'ties': snapshot.ties,
+            'next_practice': {
+                'id': snapshot.next_practice_id,
+                'title': snapshot.next_practice_title,
+                'date': snapshot.next_practice_date
+            } if snapshot.next_practice_id else None
+        }
+
+    return {
+        'team_counts': team_counts,
+        'latest_games': latest_games,
+        'team_stats': team_stats
+    }
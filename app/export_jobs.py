@@ -0,0 +1,203 @@
+"""
+Background roster export jobs with cached artifacts.
+
+A request enqueues an ExportJob for a normalized filter spec and a worker thread
+writes the CSV under instance/exports. Finished files are reused for the same
+filter spec until a Player write marks every export stale, so repeated exports
+neither re-run the query nor tie up a request worker.
+"""
+
+import hashlib
+import json
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta
+
+from flask import current_app
+from sqlalchemy import event
+from sqlalchemy.orm import Session, object_session
+
+from app import db
+from app.models import ExportJob, Player
+from app.export_utils import write_roster_csv
+
+# Worker threads per process building exports
+EXPORT_JOB_WORKERS = 2
+# Queued/running jobs older than this are assumed lost (e.g. worker restarted)
+EXPORT_JOB_TIMEOUT = timedelta(minutes=10)
+# Stale and failed job rows are kept this long so polling clients can follow them
+EXPORT_JOB_RETENTION = timedelta(days=1)
+
+ACTIVE_STATUSES = ('queued', 'running', 'completed')
+
+_executor = None
+_executor_lock = threading.Lock()
+
+
+def _get_executor():
+    global _executor
+    with _executor_lock:
+        if _executor is None:
+            _executor = ThreadPoolExecutor(max_workers=EXPORT_JOB_WORKERS, thread_name_prefix='export-job')
+        return _executor
+
+
+def normalize_export_filters(filters):
+    """Normalize a roster filter dict so equivalent requests share one export."""
+    search = ' '.join((filters.get('search') or '').lower().split())
+    paid = (filters.get('paid') or '').lower() or None
+    return {
+        'team': filters.get('team') or None,
+        'season': filters.get('season') or None,
+        'paid': paid if paid in ('true', 'false') else None,
+        'search': search
+    }
+
+
+def export_job_key(filters):
+    """Hash a normalized filter spec into the key used to look up cached exports."""
+    spec = json.dumps(normalize_export_filters(filters), sort_keys=True)
+    return hashlib.sha256(spec.encode('utf-8')).hexdigest()
+
+
+def get_export_folder():
+    """Return (and create) the folder holding finished export files."""
+    folder = os.path.join(current_app.instance_path, 'exports')
+    os.makedirs(folder, exist_ok=True)
+    return folder
+
+
+def _remove_file(path):
+    if path and os.path.exists(path):
+        try:
+            os.remove(path)
+        except OSError as e:
+            print(f"Error removing export file {path}: {str(e)}")
+
+
+def cleanup_export_jobs():
+    """Remove files of stale and failed exports and forget jobs older than EXPORT_JOB_RETENTION."""
+    jobs = ExportJob.query.filter(ExportJob.status.in_(['stale', 'failed'])).all()
+    cutoff = datetime.utcnow() - EXPORT_JOB_RETENTION
+    for job in jobs:
+        _remove_file(job.file_path)
+        job.file_path = None
+        if job.updated_at < cutoff:
+            db.session.delete(job)
+    if jobs:
+        db.session.commit()
+
+
+def enqueue_roster_export(filters, user_id):
+    """
+    Return a reusable export job for a filter spec, queuing a new one if needed.
+
+    Args:
+        filters: Roster filter dict (see roster_utils.get_roster_filters)
+        user_id: ID of the requesting user
+
+    Returns:
+        ExportJob: A completed, running or freshly queued job
+    """
+    normalized = normalize_export_filters(filters)
+    key = export_job_key(normalized)
+
+    job = ExportJob.query.filter_by(job_key=key) \
+        .filter(ExportJob.status.in_(ACTIVE_STATUSES)) \
+        .order_by(ExportJob.created_at.desc()) \
+        .first()
+    if job is not None:
+        if job.status == 'completed' and job.file_path and os.path.exists(job.file_path):
+            return job
+        if job.status in ('queued', 'running') and job.updated_at >= datetime.utcnow() - EXPORT_JOB_TIMEOUT:
+            return job
+        # Lost worker or missing file: retire the job and build a new one
+        job.status = 'failed'
+        job.error = job.error or 'Export expired before it could be used.'
+        db.session.commit()
+
+    cleanup_export_jobs()
+
+    job = ExportJob(
+        job_key=key,
+        filters=json.dumps(normalized, sort_keys=True),
+        status='queued',
+        user_id=user_id
+    )
+    db.session.add(job)
+    db.session.commit()
+
+    _get_executor().submit(run_export_job, current_app._get_current_object(), job.id)
+    return job
+
+
+def run_export_job(app, job_id):
+    """Build the CSV for an export job (runs on a worker thread)."""
+    with app.app_context():
+        export_table = ExportJob.__table__
+        started = db.session.execute(
+            export_table.update()
+            .where(export_table.c.id == job_id, export_table.c.status == 'queued')
+            .values(status='running', updated_at=datetime.utcnow())
+        )
+        db.session.commit()
+        if started.rowcount == 0:
+            # Already picked up elsewhere or invalidated before it started
+            return
+
+        job = db.session.get(ExportJob, job_id)
+        file_path = os.path.join(get_export_folder(), f"roster_export_{job_id}_{job.job_key[:12]}.csv")
+        temp_path = f"{file_path}.tmp"
+        try:
+            with open(temp_path, 'w', newline='', encoding='utf-8') as output:
+                row_count = write_roster_csv(job.filters_dict, output)
+            os.replace(temp_path, file_path)
+
+            finished = db.session.execute(
+                export_table.update()
+                .where(export_table.c.id == job_id, export_table.c.status == 'running')
+                .values(status='completed', file_path=file_path, file_size=os.path.getsize(file_path),
+                        row_count=row_count, completed_at=datetime.utcnow(), updated_at=datetime.utcnow())
+            )
+            db.session.commit()
+            if finished.rowcount == 0:
+                # Players changed while the export was being built
+                _remove_file(file_path)
+        except Exception as e:
+            db.session.rollback()
+            _remove_file(temp_path)
+            print(f"Error running export job {job_id}: {str(e)}")
+            db.session.execute(
+                export_table.update()
+                .where(export_table.c.id == job_id)
+                .values(status='failed', error=str(e), updated_at=datetime.utcnow())
+            )
+            db.session.commit()
+
+
+def invalidate_roster_exports(session=None):
+    """Mark every queued, running and completed export as stale."""
+    session = session or db.session
+    export_table = ExportJob.__table__
+    session.execute(
+        export_table.update()
+        .where(export_table.c.status.in_(ACTIVE_STATUSES))
+        .values(status='stale', updated_at=datetime.utcnow())
+    )
+
+
+def _player_changed(mapper, connection, target):
+    session = object_session(target)
+    if session is not None:
+        session.info['invalidate_roster_exports'] = True
+
+
+for _event_name in ('after_insert', 'after_update', 'after_delete'):
+    event.listen(Player, _event_name, _player_changed)
+
+
+@event.listens_for(Session, 'after_flush_postexec')
+def _invalidate_exports_after_flush(session, flush_context):
+    if session.info.pop('invalidate_roster_exports', False):
+        invalidate_roster_exports(session)
@@ -0,0 +1,199 @@
+"""
+Streaming CSV export of the player roster.
+
+Rows are read with a server-side cursor over only the exported columns and
+written out in small chunks, so memory use stays flat and the first bytes are
+sent before the whole roster has been read. Exports written to a file (the
+background export jobs) are formatted in SQL and pulled with COPY ... TO
+STDOUT on PostgreSQL instead; COPY only hands its output over once the whole
+query has run, so streamed downloads keep the cursor path.
+"""
+
+import csv
+import zlib
+from io import StringIO
+
+from app import db
+from app.models import Player
+from app.roster_utils import apply_roster_filters
+from app.pg_copy_utils import copy_supported, copy_query_to_file
+
+# Rows fetched per round trip from the database cursor
+EXPORT_FETCH_SIZE = 500
+# Rows written to the output buffer before a chunk is yielded
+EXPORT_CHUNK_ROWS = 200
+
+# (header, column) pairs in export order
+ROSTER_EXPORT_FIELDS = [
+    # Basic Player Information
+    ('Season', Player.season),
+    ('First Name', Player.first_name),
+    ('Last Name', Player.last_name),
+    ('Birth Year', Player.birth_year),
+    ('Team', Player.team),
+    ('Position', Player.position),
+
+    # Jersey and Equipment
+    ('Jersey Number', Player.jersey_number),
+    ('Jersey Size', Player.jersey_size),
+    ('Socks Size', Player.socks),
+    ('Jacket Size', Player.jacket),
+    ('USA Hockey Number', Player.usa_hockey_number),
+
+    # Father/Dad Information
+    ('Dad First Name', Player.dad_first_name),
+    ('Dad Last Name', Player.dad_last_name),
+    ('Dad Phone', Player.dad_phone),
+    ('Dad Email', Player.dad_email),
+
+    # Mother/Mom Information
+    ('Mom First Name', Player.mom_first_name),
+    ('Mom Last Name', Player.mom_last_name),
+    ('Mom Phone', Player.mom_phone),
+    ('Mom Email', Player.mom_email),
+
+    # Address Information
+    ('Address', Player.address),
+    ('City', Player.city),
+    ('State', Player.state),
+    ('Zip Code', Player.zip_code),
+
+    # Financial Information
+    ('Paid Tuition', Player.paid_tuition),
+    ('Total Tuition Amount', Player.total_tuition_amount),
+    ('Amount Paid', Player.amount_paid),
+
+    # Documentation and Legal
+    ('Signed Waiver', Player.signed_waiver),
+    ('Birth Certificate', Player.birth_certificate),
+
+    # Legacy Fields (for backward compatibility)
+    ('Date of Birth', Player.date_of_birth),
+    ('Guardian First Name', Player.guardian_first_name),
+    ('Guardian Last Name', Player.guardian_last_name),
+    ('Paid Status', Player.paid),
+
+    # System Information
+    ('Created Date', Player.created_at),
+    ('Last Updated', Player.updated_at),
+]
+
+ROSTER_EXPORT_HEADERS = [header for header, _ in ROSTER_EXPORT_FIELDS]
+ROSTER_EXPORT_COLUMNS = [column for _, column in ROSTER_EXPORT_FIELDS]
+
+_BOOLEAN_HEADERS = {'Paid Tuition', 'Signed Waiver', 'Birth Certificate', 'Paid Status'}
+_MONEY_HEADERS = {'Total Tuition Amount', 'Amount Paid'}
+
+
+def format_export_value(header, value):
+    """Format one exported value the way the roster CSV has always shown it."""
+    if header in _BOOLEAN_HEADERS:
+        return 'Yes' if value else 'No'
+    if header in _MONEY_HEADERS:
+        return f"${value:.2f}" if value else ''
+    if header == 'Date of Birth':
+        return value.strftime('%m/%d/%Y') if value else ''
+    if header in ('Created Date', 'Last Updated'):
+        return value.strftime('%m/%d/%Y %H:%M') if value else ''
+    return value or ''
+
+
+def format_export_row(row):
+    """Format a result row of ROSTER_EXPORT_COLUMNS as a list of CSV values."""
+    return [format_export_value(header, value) for header, value in zip(ROSTER_EXPORT_HEADERS, row)]
+
+
+def roster_export_query(filters):
+    """Build the column-only, name-ordered query for a roster export."""
+    query = db.session.query(*ROSTER_EXPORT_COLUMNS)
+    query = apply_roster_filters(query, filters)
+    return query.order_by(Player.last_name, Player.first_name, Player.id) \
+        .execution_options(yield_per=EXPORT_FETCH_SIZE)
+
+
+def format_export_expression(header, column):
+    """SQL counterpart of format_export_value(), used for COPY exports (PostgreSQL)."""
+    if header in _BOOLEAN_HEADERS:
+        return db.case((column, 'Yes'), else_='No')
+    if header in _MONEY_HEADERS:
+        amount = db.cast(db.func.round(db.cast(column, db.Numeric), 2), db.Text)
+        return db.case((db.func.coalesce(column, 0) != 0, db.literal('$') + amount), else_=None)
+    if header == 'Date of Birth':
+        return db.func.to_char(column, 'MM/DD/YYYY')
+    if header in ('Created Date', 'Last Updated'):
+        return db.func.to_char(column, 'MM/DD/YYYY HH24:MI')
+    # COPY writes '' as a quoted empty field; NULL matches the generic export
+    return db.func.nullif(column, '')
+
+
+def roster_copy_query(filters):
+    """Build the SELECT of pre-formatted export columns fed to COPY ... TO STDOUT."""
+    query = db.select(*[format_export_expression(header, column) for header, column in ROSTER_EXPORT_FIELDS])
+    query = apply_roster_filters(query, filters)
+    return query.order_by(Player.last_name, Player.first_name, Player.id)
+
+
+def iter_roster_csv(filters):
+    """
+    Yield the roster export as CSV text chunks.
+
+    Args:
+        filters: Filter dict from roster_utils.get_roster_filters()
+
+    Yields:
+        str: Chunks of CSV text, header first
+    """
+    buffer = StringIO()
+    writer = csv.writer(buffer)
+    writer.writerow(ROSTER_EXPORT_HEADERS)
+    # Send the header straight away so the download starts before the query runs
+    yield buffer.getvalue()
+    buffer.seek(0)
+    buffer.truncate(0)
+
+    pending = 0
+    for row in roster_export_query(filters):
+        writer.writerow(format_export_row(row))
+        pending += 1
+        if pending >= EXPORT_CHUNK_ROWS:
+            yield buffer.getvalue()
+            buffer.seek(0)
+            buffer.truncate(0)
+            pending = 0
+
+    yield buffer.getvalue()
+
+
+def write_roster_csv(filters, output):
+    """
+    Write the roster export for a filter set to a text file object.
+
+    Args:
+        filters: Filter dict from roster_utils.get_roster_filters()
+        output: Writable text file object (opened with newline='')
+
+    Returns:
+        int: Number of player rows written
+    """
+    if copy_supported():
+        csv.writer(output, lineterminator='\n').writerow(ROSTER_EXPORT_HEADERS)
+        output.flush()
+        return copy_query_to_file(roster_copy_query(filters), output)
+
+    writer = csv.writer(output)
+    writer.writerow(ROSTER_EXPORT_HEADERS)
+    row_count = 0
+    for row in roster_export_query(filters):
+        writer.writerow(format_export_row(row))
+        row_count += 1
+    return row_count
+
+
+def gzip_chunks(chunks, encoding='utf-8'):
+    """Compress an iterable of text chunks into a gzip byte stream."""
+    compressor = zlib.compressobj(6, zlib.DEFLATED, 31)  # wbits=31 writes a gzip header
+    for chunk in chunks:
+        data = compressor.compress(chunk.encode(encoding))
+        if data:
+            yield data
+    yield compressor.flush()
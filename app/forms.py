@@ -21,8 +21,14 @@ class LoginForm(FlaskForm):
 
 class BulkImportForm(FlaskForm):
     csv_file = FileField('CSV File', validators=[FileRequired()])
+    upsert = BooleanField('Update players that already exist', default=True)
     submit = SubmitField('Import Players')
 
+
+class ConfirmImportForm(FlaskForm):
+    upsert = BooleanField('Update players that already exist', default=True)
+    submit = SubmitField('Import Valid Rows')
+
 class DeletePlayerForm(FlaskForm):
     submit = SubmitField('Delete Player')
 
@@ -0,0 +1,617 @@
+"""
+Chunked bulk import of players from CSV.
+
+The upload is decoded incrementally, rows are validated in chunks and every
+chunk is written with a single executemany INSERT and committed on its own, so
+large registration dumps import quickly without being held in memory.
+
+Rows are matched to existing players on Player.natural_key (season plus
+normalized first name, last name and birth year). Inserts use
+INSERT ... ON CONFLICT on PostgreSQL and SQLite: in upsert mode existing
+players are updated when any imported value differs, otherwise they are
+left alone, so re-running an import never creates duplicates. Only the
+columns the CSV has are updated; columns missing from its header keep their
+stored values. On PostgreSQL
+each chunk is sent with COPY into a staging table and merged from there.
+
+Uploads can also be checked first: validate_player_import() parses the whole
+file once and saves the valid rows plus a per-row error report as a batch
+under a token, and the confirm step writes that batch without re-parsing.
+"""
+
+import csv
+import io
+import json
+import os
+import secrets
+import time
+from datetime import datetime, timedelta
+
+from flask import current_app
+
+from app import db
+from app.models import Player, Team
+from app.pg_copy_utils import copy_supported, copy_rows_to_temp_table
+
+# Rows validated and inserted per chunk
+PLAYER_IMPORT_CHUNK_SIZE = 500
+# Rows per chunk on the PostgreSQL COPY path (one COPY + one merge per chunk)
+PLAYER_COPY_CHUNK_SIZE = 5000
+PLAYER_STAGE_TABLE = 'player_import_stage'
+# Validated batches waiting for confirmation are discarded after this long
+IMPORT_BATCH_TTL = timedelta(hours=1)
+
+TRUE_VALUES = ['true', 'yes', '1']
+FALSE_VALUES = ['false', 'no', '0']
+
+BOOLEAN_IMPORT_FIELDS = ['paid_tuition', 'signed_waiver', 'birth_certificate']
+AMOUNT_IMPORT_FIELDS = ['total_tuition_amount', 'amount_paid']
+
+# CSV fields that fill more player columns than the one of the same name
+IMPORT_FIELD_COLUMNS = {
+    'paid_tuition': ['paid_tuition', 'paid'],
+    'dad_first_name': ['dad_first_name', 'guardian_first_name'],
+    'dad_last_name': ['dad_last_name', 'guardian_last_name'],
+}
+
+
+def iter_csv_rows(stream, encoding='utf-8-sig'):
+    """
+    Decode a binary CSV stream incrementally and yield (row_number, row dict).
+
+    Row numbers start at 2 to account for the header line.
+    """
+    text = io.TextIOWrapper(stream, encoding=encoding, newline=None)
+    try:
+        for row_num, row in enumerate(csv.DictReader(text), start=2):
+            yield row_num, row
+    finally:
+        # Leave the underlying upload stream open for the caller
+        text.detach()
+
+
+def _clean(row, key, default=''):
+    return (row.get(key) or default).strip()
+
+
+def _is_true(row, key):
+    return (row.get(key) or '').strip().lower() in TRUE_VALUES
+
+
+def parse_player_row(row):
+    """
+    Validate one CSV row and convert it into player column values.
+
+    Args:
+        row: Row dict from csv.DictReader
+
+    Returns:
+        dict: Column values for the player table
+
+    Raises:
+        ValueError: If the row is missing required fields or has bad amounts
+    """
+    if not row.get('first_name') or not row.get('last_name'):
+        raise ValueError("First name and last name are required")
+
+    # Parse financial data
+    try:
+        total_tuition = float(row['total_tuition_amount']) if row.get('total_tuition_amount') else 0.0
+        amount_paid = float(row['amount_paid']) if row.get('amount_paid') else 0.0
+    except ValueError:
+        raise ValueError("Invalid financial amount")
+
+    paid = _is_true(row, 'paid_tuition')
+    season = (row.get('season', str(datetime.now().year)) or '').strip()
+    first_name = row['first_name'].strip()
+    last_name = row['last_name'].strip()
+    birth_year = _clean(row, 'birth_year')
+    return {
+        'natural_key': Player.build_natural_key(season, first_name, last_name, birth_year),
+
+        # Basic Information
+        'season': season,
+        'first_name': first_name,
+        'last_name': last_name,
+        'birth_year': birth_year,
+        'team': _clean(row, 'team'),
+        'position': _clean(row, 'position'),
+
+        # Jersey and Equipment
+        'jersey_number': _clean(row, 'jersey_number'),
+        'jersey_size': _clean(row, 'jersey_size'),
+        'socks': _clean(row, 'socks'),
+        'jacket': _clean(row, 'jacket'),
+        'usa_hockey_number': _clean(row, 'usa_hockey_number'),
+
+        # Father Information
+        'dad_first_name': _clean(row, 'dad_first_name'),
+        'dad_last_name': _clean(row, 'dad_last_name'),
+        'dad_phone': _clean(row, 'dad_phone'),
+        'dad_email': _clean(row, 'dad_email'),
+
+        # Mother Information
+        'mom_first_name': _clean(row, 'mom_first_name'),
+        'mom_last_name': _clean(row, 'mom_last_name'),
+        'mom_phone': _clean(row, 'mom_phone'),
+        'mom_email': _clean(row, 'mom_email'),
+
+        # Address Information
+        'address': _clean(row, 'address'),
+        'city': _clean(row, 'city'),
+        'state': _clean(row, 'state'),
+        'zip_code': _clean(row, 'zip_code'),
+
+        # Financial Information
+        'paid_tuition': paid,
+        'total_tuition_amount': total_tuition,
+        'amount_paid': amount_paid,
+
+        # Documentation and Legal
+        'signed_waiver': _is_true(row, 'signed_waiver'),
+        'birth_certificate': _is_true(row, 'birth_certificate'),
+
+        # Legacy fields for backward compatibility
+        'guardian_first_name': _clean(row, 'dad_first_name'),
+        'guardian_last_name': _clean(row, 'dad_last_name'),
+        'paid': paid
+    }
+
+
+def imported_player_columns(fieldnames):
+    """Return the player columns filled from a CSV with these header fields."""
+    columns = set()
+    for name in fieldnames:
+        if name and name.strip():
+            columns.update(IMPORT_FIELD_COLUMNS.get(name.strip(), [name.strip()]))
+    return columns
+
+
+def sync_after_bulk_player_write(team_names):
+    """
+    Refresh derived data after players were written with Core statements.
+
+    Bulk INSERT/UPDATE/DELETE statements bypass the ORM flush hooks that keep
+    the dashboard snapshots, player stat rollups, cached analytics and cached exports current, so
+    callers run this before committing.
+    """
+    from app.dashboard_utils import refresh_team_snapshots
+    from app.export_jobs import invalidate_roster_exports
+    from app.stats_utils import refresh_player_stats
+    from app.analytics_utils import invalidate_player_analytics
+
+    refresh_team_snapshots(team_names)
+    refresh_player_stats(team_names)
+    invalidate_player_analytics()
+    invalidate_roster_exports()
+
+
+def _dialect_insert():
+    """Return the dialect-specific insert() supporting ON CONFLICT, if any."""
+    dialect = db.session.get_bind().dialect.name
+    if dialect == 'postgresql':
+        from sqlalchemy.dialects.postgresql import insert
+        return insert
+    if dialect == 'sqlite':
+        from sqlalchemy.dialects.sqlite import insert
+        return insert
+    return None
+
+
+def merge_player_rows(values):
+    """Collapse rows sharing a natural key (the last one wins); returns (rows, merged row count)."""
+    merged = {}
+    for value in values:
+        merged[value['natural_key']] = value
+    return list(merged.values()), len(values) - len(merged)
+
+
+def on_player_conflict(statement, columns, upsert, fieldnames=None):
+    """
+    Add the natural-key ON CONFLICT clause shared by the player import paths.
+
+    In upsert mode a conflicting player is updated only when one of the
+    imported columns differs; otherwise conflicting rows are skipped. With
+    fieldnames (the CSV header) only the columns the CSV has are updated, so
+    defaults parsed for missing fields never overwrite stored values.
+    """
+    table = Player.__table__
+    update_columns = [column for column in columns if column != 'natural_key']
+    if fieldnames is not None:
+        header_columns = imported_player_columns(fieldnames)
+        update_columns = [column for column in update_columns if column in header_columns]
+    if not upsert or not update_columns:
+        return statement.on_conflict_do_nothing(index_elements=[table.c.natural_key])
+    return statement.on_conflict_do_update(
+        index_elements=[table.c.natural_key],
+        set_={**{column: statement.excluded[column] for column in update_columns},
+              'updated_at': datetime.utcnow()},
+        where=db.or_(*[table.c[column].is_distinct_from(statement.excluded[column])
+                       for column in update_columns])
+    )
+
+
+def _count_written(counts, rows, existing, written):
+    counts['inserted'] += len(written - existing.keys())
+    counts['updated'] += len(written & existing.keys())
+    counts['unchanged'] += len(rows) - len(written)
+
+
+def write_player_chunk(values, upsert=False, sync=True, fieldnames=None):
+    """
+    Write a chunk of player value dicts with one batched statement and commit.
+
+    Rows repeating a natural key within the chunk are merged (the last one
+    wins). In upsert mode existing players are updated only when a value
+    differs; otherwise existing players are skipped.
+
+    Args:
+        values: List of dicts from parse_player_row()
+        upsert: Update players that already exist
+        sync: Refresh dashboard snapshots and cached exports for the chunk
+            (callers writing chunks concurrently sync once at the end instead)
+        fieldnames: CSV header; in upsert mode only the columns it provides
+            are updated (all parsed columns when None)
+
+    Returns:
+        dict: inserted, updated and unchanged row counts
+    """
+    counts = {'inserted': 0, 'updated': 0, 'unchanged': 0}
+    if not values:
+        return counts
+
+    rows, counts['unchanged'] = merge_player_rows(values)
+
+    table = Player.__table__
+    existing = dict(db.session.execute(
+        db.select(table.c.natural_key, table.c.team)
+        .where(table.c.natural_key.in_([row['natural_key'] for row in rows]))
+    ).all())
+
+    insert = _dialect_insert()
+    if insert is None:
+        # No ON CONFLICT support: add new players only
+        new_rows = [row for row in rows if row['natural_key'] not in existing]
+        if new_rows:
+            db.session.execute(table.insert(), new_rows)
+        written = {row['natural_key'] for row in new_rows}
+    else:
+        statement = on_player_conflict(insert(table), list(rows[0]), upsert, fieldnames)
+        written = set(db.session.execute(statement.returning(table.c.natural_key), rows).scalars())
+    _count_written(counts, rows, existing, written)
+
+    if sync:
+        sync_after_bulk_player_write({row['team'] for row in rows} | set(existing.values()))
+    db.session.commit()
+    return counts
+
+
+def copy_player_chunk(values, upsert=False, sync=True, fieldnames=None):
+    """
+    PostgreSQL variant of write_player_chunk(): COPY the chunk into a staging
+    table, then merge it into player with one INSERT ... SELECT ... ON CONFLICT.
+
+    Returns:
+        dict: inserted, updated and unchanged row counts
+    """
+    from sqlalchemy.dialects.postgresql import insert
+
+    counts = {'inserted': 0, 'updated': 0, 'unchanged': 0}
+    if not values:
+        return counts
+
+    rows, counts['unchanged'] = merge_player_rows(values)
+    columns = list(rows[0])
+    table = Player.__table__
+    text_columns = [column for column in columns if isinstance(table.c[column].type, db.String)]
+    copy_rows_to_temp_table(PLAYER_STAGE_TABLE, table.name, columns, rows, text_columns)
+
+    stage = db.table(PLAYER_STAGE_TABLE, *[db.column(column) for column in columns])
+    existing = dict(db.session.execute(
+        db.select(table.c.natural_key, table.c.team)
+        .join(stage, stage.c.natural_key == table.c.natural_key)
+    ).all())
+
+    now = datetime.utcnow()
+    statement = insert(table).from_select(
+        columns + ['created_at', 'updated_at'],
+        db.select(*[stage.c[column] for column in columns],
+                  db.literal(now, db.DateTime), db.literal(now, db.DateTime))
+    )
+    statement = on_player_conflict(statement, columns, upsert, fieldnames)
+    written = set(db.session.execute(statement.returning(table.c.natural_key)).scalars())
+    _count_written(counts, rows, existing, written)
+
+    if sync:
+        sync_after_bulk_player_write({row['team'] for row in rows} | set(existing.values()))
+    db.session.commit()  # also drops the staging table
+    return counts
+
+
+def get_player_chunk_writer():
+    """Return (chunk writer, chunk size) for the bound database: COPY on PostgreSQL, batched INSERTs elsewhere."""
+    if copy_supported():
+        return copy_player_chunk, PLAYER_COPY_CHUNK_SIZE
+    return write_player_chunk, PLAYER_IMPORT_CHUNK_SIZE
+
+
+def new_import_stats():
+    """Return an empty stats dict in the shape import_players() reports."""
+    return {'imported': 0, 'inserted': 0, 'updated': 0, 'unchanged': 0,
+            'error_count': 0, 'errors': [], 'chunks': 0, 'rows': 0, 'elapsed': 0.0, 'fieldnames': []}
+
+
+def add_chunk_counts(stats, counts):
+    """Add one chunk writer's counts to a stats dict from new_import_stats()."""
+    for key, count in counts.items():
+        stats[key] += count
+    stats['imported'] = stats['inserted'] + stats['updated']
+    stats['chunks'] += 1
+
+
+def iter_player_chunks(stream, chunk_size, stats):
+    """
+    Parse a binary CSV stream into chunks of player value dicts.
+
+    Rows that fail validation are counted and described in stats['errors'];
+    stats['rows'] counts every row read and stats['fieldnames'] holds the CSV
+    header once the first row is read.
+
+    Yields:
+        list: Up to chunk_size dicts from parse_player_row()
+    """
+    chunk = []
+    for row_num, row in iter_csv_rows(stream):
+        stats['rows'] += 1
+        if not stats['fieldnames']:
+            stats['fieldnames'] = [name for name in row.keys() if name is not None]
+        try:
+            chunk.append(parse_player_row(row))
+        except Exception as e:
+            stats['errors'].append(f"Row {row_num}: {str(e)}")
+            stats['error_count'] += 1
+            continue
+        if len(chunk) >= chunk_size:
+            yield chunk
+            chunk = []
+    if chunk:
+        yield chunk
+
+
+def import_players(stream, upsert=False, chunk_size=None, progress=None):
+    """
+    Import players from a binary CSV stream in committed chunks.
+
+    Args:
+        stream: Binary file object with the CSV upload
+        upsert: Update players that already exist instead of skipping them
+        chunk_size: Rows validated and written per chunk (defaults to the
+            writer's chunk size)
+        progress: Optional callback(stats) called after every chunk
+
+    Returns:
+        dict: imported (inserted + updated), inserted, updated, unchanged,
+        error_count, errors (list of messages), chunks, rows and elapsed seconds
+    """
+    write_chunk, default_chunk_size = get_player_chunk_writer()
+    chunk_size = chunk_size or default_chunk_size
+    stats = new_import_stats()
+    started = time.perf_counter()
+    for chunk in iter_player_chunks(stream, chunk_size, stats):
+        add_chunk_counts(stats, write_chunk(chunk, upsert=upsert, fieldnames=stats['fieldnames']))
+        stats['elapsed'] = time.perf_counter() - started
+        if progress:
+            progress(stats)
+    stats['elapsed'] = time.perf_counter() - started
+    return stats
+
+
+def get_known_teams():
+    """Return existing team names keyed by their lowercased form."""
+    names = db.session.query(Team.name).union(
+        db.session.query(Player.team).filter(Player.team.isnot(None), Player.team != '')
+    ).all()
+    return {name.lower(): name for (name,) in names if name}
+
+
+def validate_player_row(row, known_teams):
+    """
+    Check one CSV row without touching the database.
+
+    Args:
+        row: Row dict from csv.DictReader
+        known_teams: Dict from get_known_teams(); team checks are skipped when empty
+
+    Returns:
+        list: (field, message) tuples, empty when the row is valid
+    """
+    errors = []
+    for field in ('first_name', 'last_name'):
+        if not _clean(row, field):
+            errors.append((field, 'Required'))
+    for field in AMOUNT_IMPORT_FIELDS:
+        value = _clean(row, field)
+        if value:
+            try:
+                if float(value) < 0:
+                    errors.append((field, f"Amount cannot be negative: '{value}'"))
+            except ValueError:
+                errors.append((field, f"Not a number: '{value}'"))
+    for field in BOOLEAN_IMPORT_FIELDS:
+        value = _clean(row, field).lower()
+        if value and value not in TRUE_VALUES and value not in FALSE_VALUES:
+            errors.append((field, f"Expected yes/no: '{_clean(row, field)}'"))
+    team = _clean(row, 'team')
+    if team and known_teams and team.lower() not in known_teams:
+        errors.append(('team', f"Unknown team '{team}'"))
+    return errors
+
+
+def existing_natural_keys(keys):
+    """Return the subset of natural keys that already belong to a player."""
+    keys = list(keys)
+    found = set()
+    for start in range(0, len(keys), PLAYER_IMPORT_CHUNK_SIZE):
+        found.update(db.session.execute(
+            db.select(Player.natural_key).where(Player.natural_key.in_(keys[start:start + PLAYER_IMPORT_CHUNK_SIZE]))
+        ).scalars())
+    return found
+
+
+def validate_player_import(stream):
+    """
+    Parse and validate a whole CSV upload in a single pass.
+
+    Team names are matched case-insensitively and replaced with the existing
+    spelling. Rows repeating an earlier row's season/name/birth year are
+    reported as duplicates.
+
+    Args:
+        stream: Binary file object with the CSV upload
+
+    Returns:
+        dict: rows (column values of valid rows), errors (list of dicts with
+        row, messages and the original values), fieldnames, total, valid,
+        error_count and existing (valid rows matching a current player)
+    """
+    known_teams = get_known_teams()
+    rows = []
+    errors = []
+    fieldnames = []
+    seen_keys = {}
+    total = 0
+
+    for row_num, row in iter_csv_rows(stream):
+        total += 1
+        if not fieldnames:
+            fieldnames = [name for name in row.keys() if name is not None]
+        row_errors = validate_player_row(row, known_teams)
+        values = None
+        if not row_errors:
+            try:
+                values = parse_player_row(row)
+            except ValueError as e:
+                row_errors.append(('', str(e)))
+        if values is not None:
+            first_row = seen_keys.setdefault(values['natural_key'], row_num)
+            if first_row != row_num:
+                row_errors.append(('', f"Duplicate of row {first_row}"))
+        if row_errors:
+            errors.append({
+                'row': row_num,
+                'messages': [f"{field}: {message}" if field else message for field, message in row_errors],
+                'values': {name: row.get(name) or '' for name in fieldnames}
+            })
+            continue
+        if values['team']:
+            values['team'] = known_teams.get(values['team'].lower(), values['team'])
+        rows.append(values)
+
+    return {
+        'rows': rows,
+        'errors': errors,
+        'fieldnames': fieldnames,
+        'total': total,
+        'valid': len(rows),
+        'error_count': len(errors),
+        'existing': len(existing_natural_keys(values['natural_key'] for values in rows))
+    }
+
+
+def get_import_folder():
+    """Return (and create) the folder holding validated import batches."""
+    folder = os.path.join(current_app.instance_path, 'imports')
+    os.makedirs(folder, exist_ok=True)
+    return folder
+
+
+def _batch_path(token):
+    return os.path.join(get_import_folder(), f"batch_{token}.json")
+
+
+def cleanup_import_batches():
+    """Delete validated batches older than IMPORT_BATCH_TTL."""
+    cutoff = time.time() - IMPORT_BATCH_TTL.total_seconds()
+    folder = get_import_folder()
+    for name in os.listdir(folder):
+        path = os.path.join(folder, name)
+        try:
+            if os.path.getmtime(path) < cutoff:
+                os.remove(path)
+        except OSError as e:
+            print(f"Error removing import batch {path}: {str(e)}")
+
+
+def save_import_batch(validation, user_id, filename):
+    """
+    Store a validated import under a new token until it is confirmed.
+
+    Returns:
+        str: Token identifying the batch
+    """
+    cleanup_import_batches()
+    token = secrets.token_urlsafe(16)
+    batch = dict(validation, user_id=user_id, filename=filename,
+                 created_at=datetime.utcnow().isoformat())
+    temp_path = f"{_batch_path(token)}.tmp"
+    with open(temp_path, 'w', encoding='utf-8') as output:
+        json.dump(batch, output)
+    os.replace(temp_path, _batch_path(token))
+    return token
+
+
+def load_import_batch(token, user_id):
+    """Return the batch saved under a token for this user, or None if missing or expired."""
+    if not token or not token.replace('-', '').replace('_', '').isalnum():
+        return None
+    path = _batch_path(token)
+    try:
+        if os.path.getmtime(path) < time.time() - IMPORT_BATCH_TTL.total_seconds():
+            return None
+        with open(path, encoding='utf-8') as batch_file:
+            batch = json.load(batch_file)
+    except (OSError, ValueError):
+        return None
+    return batch if batch.get('user_id') == user_id else None
+
+
+def discard_import_batch(token):
+    """Delete a saved batch once it has been imported or cancelled."""
+    try:
+        os.remove(_batch_path(token))
+    except OSError:
+        pass
+
+
+def write_import_errors_csv(batch, output):
+    """Write the per-row error report of a batch: row number, errors, then the original columns."""
+    writer = csv.writer(output)
+    writer.writerow(['row', 'errors'] + batch['fieldnames'])
+    for error in batch['errors']:
+        writer.writerow([error['row'], '; '.join(error['messages'])]
+                        + [error['values'].get(name, '') for name in batch['fieldnames']])
+
+
+def import_player_batch(batch, upsert=False, chunk_size=None, progress=None):
+    """
+    Write the valid rows of a saved batch in committed chunks.
+
+    Returns:
+        dict: Same stats as import_players(); rows counts the whole file and
+        error_count the rows rejected during validation
+    """
+    write_chunk, default_chunk_size = get_player_chunk_writer()
+    chunk_size = chunk_size or default_chunk_size
+    stats = new_import_stats()
+    stats['rows'] = batch['total']
+    stats['error_count'] = batch['error_count']
+    started = time.perf_counter()
+    rows = batch['rows']
+    for start in range(0, len(rows), chunk_size):
+        add_chunk_counts(stats, write_chunk(rows[start:start + chunk_size], upsert=upsert,
+                                            fieldnames=batch['fieldnames']))
+        stats['elapsed'] = time.perf_counter() - started
+        if progress:
+            progress(stats)
+    stats['elapsed'] = time.perf_counter() - started
+    return stats
@@ -0,0 +1,196 @@
+"""
+Live game scoring over Server-Sent Events.
+
+Routes that record goals and assists publish small JSON events to an
+in-process pub/sub keyed by game ID, and every open
+/game-tracker/<id>/stream connection receives them as SSE messages. A stream
+opens with a "game" snapshot (score, status, goal and assist IDs) so viewers
+can tell when they missed something, and it ends after STREAM_MAX_SECONDS;
+the browser's EventSource reconnects on its own and gets a fresh snapshot.
+
+The pub/sub lives in the web process, so with several workers a viewer only
+hears events published by its own worker until its next reconnect.
+
+Each open stream holds a worker thread, so a process serves at most
+LIVE_STREAM_LIMIT streams at once; subscribe() turns further viewers away
+and the game page falls back to polling /game-tracker/<id>/live for them.
+"""
+
+import json
+import queue
+import threading
+import time
+
+from app import db
+from app.models import Goal, Assist
+
+# Seconds between keep-alive comments on an idle stream
+HEARTBEAT_SECONDS = 15
+# Seconds before a stream is closed and the browser reconnects
+STREAM_MAX_SECONDS = 120
+# Milliseconds the browser waits before reconnecting
+RETRY_MILLISECONDS = 3000
+# Events buffered per viewer before the viewer is dropped as too slow
+SUBSCRIBER_QUEUE_SIZE = 100
+
+
+class GameSubscriber:
+    """Queue of pending events for one open stream."""
+
+    def __init__(self, game_id):
+        self.game_id = game_id
+        self.queue = queue.Queue(maxsize=SUBSCRIBER_QUEUE_SIZE)
+        self.overflowed = False
+
+
+_subscribers = {}
+_subscribers_lock = threading.Lock()
+
+
+def subscribe(game_id, max_streams=None):
+    """
+    Register a new viewer of a game.
+
+    Args:
+        game_id: ID of the game
+        max_streams: Most streams this process keeps open across all games
+            (None for no limit)
+
+    Returns:
+        GameSubscriber, or None when the process is already at max_streams
+    """
+    subscriber = GameSubscriber(game_id)
+    with _subscribers_lock:
+        if max_streams is not None and _count_streams() >= max_streams:
+            return None
+        _subscribers.setdefault(game_id, set()).add(subscriber)
+    return subscriber
+
+
+def unsubscribe(subscriber):
+    """Remove a viewer; safe to call more than once."""
+    with _subscribers_lock:
+        viewers = _subscribers.get(subscriber.game_id)
+        if viewers is not None:
+            viewers.discard(subscriber)
+            if not viewers:
+                del _subscribers[subscriber.game_id]
+
+
+def open_stream_count():
+    """Number of streams open in this process."""
+    with _subscribers_lock:
+        return _count_streams()
+
+
+def _count_streams():
+    # Callers hold _subscribers_lock
+    return sum(len(viewers) for viewers in _subscribers.values())
+
+
+def publish_game_event(game_id, event_name, data):
+    """
+    Send an event to every viewer of a game in this process.
+
+    Never blocks: a viewer whose queue is full is marked overflowed and its
+    stream ends, so the browser reconnects and resynchronizes.
+
+    Args:
+        game_id: ID of the game
+        event_name: SSE event name ("game", "goal", "assist", "resync", "deleted")
+        data: JSON-serializable payload
+
+    Returns:
+        int: Number of viewers the event was queued for
+    """
+    with _subscribers_lock:
+        viewers = list(_subscribers.get(game_id, ()))
+    message = format_sse(event_name, data)
+    delivered = 0
+    for subscriber in viewers:
+        try:
+            subscriber.queue.put_nowait(message)
+            delivered += 1
+        except queue.Full:
+            subscriber.overflowed = True
+    return delivered
+
+
+def format_sse(event_name, data):
+    """Encode one SSE message."""
+    return f"event: {event_name}\ndata: {json.dumps(data, separators=(',', ':'))}\n\n"
+
+
+def iter_game_stream(subscriber, snapshot, heartbeat_seconds=HEARTBEAT_SECONDS, max_seconds=STREAM_MAX_SECONDS):
+    """
+    Yield the SSE messages of one stream: the snapshot, then published events.
+
+    The generator does not touch the database, so the request's connection
+    is back in the pool while the stream is open.
+
+    Args:
+        subscriber: GameSubscriber returned by subscribe()
+        snapshot: Payload of the opening "game" event
+        heartbeat_seconds: Idle seconds between keep-alive comments
+        max_seconds: Seconds before the stream ends
+    """
+    yield f"retry: {RETRY_MILLISECONDS}\n\n"
+    yield format_sse('game', snapshot)
+    deadline = time.monotonic() + max_seconds
+    while not subscriber.overflowed:
+        remaining = deadline - time.monotonic()
+        if remaining <= 0:
+            break
+        try:
+            yield subscriber.queue.get(timeout=min(heartbeat_seconds, remaining))
+        except queue.Empty:
+            yield ": keep-alive\n\n"
+
+
+### Event payloads ###
+
+def game_snapshot(game):
+    """Score, status and the IDs of the goals and assists of a game."""
+    return {
+        'game_id': game.id,
+        'badgers_score': game.badgers_score,
+        'opponent_score': game.opponent_score,
+        'game_status': game.game_status,
+        'goal_ids': db.session.execute(
+            db.select(Goal.id).where(Goal.game_id == game.id).order_by(Goal.id)).scalars().all(),
+        'assist_ids': db.session.execute(
+            db.select(Assist.id).where(Assist.game_id == game.id).order_by(Assist.id)).scalars().all()
+    }
+
+
+def goal_event(game, goal, scorer):
+    """Payload of a "goal" event."""
+    return {
+        'game_id': game.id,
+        'badgers_score': game.badgers_score,
+        'opponent_score': game.opponent_score,
+        'goal': {
+            'id': goal.id,
+            'client_key': goal.client_key,
+            'scorer_id': goal.scorer_id,
+            'scorer_name': f"{scorer.first_name} {scorer.last_name}" if scorer else '',
+            'jersey_number': scorer.jersey_number if scorer else None,
+            'period': goal.period,
+            'time_scored': goal.time_scored,
+            'goal_type': goal.goal_type
+        }
+    }
+
+
+def assist_event(game_id, assist, assister):
+    """Payload of an "assist" event."""
+    return {
+        'game_id': game_id,
+        'assist': {
+            'id': assist.id,
+            'client_key': assist.client_key,
+            'goal_id': assist.goal_id,
+            'assister_id': int(assist.assister_id),  # form posts send strings
+            'assister_name': f"{assister.first_name} {assister.last_name}" if assister else ''
+        }
+    }
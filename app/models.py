@@ -1,5 +1,6 @@
 from app import db
 from flask_login import UserMixin
+from sqlalchemy import event
 from datetime import datetime, timedelta
 import secrets
 
@@ -54,8 +55,8 @@ class Player(db.Model):
     birth_year = db.Column(db.String(10))  # Year only as string
     team = db.Column(db.String(30))
     position = db.Column(db.String(30))
-    # Optional additional teams (JSON-encoded list of team names) for rare multi-team cases
-    extra_teams = db.Column(db.Text)
+    # Normalized "season|first|last|birth year" key; unique so imports can upsert on it
+    natural_key = db.Column(db.String(140), unique=True, index=True)
     
     # Jersey and Equipment Information
     jersey_number = db.Column(db.String(10))
@@ -99,6 +100,8 @@ class Player(db.Model):
     
     # Relationships
     documents = db.relationship('PlayerDocument', backref='player', lazy=True, cascade='all, delete-orphan')
+    # Optional additional teams for rare multi-team cases (primary team stays in `team`)
+    team_memberships = db.relationship('PlayerTeam', backref='player', lazy=True, cascade='all, delete-orphan')
 
     def __repr__(self):
         return f"Player('{self.first_name} {self.last_name}', Team: {self.team})"
@@ -111,14 +114,61 @@ class Player(db.Model):
     def guardian_full_name(self):
         return f"{self.guardian_first_name} {self.guardian_last_name}"
 
+    @staticmethod
+    def build_natural_key(season, first_name, last_name, birth_year):
+        """Build the normalized natural key identifying a player within a season."""
+        parts = [season, first_name, last_name, birth_year]
+        return '|'.join(' '.join((part or '').split()).lower() for part in parts)
+
     @property
     def extra_teams_list(self):
-        """Return additional teams as a Python list (parsed from JSON text)."""
-        try:
-            import json
-            return json.loads(self.extra_teams) if self.extra_teams else []
-        except Exception:
-            return []
+        """Return the names of the additional teams as a sorted list."""
+        return sorted(membership.team_name for membership in self.team_memberships)
+
+    def set_extra_teams(self, team_names):
+        """Replace the additional teams, keeping memberships that did not change."""
+        wanted = {team for team in (team_names or []) if team and team != self.team}
+        for membership in list(self.team_memberships):
+            if membership.team_name in wanted:
+                wanted.discard(membership.team_name)
+            else:
+                self.team_memberships.remove(membership)
+        for team in sorted(wanted):
+            self.team_memberships.append(PlayerTeam(team_name=team))
+
+
+NATURAL_KEY_FIELDS = ('season', 'first_name', 'last_name', 'birth_year')
+
+
+@event.listens_for(Player, 'before_insert')
+@event.listens_for(Player, 'before_update')
+def set_player_natural_key(mapper, connection, target):
+    """Keep Player.natural_key in step with the fields it is built from."""
+    state = db.inspect(target)
+    if state.persistent and not any(state.attrs[field].history.has_changes() for field in NATURAL_KEY_FIELDS):
+        # Leave untouched rows alone (older duplicates keep a NULL key)
+        return
+    target.natural_key = Player.build_natural_key(target.season, target.first_name,
+                                                  target.last_name, target.birth_year)
+
+
+# Index backing the keyset-paginated roster order (last name, first name, id)
+db.Index('ix_player_roster_order',
+         db.func.coalesce(Player.last_name, ''), db.func.coalesce(Player.first_name, ''), Player.id)
+
+
+class PlayerTeam(db.Model):
+    """Additional team a player plays for, besides their primary Player.team."""
+    __table_args__ = (
+        # Team -> players lookups (the primary key serves player -> teams)
+        db.Index('ix_player_team_team_player', 'team_name', 'player_id'),
+    )
+
+    player_id = db.Column(db.Integer, db.ForeignKey('player.id', ondelete='CASCADE'), primary_key=True)
+    team_name = db.Column(db.String(50), primary_key=True)
+
+    def __repr__(self):
+        return f"PlayerTeam(Player {self.player_id}, '{self.team_name}')"
 
 
 class Folder(db.Model):
@@ -390,6 +440,11 @@ practice_plan_attachments = db.Table('practice_plan_attachments',
 
 class Game(db.Model):
     """Model for storing game information."""
+    __table_args__ = (
+        # Serves per-team, per-season game lists and "latest games" ordered by date
+        db.Index('ix_game_team_season_date', 'team_name', 'season', 'game_date'),
+    )
+
     id = db.Column(db.Integer, primary_key=True)
     created_at = db.Column(db.DateTime, nullable=False, default=datetime.utcnow)
     updated_at = db.Column(db.DateTime, nullable=False, default=datetime.utcnow, onupdate=datetime.utcnow)
@@ -399,6 +454,8 @@ class Game(db.Model):
     opponent_team = db.Column(db.String(100), nullable=False)
     rink_name = db.Column(db.String(100), nullable=False)
     rink_location = db.Column(db.String(200))  # Optional: address or city
+    # Season derived from game_date, e.g., "2024-25"
+    season = db.Column(db.String(10), nullable=False, index=True)
     
     # Team Information
     team_name = db.Column(db.String(50), nullable=False)  # Which Badgers team played
@@ -413,6 +470,9 @@ class Game(db.Model):
     # Additional Information
     notes = db.Column(db.Text)
     
+    # Idempotency key of the game form submission that added the game
+    client_key = db.Column(db.String(64), unique=True, index=True)
+    
     # Relationships
     user_id = db.Column(db.Integer, db.ForeignKey('user.id'), nullable=False)
     
@@ -422,6 +482,12 @@ class Game(db.Model):
     
     def __repr__(self):
         return f"Game('{self.team_name}' vs '{self.opponent_team}' on {self.game_date})"
+
+    @staticmethod
+    def season_for_date(game_date):
+        """Return the season ("2024-25") a date falls in; seasons start on SEASON_START_MONTH."""
+        start_year = game_date.year if game_date.month >= SEASON_START_MONTH else game_date.year - 1
+        return f"{start_year}-{(start_year + 1) % 100:02d}"
     
     @property
     def result(self):
@@ -434,6 +500,18 @@ class Game(db.Model):
             return "Tie"
 
 
+# Month in which a new hockey season starts (games from August belong to the next season)
+SEASON_START_MONTH = 8
+
+
+@event.listens_for(Game, 'before_insert')
+@event.listens_for(Game, 'before_update')
+def set_game_season(mapper, connection, target):
+    """Keep Game.season in step with game_date."""
+    if target.game_date is not None:
+        target.season = Game.season_for_date(target.game_date)
+
+
 class Goal(db.Model):
     """Model for storing individual goals scored."""
     id = db.Column(db.Integer, primary_key=True)
@@ -452,6 +530,9 @@ class Goal(db.Model):
     # Goal Type (optional)
     goal_type = db.Column(db.String(20))  # even_strength, power_play, short_handed, empty_net
     
+    # Idempotency key of the offline scoring event that recorded the goal
+    client_key = db.Column(db.String(64), unique=True, index=True)
+    
     # Relationships
     scorer = db.relationship('Player', backref='goals_scored', foreign_keys=[scorer_id])
     
@@ -480,6 +561,9 @@ class Assist(db.Model):
     # Assist Type
     assist_type = db.Column(db.String(20), default='primary')  # primary, secondary
     
+    # Idempotency key of the offline scoring event that recorded the assist
+    client_key = db.Column(db.String(64), unique=True, index=True)
+    
     # Relationships
     assister = db.relationship('Player', backref='assists', foreign_keys=[assister_id])
     goal = db.relationship('Goal', backref='assists')
@@ -490,6 +574,11 @@ class Assist(db.Model):
 
 class Contact(db.Model):
     """Model for storing team contacts for game scheduling."""
+    __table_args__ = (
+        # Lookup key for matching imported contacts to existing ones
+        db.Index('ix_contact_user_team_age', 'user_id', 'team_name', 'age_group'),
+    )
+
     id = db.Column(db.Integer, primary_key=True)
     created_at = db.Column(db.DateTime, nullable=False, default=datetime.utcnow)
     updated_at = db.Column(db.DateTime, nullable=False, default=datetime.utcnow, onupdate=datetime.utcnow)
@@ -535,4 +624,193 @@ class ContactPerson(db.Model):
     contact_id = db.Column(db.Integer, db.ForeignKey('contact.id'), nullable=False)
 
     def __repr__(self):
-        return f"ContactPerson('{self.full_name}' as {self.role})"
\ No newline at end of file
+        return f"ContactPerson('{self.full_name}' as {self.role})"
+
+### Dashboard Models ###
+
+class TeamDashboardSnapshot(db.Model):
+    """Precomputed per-team dashboard card, refreshed whenever its source rows change."""
+    id = db.Column(db.Integer, primary_key=True)
+    refreshed_at = db.Column(db.DateTime, nullable=False, default=datetime.utcnow)
+    
+    # Team the card belongs to (matches Player.team / Game.team_name / Team.name)
+    team_name = db.Column(db.String(50), nullable=False, unique=True, index=True)
+    
+    # Roster counts
+    player_count = db.Column(db.Integer, nullable=False, default=0)
+    unpaid_count = db.Column(db.Integer, nullable=False, default=0)
+    
+    # Record over the most recent games
+    wins = db.Column(db.Integer, nullable=False, default=0)
+    losses = db.Column(db.Integer, nullable=False, default=0)
+    ties = db.Column(db.Integer, nullable=False, default=0)
+    
+    # JSON-encoded list of the most recent games (opponent, date, scores)
+    recent_games = db.Column(db.Text)
+    
+    # Next upcoming practice plan at refresh time
+    next_practice_id = db.Column(db.Integer)
+    next_practice_title = db.Column(db.String(200))
+    next_practice_date = db.Column(db.Date)
+
+    def __repr__(self):
+        return f"TeamDashboardSnapshot('{self.team_name}', Players: {self.player_count})"
+
+    @property
+    def recent_games_list(self):
+        """Return the recent games as a list of dicts with parsed dates."""
+        try:
+            import json
+            games = json.loads(self.recent_games) if self.recent_games else []
+        except Exception:
+            return []
+        for game in games:
+            game['game_date'] = datetime.strptime(game['game_date'], '%Y-%m-%d').date()
+        return games
+
+
+
+### Statistics Models ###
+
+class PlayerTeamSeasonStats(db.Model):
+    """Precomputed goals, assists and games played of a player for one team and season."""
+    __table_args__ = (
+        db.UniqueConstraint('player_id', 'team_name', 'season', name='uq_player_team_season_stats'),
+    )
+
+    id = db.Column(db.Integer, primary_key=True)
+    refreshed_at = db.Column(db.DateTime, nullable=False, default=datetime.utcnow)
+    
+    # Player and the team (primary or additional) the numbers are for
+    player_id = db.Column(db.Integer, db.ForeignKey('player.id', ondelete='CASCADE'), nullable=False, index=True)
+    team_name = db.Column(db.String(50), nullable=False, index=True)
+    season = db.Column(db.String(10))  # Season of the games (Game.season), e.g., "2024-25"
+    
+    # Totals over the team's games
+    goals = db.Column(db.Integer, nullable=False, default=0)
+    assists = db.Column(db.Integer, nullable=False, default=0)
+    points = db.Column(db.Integer, nullable=False, default=0)
+    games_played = db.Column(db.Integer, nullable=False, default=0)
+    
+    # Relationships
+    player = db.relationship('Player', backref=db.backref('team_stats', lazy=True, passive_deletes=True))
+
+    def __repr__(self):
+        return f"PlayerTeamSeasonStats(Player {self.player_id}, '{self.team_name}', Points: {self.points})"
+
+
+class TeamSeasonStanding(db.Model):
+    """Cached season record of a team; deleted whenever one of the team's games for the season is written."""
+    __table_args__ = (
+        db.UniqueConstraint('team_name', 'season', name='uq_team_season_standing'),
+    )
+
+    id = db.Column(db.Integer, primary_key=True)
+    refreshed_at = db.Column(db.DateTime, nullable=False, default=datetime.utcnow)
+
+    # Team and season (Game.season) the record is for
+    team_name = db.Column(db.String(50), nullable=False)
+    season = db.Column(db.String(10), nullable=False, index=True)
+    # HOME_RINKS setting the home/away split was computed with
+    home_rinks = db.Column(db.Text, nullable=False, default='')
+
+    # Record over completed games
+    games_played = db.Column(db.Integer, nullable=False, default=0)
+    wins = db.Column(db.Integer, nullable=False, default=0)
+    losses = db.Column(db.Integer, nullable=False, default=0)
+    ties = db.Column(db.Integer, nullable=False, default=0)
+    points = db.Column(db.Integer, nullable=False, default=0)
+    goals_for = db.Column(db.Integer, nullable=False, default=0)
+    goals_against = db.Column(db.Integer, nullable=False, default=0)
+    goal_differential = db.Column(db.Integer, nullable=False, default=0)
+
+    # Home (rink in HOME_RINKS) and away splits
+    home_wins = db.Column(db.Integer, nullable=False, default=0)
+    home_losses = db.Column(db.Integer, nullable=False, default=0)
+    home_ties = db.Column(db.Integer, nullable=False, default=0)
+    away_wins = db.Column(db.Integer, nullable=False, default=0)
+    away_losses = db.Column(db.Integer, nullable=False, default=0)
+    away_ties = db.Column(db.Integer, nullable=False, default=0)
+
+    # Current streak, e.g., "W" and 3 for three straight wins
+    streak_result = db.Column(db.String(1))
+    streak_length = db.Column(db.Integer, nullable=False, default=0)
+
+    def __repr__(self):
+        return f"TeamSeasonStanding('{self.team_name}', '{self.season}', {self.wins}-{self.losses}-{self.ties})"
+
+    @property
+    def streak(self):
+        """Return the current streak as a string, e.g., "W3"."""
+        return f"{self.streak_result}{self.streak_length}" if self.streak_result else ''
+
+    def to_dict(self):
+        """Serialize the standing for the JSON endpoint."""
+        return {
+            'team_name': self.team_name,
+            'season': self.season,
+            'games_played': self.games_played,
+            'wins': self.wins,
+            'losses': self.losses,
+            'ties': self.ties,
+            'points': self.points,
+            'goals_for': self.goals_for,
+            'goals_against': self.goals_against,
+            'goal_differential': self.goal_differential,
+            'home': {'wins': self.home_wins, 'losses': self.home_losses, 'ties': self.home_ties},
+            'away': {'wins': self.away_wins, 'losses': self.away_losses, 'ties': self.away_ties},
+            'streak': self.streak,
+            'refreshed_at': self.refreshed_at.isoformat() if self.refreshed_at else None
+        }
+
+
+class PlayerAnalyticsSnapshot(db.Model):
+    """Cached JSON payload of the advanced player metrics of one season."""
+    id = db.Column(db.Integer, primary_key=True)
+    refreshed_at = db.Column(db.DateTime, nullable=False, default=datetime.utcnow)
+    
+    # Season of the games (Game.season) the metrics cover
+    season = db.Column(db.String(10), nullable=False, unique=True, index=True)
+    
+    # JSON-encoded metrics as served by the analytics endpoint
+    payload = db.Column(db.Text, nullable=False)
+
+    def __repr__(self):
+        return f"PlayerAnalyticsSnapshot('{self.season}', Refreshed: {self.refreshed_at})"
+
+### Export Models ###
+
+class ExportJob(db.Model):
+    """Background roster export; the finished file is reused until players change."""
+    id = db.Column(db.Integer, primary_key=True)
+    created_at = db.Column(db.DateTime, nullable=False, default=datetime.utcnow)
+    updated_at = db.Column(db.DateTime, nullable=False, default=datetime.utcnow, onupdate=datetime.utcnow)
+    completed_at = db.Column(db.DateTime)
+    
+    # Normalized filter spec (JSON) and its hash used to find reusable exports
+    job_key = db.Column(db.String(64), nullable=False, index=True)
+    filters = db.Column(db.Text, nullable=False)
+    
+    # Job Status
+    status = db.Column(db.String(20), nullable=False, default='queued')  # queued, running, completed, failed, stale
+    error = db.Column(db.Text)
+    
+    # Finished artifact
+    file_path = db.Column(db.String(500))
+    file_size = db.Column(db.BigInteger)
+    row_count = db.Column(db.Integer)
+    
+    # User who requested the export
+    user_id = db.Column(db.Integer, db.ForeignKey('user.id'), nullable=False)
+
+    def __repr__(self):
+        return f"ExportJob({self.id}, Status: {self.status})"
+
+    @property
+    def filters_dict(self):
+        """Return the filter spec as a dict."""
+        try:
+            import json
+            return json.loads(self.filters) if self.filters else {}
+        except Exception:
+            return {}
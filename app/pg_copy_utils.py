@@ -0,0 +1,94 @@
+"""
+PostgreSQL COPY helpers for bulk imports and exports.
+
+COPY moves rows between the client and the server as one CSV stream instead
+of one bound statement per row, which is much faster for large rosters on
+PostgreSQL. The helpers run on the session's connection, so they share its
+transaction. Callers check copy_supported() and keep their generic
+SQLAlchemy path for every other database (SQLite in development).
+"""
+
+import csv
+import io
+
+from flask import current_app
+
+from app import db
+
+
+def copy_supported():
+    """Return True when the session is bound to PostgreSQL via psycopg2 and COPY is enabled."""
+    if not current_app.config.get('PG_COPY_ENABLED', True):
+        return False
+    dialect = db.session.get_bind().dialect
+    return dialect.name == 'postgresql' and dialect.driver == 'psycopg2'
+
+
+def _raw_cursor():
+    # DBAPI cursor on the connection the session's transaction is using
+    return db.session.connection().connection.cursor()
+
+
+def copy_rows_to_temp_table(table_name, source_table, columns, rows, text_columns=()):
+    """
+    Create a transaction-scoped temp table shaped like source_table and COPY rows into it.
+
+    The temp table is dropped automatically when the transaction ends.
+
+    Args:
+        table_name: Name of the temp table to create
+        source_table: Name of the table whose column types are copied
+        columns: Column names, in the order of each row's values
+        rows: Iterable of value dicts keyed by column name
+        text_columns: Columns where empty strings are kept (not read back as NULL)
+
+    Returns:
+        int: Number of rows copied
+    """
+    column_list = ', '.join(columns)
+    db.session.execute(db.text(
+        f"CREATE TEMP TABLE {table_name} ON COMMIT DROP AS "
+        f"SELECT {column_list} FROM {source_table} WITH NO DATA"
+    ))
+
+    buffer = io.StringIO()
+    writer = csv.writer(buffer, lineterminator='\n')
+    row_count = 0
+    for row in rows:
+        writer.writerow(['' if row[column] is None else row[column] for column in columns])
+        row_count += 1
+    buffer.seek(0)
+
+    options = 'FORMAT csv'
+    if text_columns:
+        options += f", FORCE_NOT_NULL ({', '.join(text_columns)})"
+    cursor = _raw_cursor()
+    try:
+        cursor.copy_expert(f"COPY {table_name} ({column_list}) FROM STDIN WITH ({options})", buffer)
+    finally:
+        cursor.close()
+    return row_count
+
+
+def copy_query_to_file(statement, output):
+    """
+    Run a SELECT with COPY ... TO STDOUT and write its rows to a file object as CSV.
+
+    COPY does not accept bound parameters, so psycopg2 quotes them into the
+    statement text (mogrify) the same way it does for regular queries.
+
+    Args:
+        statement: SQLAlchemy Select
+        output: Writable text file object
+
+    Returns:
+        int: Number of rows written
+    """
+    compiled = statement.compile(dialect=db.session.get_bind().dialect)
+    cursor = _raw_cursor()
+    try:
+        sql = cursor.mogrify(f"COPY ({compiled}) TO STDOUT WITH (FORMAT csv)", compiled.params)
+        cursor.copy_expert(sql, output)
+        return cursor.rowcount
+    finally:
+        cursor.close()
@@ -0,0 +1,224 @@
+"""
+Roster filtering and keyset pagination helpers.
+
+The roster is ordered by (last_name, first_name, id), or by search rank and id
+when a search is active. Pages are fetched with a seek condition on those sort
+keys instead of OFFSET, so every page costs the same no matter how deep the
+user scrolls.
+"""
+
+import base64
+import json
+
+from app import db
+from app.models import Player, PlayerTeam
+from app.search_utils import apply_player_search, player_search_ranking
+
+# Number of players rendered per roster page
+ROSTER_PAGE_SIZE = 50
+
+# Roster sort keys; NULL names sort as empty strings on every database
+ROSTER_LAST_NAME_KEY = db.func.coalesce(Player.last_name, '')
+ROSTER_FIRST_NAME_KEY = db.func.coalesce(Player.first_name, '')
+
+
+def get_roster_filters(args):
+    """
+    Read the roster filter parameters from request args.
+
+    Args:
+        args: Request args (or form) mapping
+
+    Returns:
+        dict: team, season, paid ('true'/'false' or None) and search values
+    """
+    team = (args.get('team') or '').strip() or None
+    season = (args.get('season') or '').strip() or None
+    paid = (args.get('paid') or '').strip()
+    if paid in ('', 'None'):
+        paid = None
+    return {
+        'team': team,
+        'season': season,
+        'paid': paid,
+        'search': (args.get('search') or '').strip()
+    }
+
+
+def team_member_filter(team_name):
+    """
+    Build a condition matching players on a team, as primary team or additional team.
+
+    The additional-team check is an indexed lookup on player_team (team_name, player_id).
+    """
+    return db.or_(
+        Player.team == team_name,
+        Player.id.in_(db.select(PlayerTeam.player_id).where(PlayerTeam.team_name == team_name))
+    )
+
+
+def apply_roster_filters(query, filters, include_search=True):
+    """
+    Apply team, season and payment filters (and optionally search) to a Player query.
+
+    Search is applied unranked; use roster_query() to order by relevance.
+    """
+    if filters.get('team'):
+        query = query.filter(Player.team == filters['team'])
+    if filters.get('season'):
+        query = query.filter(Player.season == filters['season'])  # Keep as string
+    if filters.get('paid'):
+        query = query.filter(Player.paid_tuition == (filters['paid'].lower() == 'true'))
+    if include_search and filters.get('search'):
+        query = apply_player_search(query, filters['search'], ranked=False)
+    return query
+
+
+def roster_query(filters):
+    """
+    Build the filtered roster query and the sort keys it is ordered by.
+
+    Returns:
+        tuple: (query, sort_keys) where sort_keys is a list of SQL expressions
+    """
+    query = apply_roster_filters(Player.query, filters, include_search=False)
+    search = filters.get('search')
+    ranking = player_search_ranking(search) if search else None
+
+    if ranking is not None:
+        query = query.join(ranking, ranking.c.player_id == Player.id)
+        sort_keys = [ranking.c.rank, Player.id]
+    else:
+        if search:
+            query = apply_player_search(query, search, ranked=False)
+        sort_keys = [ROSTER_LAST_NAME_KEY, ROSTER_FIRST_NAME_KEY, Player.id]
+    return query.order_by(*sort_keys), sort_keys
+
+
+def roster_player_ids(filters):
+    """
+    Build a SELECT of the ids of every player matching a roster filter spec.
+
+    Used as the IN (...) target of set-based bulk actions, so acting on a whole
+    filter result never sends the matching ids through the request.
+    """
+    return apply_roster_filters(db.select(Player.id), filters)
+
+
+def count_roster_players(filters):
+    """Count the players matching a roster filter spec."""
+    return db.session.scalar(
+        db.select(db.func.count()).select_from(roster_player_ids(filters).subquery())
+    )
+
+
+def get_roster_facets(filters):
+    """
+    Count players per team, season and payment status in one grouped query.
+
+    The query applies the search filter and groups by (team, season,
+    paid_tuition); each facet is then summed in Python over the groups that
+    satisfy the *other* active filters, so every dropdown shows how many
+    players picking that option would return.
+
+    Args:
+        filters: Filter dict from get_roster_filters()
+
+    Returns:
+        dict: teams and seasons as (value, count) lists, paid counts keyed
+        'true'/'false', and total (players matching every filter)
+    """
+    query = db.session.query(Player.team, Player.season, Player.paid_tuition, db.func.count(Player.id))
+    if filters.get('search'):
+        query = apply_player_search(query, filters['search'], ranked=False)
+    groups = query.group_by(Player.team, Player.season, Player.paid_tuition).all()
+
+    paid_value = None
+    if filters.get('paid'):
+        paid_value = filters['paid'].lower() == 'true'
+
+    def matches(team, season, paid, skip):
+        if skip != 'team' and filters.get('team') and team != filters['team']:
+            return False
+        if skip != 'season' and filters.get('season') and season != filters['season']:
+            return False
+        if skip != 'paid' and paid_value is not None and paid != paid_value:
+            return False
+        return True
+
+    team_counts = {}
+    season_counts = {}
+    paid_counts = {'true': 0, 'false': 0}
+    total = 0
+    for team, season, paid, count in groups:
+        if team:
+            team_counts.setdefault(team, 0)
+            if matches(team, season, paid, 'team'):
+                team_counts[team] += count
+        if season is not None:
+            season_counts.setdefault(season, 0)
+            if matches(team, season, paid, 'season'):
+                season_counts[season] += count
+        if paid is not None and matches(team, season, paid, 'paid'):
+            paid_counts['true' if paid else 'false'] += count
+        if matches(team, season, paid, None):
+            total += count
+
+    # Keep the selected options listed even when nothing matches them
+    if filters.get('team'):
+        team_counts.setdefault(filters['team'], 0)
+    if filters.get('season'):
+        season_counts.setdefault(filters['season'], 0)
+
+    return {
+        'teams': sorted(team_counts.items()),
+        'seasons': sorted(season_counts.items(), reverse=True),
+        'paid': paid_counts,
+        'total': total
+    }
+
+
+def encode_cursor(values):
+    """Encode the sort-key values of the last row on a page as an opaque cursor."""
+    return base64.urlsafe_b64encode(json.dumps(values).encode('utf-8')).decode('ascii')
+
+
+def decode_cursor(cursor):
+    """Decode a cursor produced by encode_cursor(); returns None when invalid."""
+    if not cursor:
+        return None
+    try:
+        values = json.loads(base64.urlsafe_b64decode(cursor.encode('ascii')).decode('utf-8'))
+    except (ValueError, TypeError):
+        return None
+    return values if isinstance(values, list) else None
+
+
+def get_roster_page(filters, cursor=None, page_size=ROSTER_PAGE_SIZE):
+    """
+    Fetch one keyset-paginated page of the roster.
+
+    Args:
+        filters: Filter dict from get_roster_filters()
+        cursor: Cursor returned with the previous page (None for the first page)
+        page_size: Maximum number of players to return
+
+    Returns:
+        dict: players (list), next_cursor (str or None) and has_more (bool)
+    """
+    query, sort_keys = roster_query(filters)
+    values = decode_cursor(cursor)
+    if values is not None and len(values) == len(sort_keys):
+        query = query.filter(db.tuple_(*sort_keys) > db.tuple_(*[db.literal(value) for value in values]))
+
+    rows = query.add_columns(*sort_keys).limit(page_size + 1).all()
+    has_more = len(rows) > page_size
+    rows = rows[:page_size]
+
+    players = [row[0] for row in rows]
+    next_cursor = encode_cursor(list(rows[-1][1:])) if has_more and rows else None
+    return {
+        'players': players,
+        'next_cursor': next_cursor,
+        'has_more': has_more
+    }
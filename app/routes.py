@@ -1,15 +1,33 @@
-from flask import Blueprint, jsonify, request, render_template, redirect, url_for, flash, make_response, send_file
+from flask import Blueprint, jsonify, request, render_template, redirect, url_for, flash, make_response, send_file, Response, stream_with_context
 from flask_login import login_user, logout_user, current_user, login_required
-from app.models import User, PreApprovedEmails, Player, Folder, File, PasswordResetToken, PlayerDocument, Team, PracticePlan, DrillPiece, Game, Goal, Assist, Contact, ContactPerson
+from app.models import User, PreApprovedEmails, Player, Folder, File, PasswordResetToken, PlayerDocument, Team, PracticePlan, DrillPiece, Game, Goal, Assist, Contact, ContactPerson, ExportJob
 from app.player_forms import PlayerForm
 from app.forms import ContactForm, ContactFilterForm
 from app.forms import ContactPersonForm
 
 from app.email_utils import send_password_reset_email
 from app.utils import resolve_file_path, get_file_debug_info
+from app.dashboard_utils import build_dashboard_data
+from app.roster_utils import get_roster_filters, get_roster_page, get_roster_facets, roster_player_ids, \
+    count_roster_players, team_member_filter
+from app.export_utils import iter_roster_csv, gzip_chunks
+from app.export_jobs import enqueue_roster_export
+from app.bulk_utils import bulk_set_paid, bulk_delete_players
+from app.contact_import_utils import import_contacts
+from app.stats_utils import get_player_leaderboard, get_player_team_stats
+from app.scoresheet_utils import validate_scoresheet, write_scoresheet, apply_scoresheet_changes, scoresheet_form_data, \
+    apply_scoring_events, parse_client_key, load_scoresheet
+from app.standings_utils import get_standings, get_standing_seasons, get_home_rinks
+from app.analytics_utils import get_player_analytics
+from app.live_utils import subscribe, unsubscribe, iter_game_stream, publish_game_event, game_snapshot, \
+    goal_event, assist_event
+from app.import_utils import import_players, validate_player_import, save_import_batch, load_import_batch, \
+    discard_import_batch, write_import_errors_csv, import_player_batch
 from app import db, bcrypt
 from datetime import datetime
 from flask import current_app
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import contains_eager
 import csv
 from io import StringIO
 import json
@@ -210,53 +228,19 @@ def reset_password(token):
 @login_required
 def dashboard():
     """Displays the user dashboard."""
-    # Get team counts for overview
-    team_counts = db.session.query(Player.team, db.func.count(Player.id)).group_by(Player.team).all()
-    
-    # Get latest game results for each team (last 3 games per team)
-    latest_games = {}
-    for team, _ in team_counts:
-        games = Game.query.filter_by(team_name=team).order_by(Game.game_date.desc()).limit(3).all()
-        latest_games[team] = games
-    
-    # Get latest practice plans (last 5) with team information
-    latest_practice_plans = db.session.query(PracticePlan).join(Team).order_by(PracticePlan.date.desc()).limit(5).all()
-    
-    # Get team statistics for enhanced overview
-    team_stats = {}
-    for team, count in team_counts:
-        # Get recent games for this team
-        recent_games = Game.query.filter_by(team_name=team).order_by(Game.game_date.desc()).limit(5).all()
-        
-        # Calculate win/loss record
-        wins = sum(1 for game in recent_games if game.badgers_score > game.opponent_score)
-        losses = sum(1 for game in recent_games if game.badgers_score < game.opponent_score)
-        ties = sum(1 for game in recent_games if game.badgers_score == game.opponent_score)
-        
-        # Get unpaid players count for this team
-        unpaid_count = Player.query.filter_by(team=team, paid=False).count()
-        
-        # Get next practice plan for this team (future practices)
-        team_obj = Team.query.filter_by(name=team).first()
-        next_practice = None
-        if team_obj:
-            next_practice = PracticePlan.query.filter_by(team_id=team_obj.id).filter(PracticePlan.date >= datetime.now().date()).order_by(PracticePlan.date.asc()).first()
-        
-        team_stats[team] = {
-            'player_count': count,
-            'unpaid_count': unpaid_count,
-            'wins': wins,
-            'losses': losses,
-            'ties': ties,
-            'next_practice': next_practice
-        }
+    # Per-team cards (player counts, latest games, records, next practice)
+    dashboard_data = build_dashboard_data()
+    
+    # Get latest practice plans (last 5) with team information, loaded by the same join
+    latest_practice_plans = db.session.query(PracticePlan).join(Team).options(contains_eager(PracticePlan.team)) \
+        .order_by(PracticePlan.date.desc()).limit(5).all()
     
     return render_template("dashboard.html", 
                          name=current_user.username,
-                         team_counts=team_counts,
-                         latest_games=latest_games,
+                         team_counts=dashboard_data['team_counts'],
+                         latest_games=dashboard_data['latest_games'],
                          latest_practice_plans=latest_practice_plans,
-                         team_stats=team_stats,
+                         team_stats=dashboard_data['team_stats'],
                          current_date=datetime.now().date())
 
 ### Player Management Routes ###
@@ -271,10 +255,11 @@ def roster():
     
     try:
         # Get optional filter parameters
+        filters = get_roster_filters(request.args)
         team_filter = request.args.get('team', None)
         season_filter = request.args.get('season', None)
         payment_filter = request.args.get('paid', None)
-        search = request.args.get('search', '').strip()
+        search = filters['search']
         
         print(f"=== ROSTER FILTER DEBUG ===")
         print(f"Team filter: '{team_filter}' (type: {type(team_filter)})")
@@ -282,66 +267,21 @@ def roster():
         print(f"Payment filter: '{payment_filter}' (type: {type(payment_filter)})")
         print(f"Search: '{search}' (type: {type(search)})")
 
-        # Start with base query
-        query = Player.query
-        print(f"Initial query: {query.count()} players")
-
-        # Apply filters
-        if team_filter and team_filter != '':  # Add check for empty string
-            query = query.filter(Player.team == team_filter)
-            print(f"After team filter '{team_filter}': {query.count()} players")
-        if season_filter and season_filter != '':  # Add season filter
-            query = query.filter(Player.season == season_filter)  # Keep as string
-            print(f"After season filter '{season_filter}': {query.count()} players")
-        # Only apply payment filter when an explicit value is chosen
-        if payment_filter and payment_filter != '' and payment_filter != 'None':
-            query = query.filter(Player.paid_tuition == (payment_filter.lower() == 'true'))
-            print(f"After payment filter '{payment_filter}': {query.count()} players")
-        if search:
-            search_term = f"%{search}%"
-            query = query.filter(
-                db.or_(
-                    # Player name
-                    Player.first_name.ilike(search_term),
-                    Player.last_name.ilike(search_term),
-                    # Parent/guardian names (legacy + new fields)
-                    Player.guardian_first_name.ilike(search_term),
-                    Player.guardian_last_name.ilike(search_term),
-                    Player.dad_first_name.ilike(search_term),
-                    Player.dad_last_name.ilike(search_term),
-                    Player.mom_first_name.ilike(search_term),
-                    Player.mom_last_name.ilike(search_term),
-                    # Contact info
-                    Player.dad_phone.ilike(search_term),
-                    Player.dad_email.ilike(search_term),
-                    Player.mom_phone.ilike(search_term),
-                    Player.mom_email.ilike(search_term),
-                    # Address fields
-                    Player.address.ilike(search_term),
-                    Player.city.ilike(search_term),
-                    Player.state.ilike(search_term),
-                    Player.zip_code.ilike(search_term)
-                )
-            )
-            print(f"After search '{search}': {query.count()} players")
-
-        # Get sorted players
-        players = query.order_by(Player.last_name, Player.first_name).all()
-        print(f"Final result: {len(players)} players")
+        # First page of players; later pages are loaded by /api/roster/page
+        page = get_roster_page(filters)
+        players = page['players']
+        print(f"First page: {len(players)} players (more: {page['has_more']})")
         print("=== END ROSTER FILTER DEBUG ===")
 
-        # Get unique teams for filter dropdown (exclude empty/None values)
-        teams = db.session.query(Player.team).distinct().filter(Player.team != '').filter(Player.team != None).all()
-        teams = [team[0] for team in teams]
-
-        # Get unique seasons for filter dropdown
-        seasons = db.session.query(Player.season).distinct().filter(Player.season != None).order_by(Player.season.desc()).all()
-        seasons = [season[0] for season in seasons]
+        # Per-team, per-season and payment counts for the filter dropdowns
+        facets = get_roster_facets(filters)
 
         return render_template("roster_mobile_friendly.html", 
                              players=players,
-                             teams=teams,
-                             seasons=seasons,
+                             next_cursor=page['next_cursor'],
+                             facets=facets,
+                             teams=[team for team, _ in facets['teams']],
+                             seasons=[season for season, _ in facets['seasons']],
                              current_team=team_filter,
                              current_season=season_filter,
                              current_paid=payment_filter,
@@ -354,146 +294,39 @@ def roster():
         traceback.print_exc()
         return str(e), 500
 
+@main.route("/api/roster/page")
+@login_required
+def roster_page():
+    """Return the next page of roster players as rendered HTML (AJAX endpoint)."""
+    try:
+        filters = get_roster_filters(request.args)
+        page = get_roster_page(filters, cursor=request.args.get('cursor'))
+        return jsonify({
+            'success': True,
+            'cards_html': render_template("partials/roster_player_cards.html", players=page['players']),
+            'rows_html': render_template("partials/roster_player_rows.html", players=page['players']),
+            'next_cursor': page['next_cursor'],
+            'has_more': page['has_more']
+        })
+    except Exception as e:
+        return jsonify({'success': False, 'error': str(e)}), 500
+
 @main.route("/roster/export")
 @login_required
 def export_roster():
-    """Export roster to CSV."""
+    """Export roster to CSV, streamed in chunks (optionally gzip-compressed)."""
     try:
-        # Get the same filter parameters as the roster view
-        team_filter = request.args.get('team', None)
-        season_filter = request.args.get('season', None)
-        payment_filter = request.args.get('paid', None)
-        search = request.args.get('search', '').strip()
-
-        # Start with base query
-        query = Player.query
-
-        # Apply same filters as roster view
-        if team_filter and team_filter != '':
-            query = query.filter(Player.team == team_filter)
-        if season_filter and season_filter != '':
-            query = query.filter(Player.season == season_filter)  # Keep as string
-        if payment_filter and payment_filter != '' and payment_filter != 'None':
-            query = query.filter(Player.paid_tuition == (payment_filter.lower() == 'true'))
-        if search:
-            search_term = f"%{search}%"
-            query = query.filter(
-                db.or_(
-                    Player.first_name.ilike(search_term),
-                    Player.last_name.ilike(search_term),
-                    Player.guardian_first_name.ilike(search_term),
-                    Player.guardian_last_name.ilike(search_term),
-                    Player.dad_first_name.ilike(search_term),
-                    Player.dad_last_name.ilike(search_term),
-                    Player.mom_first_name.ilike(search_term),
-                    Player.mom_last_name.ilike(search_term),
-                    Player.dad_phone.ilike(search_term),
-                    Player.dad_email.ilike(search_term),
-                    Player.mom_phone.ilike(search_term),
-                    Player.mom_email.ilike(search_term),
-                    Player.address.ilike(search_term),
-                    Player.city.ilike(search_term),
-                    Player.state.ilike(search_term),
-                    Player.zip_code.ilike(search_term)
-                )
-            )
+        # Apply the same filters as the roster view
+        filters = get_roster_filters(request.args)
+        chunks = stream_with_context(iter_roster_csv(filters))
 
-        # Get sorted players
-        players = query.order_by(Player.last_name, Player.first_name).all()
+        if request.args.get('gzip', '').lower() in ['1', 'true', 'yes']:
+            output = Response(gzip_chunks(chunks), mimetype="application/gzip")
+            output.headers["Content-Disposition"] = "attachment; filename=roster_export.csv.gz"
+            return output
 
-        # Create CSV string
-        si = StringIO()
-        writer = csv.writer(si)
-        
-        # Write comprehensive headers with all available information
-        writer.writerow([
-            # Basic Player Information
-            'Season', 'First Name', 'Last Name', 'Birth Year', 'Team', 'Position',
-            
-            # Jersey and Equipment
-            'Jersey Number', 'Jersey Size', 'Socks Size', 'Jacket Size', 'USA Hockey Number',
-            
-            # Father/Dad Information
-            'Dad First Name', 'Dad Last Name', 'Dad Phone', 'Dad Email',
-            
-            # Mother/Mom Information
-            'Mom First Name', 'Mom Last Name', 'Mom Phone', 'Mom Email',
-            
-            # Address Information
-            'Address', 'City', 'State', 'Zip Code',
-            
-            # Financial Information
-            'Paid Tuition', 'Total Tuition Amount', 'Amount Paid',
-            
-            # Documentation and Legal
-            'Signed Waiver', 'Birth Certificate',
-            
-            # Legacy Fields (for backward compatibility)
-            'Date of Birth', 'Guardian First Name', 'Guardian Last Name', 'Paid Status',
-            
-            # System Information
-            'Created Date', 'Last Updated'
-        ])
-        
-        # Write comprehensive player data
-        for player in players:
-            writer.writerow([
-                # Basic Player Information
-                player.season or '',
-                player.first_name or '',
-                player.last_name or '',
-                player.birth_year or '',
-                player.team or '',
-                player.position or '',
-                
-                # Jersey and Equipment
-                player.jersey_number or '',
-                player.jersey_size or '',
-                player.socks or '',
-                player.jacket or '',
-                player.usa_hockey_number or '',
-                
-                # Father/Dad Information
-                player.dad_first_name or '',
-                player.dad_last_name or '',
-                player.dad_phone or '',
-                player.dad_email or '',
-                
-                # Mother/Mom Information
-                player.mom_first_name or '',
-                player.mom_last_name or '',
-                player.mom_phone or '',
-                player.mom_email or '',
-                
-                # Address Information
-                player.address or '',
-                player.city or '',
-                player.state or '',
-                player.zip_code or '',
-                
-                # Financial Information
-                'Yes' if player.paid_tuition else 'No',
-                f"${player.total_tuition_amount:.2f}" if player.total_tuition_amount else '',
-                f"${player.amount_paid:.2f}" if player.amount_paid else '',
-                
-                # Documentation and Legal
-                'Yes' if player.signed_waiver else 'No',
-                'Yes' if player.birth_certificate else 'No',
-                
-                # Legacy Fields
-                player.date_of_birth.strftime('%m/%d/%Y') if player.date_of_birth else '',
-                player.guardian_first_name or '',
-                player.guardian_last_name or '',
-                'Yes' if player.paid else 'No',
-                
-                # System Information
-                player.created_at.strftime('%m/%d/%Y %H:%M') if player.created_at else '',
-                player.updated_at.strftime('%m/%d/%Y %H:%M') if player.updated_at else ''
-            ])
-
-        output = make_response(si.getvalue())
+        output = Response(chunks, mimetype="text/csv")
         output.headers["Content-Disposition"] = "attachment; filename=roster_export.csv"
-        output.headers["Content-type"] = "text/csv"
         return output
 
     except Exception as e:
@@ -501,6 +334,53 @@ def export_roster():
         flash('Error exporting roster. Please try again.', 'danger')
         return redirect(url_for('main.roster'))
 
+def export_job_payload(job):
+    """Serialize an export job for the status endpoints."""
+    return {
+        'success': True,
+        'job_id': job.id,
+        'status': job.status,
+        'row_count': job.row_count,
+        'error': job.error,
+        'status_url': url_for('main.export_job_status', job_id=job.id),
+        'download_url': url_for('main.download_export_job', job_id=job.id) if job.status == 'completed' else None
+    }
+
+@main.route("/roster/export/jobs", methods=["POST"])
+@login_required
+def create_export_job():
+    """Queue a background roster export (or reuse a cached one) for the current filters."""
+    try:
+        filters = get_roster_filters(request.form or request.args)
+        job = enqueue_roster_export(filters, current_user.id)
+        return jsonify(export_job_payload(job))
+    except Exception as e:
+        db.session.rollback()
+        print(f"Error queuing export job: {str(e)}")
+        return jsonify({'success': False, 'error': str(e)}), 500
+
+@main.route("/roster/export/jobs/<int:job_id>")
+@login_required
+def export_job_status(job_id):
+    """Report the status of a background roster export ("stale" means POST the export again)."""
+    job = ExportJob.query.get_or_404(job_id)
+    return jsonify(export_job_payload(job))
+
+@main.route("/roster/export/jobs/<int:job_id>/download")
+@login_required
+def download_export_job(job_id):
+    """Download the finished file of a background roster export."""
+    job = ExportJob.query.get_or_404(job_id)
+    if job.status != 'completed' or not job.file_path or not os.path.exists(job.file_path):
+        flash('This export is no longer available. Please export again.', 'warning')
+        return redirect(url_for('main.roster'))
+    return send_file(
+        job.file_path,
+        as_attachment=True,
+        download_name="roster_export.csv",
+        mimetype="text/csv"
+    )
+
 @main.route("/player/add", methods=["GET", "POST"])
 @login_required
 def add_player():
@@ -578,6 +458,12 @@ def add_player():
             flash('Player added successfully!', 'success')
             return redirect(url_for('main.roster'))
             
+        except IntegrityError:
+            # Player.natural_key is unique: one player per season, name and birth year
+            db.session.rollback()
+            # The form page shows field errors, not flashed messages
+            form.last_name.errors.append(f'{form.first_name.data} {form.last_name.data} is already on the '
+                                         f'{form.season.data} roster with the same birth year.')
         except Exception as e:
             db.session.rollback()
             flash('Error adding player. Please try again.', 'danger')
@@ -593,6 +479,8 @@ def edit_player(id):
     """Edit an existing player."""
     player = Player.query.get_or_404(id)
     form = PlayerForm(obj=player)
+    if request.method == "GET":
+        form.additional_teams.data = player.extra_teams_list
     
     if form.validate_on_submit():
         print(f"Form validated successfully for player {player.id}")
@@ -606,12 +494,8 @@ def edit_player(id):
             player.team = form.team.data
             player.position = form.position.data
             
-            # Additional teams stored as JSON string (non-breaking enhancement)
-            try:
-                import json as _json
-                player.extra_teams = _json.dumps(form.additional_teams.data or [])
-            except Exception:
-                player.extra_teams = None
+            # Additional teams are rows in player_team
+            player.set_extra_teams(form.additional_teams.data)
             
             # Jersey and Equipment
             player.jersey_number = form.jersey_number.data
@@ -673,6 +557,11 @@ def edit_player(id):
             flash('Player updated successfully!', 'success')
             return redirect(url_for('main.view_player', id=player.id))
             
+        except IntegrityError:
+            db.session.rollback()
+            form.last_name.errors.append(f'Another {form.first_name.data} {form.last_name.data} is already on the '
+                                         f'{form.season.data} roster with the same birth year.')
+            return render_template("player_form.html", form=form, title="Edit Player", player=player)
         except Exception as e:
             db.session.rollback()
             flash(f'Error updating player: {str(e)}. Please try again.', 'danger')
@@ -731,7 +620,8 @@ def api_delete_player(id):
 def view_player(id):
     """View a single player's details."""
     player = Player.query.get_or_404(id)
-    return render_template("player_detail.html", player=player)
+    team_stats = get_player_team_stats(player.id)
+    return render_template("player_detail.html", player=player, team_stats=team_stats)
 
 @main.route("/player/<int:player_id>/document/<int:document_id>/download")
 @login_required
@@ -1504,103 +1394,26 @@ def bulk_import():
     try:
         file = form.csv_file.data
         
-        # Read CSV content
-        stream = StringIO(file.stream.read().decode("UTF8"), newline=None)
-        csv_reader = csv.DictReader(stream)
-        
-        imported_count = 0
-        error_count = 0
-        errors = []
+        # Decode, validate and insert the upload in committed chunks
+        def report_progress(stats):
+            print(f"Bulk import: chunk {stats['chunks']} done, {stats['imported']} players imported "
+                  f"({stats['rows']} rows read, {stats['elapsed']:.2f}s)")
         
-        for row_num, row in enumerate(csv_reader, start=2):  # Start from row 2 (accounting for header)
-            try:
-                # Validate required fields
-                if not row.get('first_name') or not row.get('last_name'):
-                    errors.append(f"Row {row_num}: First name and last name are required")
-                    error_count += 1
-                    continue
-                
-                # Parse financial data
-                total_tuition = 0.0
-                amount_paid = 0.0
-                try:
-                    if row.get('total_tuition_amount'):
-                        total_tuition = float(row['total_tuition_amount'])
-                    if row.get('amount_paid'):
-                        amount_paid = float(row['amount_paid'])
-                except ValueError:
-                    errors.append(f"Row {row_num}: Invalid financial amount")
-                    error_count += 1
-                    continue
-                
-                # Create comprehensive player record
-                player = Player(
-                    # Basic Information
-                    season=row.get('season', str(datetime.now().year)).strip(),
-                    first_name=row['first_name'].strip(),
-                    last_name=row['last_name'].strip(),
-                    birth_year=row.get('birth_year', '').strip(),
-                    team=row.get('team', '').strip(),
-                    position=row.get('position', '').strip(),
-                    
-                    # Jersey and Equipment
-                    jersey_number=row.get('jersey_number', '').strip(),
-                    jersey_size=row.get('jersey_size', '').strip(),
-                    socks=row.get('socks', '').strip(),
-                    jacket=row.get('jacket', '').strip(),
-                    usa_hockey_number=row.get('usa_hockey_number', '').strip(),
-                    
-                    # Father Information
-                    dad_first_name=row.get('dad_first_name', '').strip(),
-                    dad_last_name=row.get('dad_last_name', '').strip(),
-                    dad_phone=row.get('dad_phone', '').strip(),
-                    dad_email=row.get('dad_email', '').strip(),
-                    
-                    # Mother Information
-                    mom_first_name=row.get('mom_first_name', '').strip(),
-                    mom_last_name=row.get('mom_last_name', '').strip(),
-                    mom_phone=row.get('mom_phone', '').strip(),
-                    mom_email=row.get('mom_email', '').strip(),
-                    
-                    # Address Information
-                    address=row.get('address', '').strip(),
-                    city=row.get('city', '').strip(),
-                    state=row.get('state', '').strip(),
-                    zip_code=row.get('zip_code', '').strip(),
-                    
-                    # Financial Information
-                    paid_tuition=row.get('paid_tuition', '').lower() in ['true', 'yes', '1'],
-                    total_tuition_amount=total_tuition,
-                    amount_paid=amount_paid,
-                    
-                    # Documentation and Legal
-                    signed_waiver=row.get('signed_waiver', '').lower() in ['true', 'yes', '1'],
-                    birth_certificate=row.get('birth_certificate', '').lower() in ['true', 'yes', '1'],
-                    
-                    # Legacy fields for backward compatibility
-                    guardian_first_name=row.get('dad_first_name', '').strip(),
-                    guardian_last_name=row.get('dad_last_name', '').strip(),
-                    paid=row.get('paid_tuition', '').lower() in ['true', 'yes', '1']
-                )
-                
-                db.session.add(player)
-                imported_count += 1
-                
-            except Exception as e:
-                errors.append(f"Row {row_num}: {str(e)}")
-                error_count += 1
+        result = import_players(file.stream, upsert=form.upsert.data, progress=report_progress)
+        imported_count = result['imported']
+        error_count = result['error_count']
+        errors = result['errors']
         
-        # Commit all changes
-        if imported_count > 0:
-            db.session.commit()
-            flash(f'Successfully imported {imported_count} players!', 'success')
+        if imported_count > 0 or result['unchanged'] > 0:
+            flash(f"Import complete: {result['inserted']} added, {result['updated']} updated, "
+                  f"{result['unchanged']} unchanged.", 'success')
         
         if error_count > 0:
             flash(f'{error_count} rows had errors. Check the details below.', 'warning')
             for error in errors[:10]:  # Show first 10 errors
                 flash(error, 'danger')
         
-        if imported_count == 0 and error_count == 0:
+        if result['rows'] == 0:
             flash('No data found in the CSV file.', 'warning')
             
     except Exception as e:
@@ -1610,6 +1423,110 @@ def bulk_import():
     return redirect(url_for('main.roster'))
 
 
+@main.route("/bulk-import/validate", methods=["POST"])
+@login_required
+def bulk_import_validate():
+    """Validate a player CSV without importing it and show a preview."""
+    from app.forms import BulkImportForm
+    
+    form = BulkImportForm()
+    if not form.validate_on_submit():
+        flash('Invalid form submission. Please try again.', 'danger')
+        return redirect(url_for('main.roster'))
+    
+    try:
+        file = form.csv_file.data
+        validation = validate_player_import(file.stream)
+        if validation['total'] == 0:
+            flash('No data found in the CSV file.', 'warning')
+            return redirect(url_for('main.roster'))
+        
+        token = save_import_batch(validation, current_user.id, secure_filename(file.filename or 'players.csv'))
+        print(f"Bulk import check: {validation['valid']} valid rows, {validation['error_count']} errors (batch {token})")
+    except Exception as e:
+        flash(f'Error processing CSV file: {str(e)}', 'danger')
+        return redirect(url_for('main.roster'))
+    
+    return redirect(url_for('main.bulk_import_preview', token=token, upsert=1 if form.upsert.data else 0))
+
+
+def get_user_import_batch(token):
+    """Load a saved import batch for the current user, flashing a message when it is gone."""
+    batch = load_import_batch(token, current_user.id)
+    if batch is None:
+        flash('This import has expired. Please upload the file again.', 'warning')
+    return batch
+
+
+@main.route("/bulk-import/<token>")
+@login_required
+def bulk_import_preview(token):
+    """Show the result of a dry-run import and let the user confirm it."""
+    from app.forms import ConfirmImportForm
+    
+    batch = get_user_import_batch(token)
+    if batch is None:
+        return redirect(url_for('main.roster'))
+    
+    form = ConfirmImportForm()
+    form.upsert.data = request.args.get('upsert', '1') == '1'
+    return render_template('bulk_import_preview.html',
+                         batch=batch,
+                         token=token,
+                         form=form,
+                         errors=batch['errors'][:50])
+
+
+@main.route("/bulk-import/<token>/errors.csv")
+@login_required
+def download_import_errors(token):
+    """Download the per-row error report of a dry-run import."""
+    batch = get_user_import_batch(token)
+    if batch is None:
+        return redirect(url_for('main.roster'))
+    
+    si = StringIO()
+    write_import_errors_csv(batch, si)
+    base_name = os.path.splitext(batch.get('filename') or 'players')[0]
+    response = make_response(si.getvalue())
+    response.headers['Content-Disposition'] = f'attachment; filename={base_name}_errors.csv'
+    response.headers['Content-type'] = 'text/csv'
+    return response
+
+
+@main.route("/bulk-import/<token>/confirm", methods=["POST"])
+@login_required
+def confirm_bulk_import(token):
+    """Import the validated rows of a dry-run batch."""
+    from app.forms import ConfirmImportForm
+    
+    form = ConfirmImportForm()
+    if not form.validate_on_submit():
+        flash('Invalid form submission. Please try again.', 'danger')
+        return redirect(url_for('main.bulk_import_preview', token=token))
+    
+    batch = get_user_import_batch(token)
+    if batch is None:
+        return redirect(url_for('main.roster'))
+    
+    try:
+        def report_progress(stats):
+            print(f"Bulk import: chunk {stats['chunks']} done, {stats['imported']} players imported "
+                  f"({stats['elapsed']:.2f}s)")
+        
+        result = import_player_batch(batch, upsert=form.upsert.data, progress=report_progress)
+        discard_import_batch(token)
+        flash(f"Import complete: {result['inserted']} added, {result['updated']} updated, "
+              f"{result['unchanged']} unchanged.", 'success')
+        if result['error_count'] > 0:
+            flash(f"{result['error_count']} rows with errors were skipped.", 'warning')
+    except Exception as e:
+        db.session.rollback()
+        flash(f'Error importing players: {str(e)}', 'danger')
+    
+    return redirect(url_for('main.roster'))
+
+
 @main.route("/download-template")
 @login_required
 def download_template():
@@ -1669,37 +1586,37 @@ def bulk_action():
         validate_csrf(request.form.get('csrf_token'))
         
         action = request.form.get('action')
-        player_ids = request.form.getlist('player_ids')
         
-        if not player_ids:
-            flash('No players selected.', 'warning')
-            return redirect(url_for('main.roster'))
-        
-        player_ids = [int(id) for id in player_ids]
-        players = Player.query.filter(Player.id.in_(player_ids)).all()
+        if request.form.get('scope') == 'filter':
+            # Act on every player matching the roster filters with one statement
+            filters = get_roster_filters(request.form)
+            redirect_url = url_for('main.roster', **{key: value for key, value in filters.items() if value})
+            expected_count = request.form.get('expected_count', type=int)
+            if expected_count is None or expected_count != count_roster_players(filters):
+                flash('The players matching these filters have changed. Please review and try again.', 'warning')
+                return redirect(redirect_url)
+            player_ids = roster_player_ids(filters)
+        else:
+            redirect_url = url_for('main.roster')
+            player_ids = request.form.getlist('player_ids')
+            if not player_ids:
+                flash('No players selected.', 'warning')
+                return redirect(redirect_url)
+            player_ids = [int(id) for id in player_ids]
         
         if action == 'mark_paid':
-            for player in players:
-                player.paid_tuition = True
-                player.paid = True  # Update legacy field too for compatibility
-                player.updated_at = datetime.utcnow()
-            db.session.commit()
-            flash(f'Marked {len(players)} players as paid.', 'success')
+            count = bulk_set_paid(player_ids, True)
+            flash(f'Marked {count} players as paid.', 'success')
             
         elif action == 'mark_unpaid':
-            for player in players:
-                player.paid_tuition = False
-                player.paid = False  # Update legacy field too for compatibility
-                player.updated_at = datetime.utcnow()
-            db.session.commit()
-            flash(f'Marked {len(players)} players as unpaid.', 'success')
+            count = bulk_set_paid(player_ids, False)
+            flash(f'Marked {count} players as unpaid.', 'success')
             
         elif action == 'delete':
-            count = len(players)
-            for player in players:
-                db.session.delete(player)
-            db.session.commit()
+            count, kept = bulk_delete_players(player_ids)
             flash(f'Deleted {count} players.', 'success')
+            if kept:
+                flash(f'Kept {len(kept)} players with goals or assists on a scoresheet: {", ".join(kept)}.', 'warning')
             
         else:
             flash('Invalid action.', 'danger')
@@ -1710,8 +1627,25 @@ def bulk_action():
             flash('CSRF token validation failed. Please try again.', 'danger')
         else:
             flash(f'Error performing bulk action: {str(e)}', 'danger')
+        redirect_url = url_for('main.roster')
     
-    return redirect(url_for('main.roster'))
+    return redirect(redirect_url)
+
+
+@main.route("/api/roster/bulk-preview")
+@login_required
+def roster_bulk_preview():
+    """Return how many players a filter-wide bulk action would affect."""
+    try:
+        filters = get_roster_filters(request.args)
+        return jsonify({
+            'success': True,
+            'count': count_roster_players(filters),
+            'filters': filters
+        })
+    except Exception as e:
+        print(f"Error previewing bulk action: {str(e)}")
+        return jsonify({'success': False, 'error': str(e)}), 500
 
 
 # Contacts bulk import
@@ -1725,42 +1659,16 @@ def bulk_import_contacts():
             flash('No file uploaded.', 'danger')
             return redirect(url_for('main.contacts'))
 
-        stream = StringIO(file.stream.read().decode("UTF8"), newline=None)
-        csv_reader = csv.DictReader(stream)
-
-        imported_count = 0
-        error_count = 0
-        errors = []
-
-        for row_num, row in enumerate(csv_reader, start=2):
-            try:
-                team_name = (row.get('team_name') or '').strip()
-                age_group = (row.get('age_group') or '').strip()
-                if not team_name or not age_group:
-                    raise ValueError('team_name and age_group are required')
-
-                contact = Contact(
-                    team_name=team_name,
-                    age_group=age_group,
-                    division=(row.get('division') or '').strip() or None,
-                    color=(row.get('color') or '').strip() or None,
-                    coach_full_name=(row.get('coach_full_name') or '').strip() or None,
-                    coach_email=(row.get('coach_email') or '').strip() or None,
-                    manager_full_name=(row.get('manager_full_name') or '').strip() or None,
-                    manager_email=(row.get('manager_email') or '').strip() or None,
-                    notes=(row.get('notes') or '').strip() or None,
-                    user_id=current_user.id
-                )
-
-                db.session.add(contact)
-                imported_count += 1
-            except Exception as e:
-                errors.append(f"Row {row_num}: {str(e)}")
-                error_count += 1
+        # Decode, validate and upsert the upload in committed chunks
+        result = import_contacts(file.stream, current_user.id)
+        imported_count = result['inserted'] + result['updated']
+        error_count = result['error_count']
+        errors = result['errors']
+        print(f"Contacts import: {result['rows']} rows in {result['chunks']} chunks ({result['elapsed']:.2f}s)")
 
         if imported_count > 0:
-            db.session.commit()
-            flash(f'Successfully imported {imported_count} contacts!', 'success')
+            flash(f"Successfully imported {imported_count} contacts ({result['inserted']} new, "
+                  f"{result['updated']} updated, {result['people']} additional people)!", 'success')
         if error_count > 0:
             flash(f'{error_count} rows had errors. Showing first 10.', 'warning')
             for error in errors[:10]:
@@ -1781,7 +1689,8 @@ def download_contacts_template():
     import csv as _csv
     output = _StringIO()
     writer = _csv.writer(output)
-    writer.writerow(['team_name', 'age_group', 'division', 'color', 'coach_full_name', 'coach_email', 'manager_full_name', 'manager_email', 'notes'])
+    writer.writerow(['team_name', 'age_group', 'division', 'color', 'coach_full_name', 'coach_email', 'manager_full_name', 'manager_email', 'notes',
+                     'person1_role', 'person1_full_name', 'person1_email', 'person2_role', 'person2_full_name', 'person2_email'])
     response = make_response(output.getvalue())
     response.headers['Content-Disposition'] = 'attachment; filename=contacts_template.csv'
     response.headers['Content-Type'] = 'text/csv'
@@ -2145,8 +2054,7 @@ def game_tracker():
     if team_filter:
         query = query.filter(Game.team_name == team_filter)
     if season_filter:
-        # Filter by season if we add season field to Game model
-        pass
+        query = query.filter(Game.season == season_filter)
     if date_from:
         try:
             from_date = datetime.strptime(date_from, '%Y-%m-%d').date()
@@ -2167,8 +2075,8 @@ def game_tracker():
     teams = db.session.query(Game.team_name).distinct().filter(Game.team_name != '').all()
     teams = [team[0] for team in teams]
     
-    # Get unique seasons for filter dropdown (from players)
-    seasons = db.session.query(Player.season).distinct().filter(Player.season != None).order_by(Player.season.desc()).all()
+    # Get unique seasons for filter dropdown (seasons with games)
+    seasons = db.session.query(Game.season).distinct().order_by(Game.season.desc()).all()
     seasons = [season[0] for season in seasons]
     
     # Create filter form
@@ -2193,7 +2101,6 @@ def game_tracker():
 def add_game():
     """Add a new game."""
     from app.forms import GameForm
-    import json
     
     form = GameForm()
     
@@ -2201,95 +2108,53 @@ def add_game():
     teams = db.session.query(Player.team).distinct().filter(Player.team != '').filter(Player.team != None).all()
     form.team_name.choices = [(team[0], f"{team[0]} Badgers") for team in teams]
     
+    existing_goals = existing_assists = None
     if form.validate_on_submit():
-        try:
-            game = Game(
-                game_date=form.game_date.data,
-                opponent_team=form.opponent_team.data,
-                rink_name=form.rink_name.data,
-                rink_location=form.rink_location.data,
-                team_name=form.team_name.data,
-                badgers_score=form.badgers_score.data,
-                opponent_score=form.opponent_score.data,
-                game_status=form.game_status.data,
-                notes=form.notes.data,
-                user_id=current_user.id
-            )
-            
-            db.session.add(game)
-            db.session.flush()  # Get the game ID without committing
-            
-            # Process goals from form data
-            goal_index = 0
-            while f'goal_{goal_index}' in request.form:
-                goal_data = request.form.get(f'goal_{goal_index}')
-                try:
-                    goal_info = json.loads(goal_data)
-                    
-                    # Create the goal
-                    goal = Goal(
-                        scorer_id=goal_info['scorer_id'],
-                        game_id=game.id,
-                        period=1,  # Default to 1st period
-                        time_scored='',  # No time tracking
-                        goal_type='even_strength'  # Default goal type
-                    )
-                    db.session.add(goal)
-                    goal_index += 1
-                except (json.JSONDecodeError, KeyError) as e:
-                    print(f"Error processing goal {goal_index}: {e}")
-                    goal_index += 1
-                    continue
-            
-            # Process assists from form data
-            assist_index = 0
-            while f'assist_{assist_index}' in request.form:
-                assist_data = request.form.get(f'assist_{assist_index}')
-                try:
-                    assist_info = json.loads(assist_data)
-                    
-                    # Create the assist (we'll need to link it to a goal)
-                    # For simplicity, we'll create a dummy goal if none exists
-                    if not Goal.query.filter_by(game_id=game.id).first():
-                        dummy_goal = Goal(
-                            scorer_id=assist_info['assister_id'],  # Use assister as scorer for dummy
-                            game_id=game.id,
-                            period=1,
-                            time_scored='',
-                            goal_type='even_strength'
-                        )
-                        db.session.add(dummy_goal)
-                        db.session.flush()
-                        goal_id = dummy_goal.id
-                    else:
-                        # Use the first goal for all assists
-                        goal_id = Goal.query.filter_by(game_id=game.id).first().id
-                    
-                    assist = Assist(
-                        assister_id=assist_info['assister_id'],
-                        game_id=game.id,
-                        goal_id=goal_id,
-                        period=1,  # Default to 1st period
-                        time_assisted='',  # No time tracking
-                        assist_type='primary'  # Default to primary
-                    )
-                    db.session.add(assist)
-                    assist_index += 1
-                except (json.JSONDecodeError, KeyError) as e:
-                    print(f"Error processing assist {assist_index}: {e}")
-                    assist_index += 1
-                    continue
-            
-            db.session.commit()
-            flash('Game added successfully!', 'success')
-            return redirect(url_for('main.view_game', game_id=game.id))
-            
-        except Exception as e:
-            db.session.rollback()
-            flash('Error adding game. Please try again.', 'danger')
-            print(f"Error adding game: {str(e)}")
+        # A form resent after its response was lost must not add the game twice
+        client_key = parse_client_key(request.form.get('client_key'))
+        saved_game = Game.query.filter_by(client_key=client_key).first() if client_key else None
+        if saved_game is not None:
+            flash('This game was already saved.', 'info')
+            return redirect(url_for('main.view_game', game_id=saved_game.id))
+        
+        scoresheet, errors = validate_scoresheet(request.form.get('scoresheet'), form.team_name.data)
+        if errors:
+            for error in errors:
+                flash(error, 'danger')
+            existing_goals, existing_assists = scoresheet_form_data(scoresheet)
+        else:
+            try:
+                game = Game(
+                    game_date=form.game_date.data,
+                    opponent_team=form.opponent_team.data,
+                    rink_name=form.rink_name.data,
+                    rink_location=form.rink_location.data,
+                    team_name=form.team_name.data,
+                    badgers_score=form.badgers_score.data,
+                    opponent_score=form.opponent_score.data,
+                    game_status=form.game_status.data,
+                    notes=form.notes.data,
+                    client_key=client_key,
+                    user_id=current_user.id
+                )
+                
+                db.session.add(game)
+                db.session.flush()  # Get the game ID without committing
+                
+                # Goals and their assists in one INSERT each
+                write_scoresheet(game, scoresheet)
+                
+                db.session.commit()
+                flash('Game added successfully!', 'success')
+                return redirect(url_for('main.view_game', game_id=game.id))
+                
+            except Exception as e:
+                db.session.rollback()
+                flash('Error adding game. Please try again.', 'danger')
+                print(f"Error adding game: {str(e)}")
     
-    return render_template("game_form.html", form=form, title="Add Game")
+    return render_template("game_form.html", form=form, title="Add Game",
+                         existing_goals=existing_goals, existing_assists=existing_assists)
 
 
 @main.route("/api/team-players/<team_name>")
@@ -2297,12 +2162,8 @@ def add_game():
 def get_team_players(team_name):
     """Get players for a specific team (AJAX endpoint)."""
     try:
-        players = Player.query.filter(
-            db.or_(
-                Player.team == team_name,
-                Player.extra_teams.ilike(f'%"{team_name}"%')
-            )
-        ).order_by(Player.last_name, Player.first_name).all()
+        players = Player.query.filter(team_member_filter(team_name)) \
+            .order_by(Player.last_name, Player.first_name).all()
         player_data = []
         for player in players:
             player_data.append({
@@ -2325,12 +2186,8 @@ def view_game(game_id):
     goals = Goal.query.filter_by(game_id=game_id).order_by(Goal.period, Goal.time_scored).all()
     
     # Get all players for the team for adding goals/assists (include additional teams)
-    team_players = Player.query.filter(
-        db.or_(
-            Player.team == game.team_name,
-            Player.extra_teams.ilike(f'%"{game.team_name}"%')
-        )
-    ).order_by(Player.last_name, Player.first_name).all()
+    team_players = Player.query.filter(team_member_filter(game.team_name)) \
+        .order_by(Player.last_name, Player.first_name).all()
     
     return render_template("game_detail.html", 
                          game=game, 
@@ -2338,6 +2195,38 @@ def view_game(game_id):
                          team_players=team_players)
 
 
+@main.route("/game-tracker/<int:game_id>/stream")
+@login_required
+def game_stream(game_id):
+    """Push live score, goal and assist events of a game (Server-Sent Events)."""
+    game = Game.query.get_or_404(game_id)
+    
+    # Subscribe before taking the snapshot so no event falls between the two
+    subscriber = subscribe(game_id, current_app.config['LIVE_STREAM_LIMIT'])
+    if subscriber is None:
+        # Every stream thread is taken: the page polls game_live instead
+        return jsonify({'success': False, 'error': 'Too many live viewers, polling instead'}), 503
+    try:
+        snapshot = game_snapshot(game)
+    except Exception:
+        unsubscribe(subscriber)
+        raise
+    
+    response = Response(iter_game_stream(subscriber, snapshot), mimetype="text/event-stream")
+    response.headers["Cache-Control"] = "no-cache"
+    response.headers["X-Accel-Buffering"] = "no"  # Keep proxies from buffering the stream
+    response.call_on_close(lambda: unsubscribe(subscriber))
+    return response
+
+
+@main.route("/game-tracker/<int:game_id>/live")
+@login_required
+def game_live(game_id):
+    """Current score and goal/assist IDs of a game, for viewers without a stream."""
+    game = Game.query.get_or_404(game_id)
+    return jsonify(game_snapshot(game))
+
+
 @main.route("/game-tracker/<int:game_id>/edit", methods=["GET", "POST"])
 @login_required
 def edit_game(game_id):
@@ -2352,6 +2241,13 @@ def edit_game(game_id):
     form.team_name.choices = [(team[0], f"{team[0]} Badgers") for team in teams]
     
     if form.validate_on_submit():
+        scoresheet, errors = validate_scoresheet(request.form.get('scoresheet'), form.team_name.data, game)
+        if errors:
+            for error in errors:
+                flash(error, 'danger')
+            existing_goals, existing_assists = scoresheet_form_data(scoresheet)
+            return render_template("game_form.html", form=form, game=game, title="Edit Game",
+                                 existing_goals=existing_goals, existing_assists=existing_assists)
         try:
             game.game_date = form.game_date.data
             game.opponent_team = form.opponent_team.data
@@ -2362,74 +2258,14 @@ def edit_game(game_id):
             game.opponent_score = form.opponent_score.data
             game.game_status = form.game_status.data
             game.notes = form.notes.data
+            db.session.flush()
             
-            # Delete existing assists first (due to foreign key constraints)
-            Assist.query.filter_by(game_id=game.id).delete()
-            # Then delete goals
-            Goal.query.filter_by(game_id=game.id).delete()
-            
-            # Process new goals from form data
-            goal_index = 0
-            while f'goal_{goal_index}' in request.form:
-                goal_data = request.form.get(f'goal_{goal_index}')
-                try:
-                    goal_info = json.loads(goal_data)
-                    
-                    # Create the goal
-                    goal = Goal(
-                        scorer_id=goal_info['scorer_id'],
-                        game_id=game.id,
-                        period=1,  # Default to 1st period
-                        time_scored='',  # No time tracking
-                        goal_type='even_strength'  # Default goal type
-                    )
-                    db.session.add(goal)
-                    goal_index += 1
-                except (json.JSONDecodeError, KeyError) as e:
-                    print(f"Error processing goal {goal_index}: {e}")
-                    goal_index += 1
-                    continue
-            
-            # Process new assists from form data
-            assist_index = 0
-            while f'assist_{assist_index}' in request.form:
-                assist_data = request.form.get(f'assist_{assist_index}')
-                try:
-                    assist_info = json.loads(assist_data)
-                    
-                    # Create the assist (we'll need to link it to a goal)
-                    # For simplicity, we'll create a dummy goal if none exists
-                    if not Goal.query.filter_by(game_id=game.id).first():
-                        dummy_goal = Goal(
-                            scorer_id=assist_info['assister_id'],  # Use assister as scorer for dummy
-                            game_id=game.id,
-                            period=1,
-                            time_scored='',
-                            goal_type='even_strength'
-                        )
-                        db.session.add(dummy_goal)
-                        db.session.flush()
-                        goal_id = dummy_goal.id
-                    else:
-                        # Use the first goal for all assists
-                        goal_id = Goal.query.filter_by(game_id=game.id).first().id
-                    
-                    assist = Assist(
-                        assister_id=assist_info['assister_id'],
-                        game_id=game.id,
-                        goal_id=goal_id,
-                        period=1,  # Default to 1st period
-                        time_assisted='',  # No time tracking
-                        assist_type='primary'  # Default to primary
-                    )
-                    db.session.add(assist)
-                    assist_index += 1
-                except (json.JSONDecodeError, KeyError) as e:
-                    print(f"Error processing assist {assist_index}: {e}")
-                    assist_index += 1
-                    continue
+            # Apply only the goal and assist rows that changed
+            apply_scoresheet_changes(game, scoresheet)
             
             db.session.commit()
+            # Goals may have been rewritten; live viewers reload the page
+            publish_game_event(game.id, 'resync', {'game_id': game.id})
             flash('Game updated successfully!', 'success')
             return redirect(url_for('main.view_game', game_id=game.id))
             
@@ -2438,33 +2274,8 @@ def edit_game(game_id):
             flash('Error updating game. Please try again.', 'danger')
             print(f"Error updating game: {str(e)}")
     
-    # Get existing goals and assists for the game and convert to dictionaries
-    existing_goals = Goal.query.filter_by(game_id=game.id).all()
-    existing_assists = Assist.query.filter_by(game_id=game.id).all()
-    
-    # Convert to dictionaries for JSON serialization
-    goals_data = []
-    for goal in existing_goals:
-        goals_data.append({
-            'id': goal.id,
-            'scorer_id': goal.scorer_id,
-            'game_id': goal.game_id,
-            'period': goal.period,
-            'time_scored': goal.time_scored,
-            'goal_type': goal.goal_type
-        })
-    
-    assists_data = []
-    for assist in existing_assists:
-        assists_data.append({
-            'id': assist.id,
-            'assister_id': assist.assister_id,
-            'game_id': assist.game_id,
-            'goal_id': assist.goal_id,
-            'period': assist.period,
-            'time_assisted': assist.time_assisted,
-            'assist_type': assist.assist_type
-        })
+    # Existing goals, each with its linked assists, for the form's script
+    goals_data, assists_data = scoresheet_form_data(load_scoresheet(game.id))
     
     return render_template("game_form.html", form=form, game=game, title="Edit Game", 
                          existing_goals=goals_data, existing_assists=assists_data)
@@ -2479,6 +2290,7 @@ def delete_game(game_id):
     try:
         db.session.delete(game)  # Cascade will handle goals and assists
         db.session.commit()
+        publish_game_event(game_id, 'deleted', {'game_id': game_id})
         flash('Game deleted successfully!', 'success')
     except Exception as e:
         db.session.rollback()
@@ -2498,12 +2310,8 @@ def add_goal(game_id):
     form = GoalForm()
     
     # Populate player choices for the team, including those with additional teams
-    team_players = Player.query.filter(
-        db.or_(
-            Player.team == game.team_name,
-            Player.extra_teams.ilike(f'%"{game.team_name}"%')
-        )
-    ).order_by(Player.last_name, Player.first_name).all()
+    team_players = Player.query.filter(team_member_filter(game.team_name)) \
+        .order_by(Player.last_name, Player.first_name).all()
     form.scorer_id.choices = [(player.id, f"{player.first_name} {player.last_name}") for player in team_players]
     
     if form.validate_on_submit():
@@ -2517,7 +2325,12 @@ def add_goal(game_id):
             )
             
             db.session.add(goal)
+            db.session.flush()
+            # Build the live event before commit expires the loaded rows
+            scorer = next((player for player in team_players if player.id == goal.scorer_id), None)
+            event = goal_event(game, goal, scorer)
             db.session.commit()
+            publish_game_event(game_id, 'goal', event)
             flash('Goal added successfully!', 'success')
             
         except Exception as e:
@@ -2554,7 +2367,10 @@ def add_assist(game_id, goal_id):
         )
         
         db.session.add(assist)
+        db.session.flush()
+        event = assist_event(game_id, assist, db.session.get(Player, assist.assister_id))
         db.session.commit()
+        publish_game_event(game_id, 'assist', event)
         flash('Assist added successfully!', 'success')
         
     except Exception as e:
@@ -2565,6 +2381,33 @@ def add_assist(game_id, goal_id):
     return redirect(url_for('main.view_game', game_id=game_id))
 
 
+@main.route("/game-tracker/<int:game_id>/sync", methods=["POST"])
+@login_required
+def sync_game_events(game_id):
+    """Apply a batch of goals and assists recorded offline (AJAX endpoint)."""
+    game = Game.query.get_or_404(game_id)
+    payload = request.get_json(silent=True) or {}
+    
+    try:
+        results, live_events = apply_scoring_events(game, payload.get('events'))
+        db.session.commit()
+    except ValueError as e:
+        db.session.rollback()
+        return jsonify({'success': False, 'error': str(e)}), 400
+    except IntegrityError:
+        # The same keys were synced concurrently; the retry reports them as duplicates
+        db.session.rollback()
+        return jsonify({'success': False, 'error': 'Events are being synced by another request; retry.'}), 409
+    except Exception as e:
+        db.session.rollback()
+        print(f"Error syncing game events: {str(e)}")
+        return jsonify({'success': False, 'error': 'Error syncing events. Please try again.'}), 500
+    
+    for event_name, data in live_events:
+        publish_game_event(game_id, event_name, data)
+    return jsonify({'success': True, 'results': results})
+
+
 @main.route("/game-tracker/statistics")
 @login_required
 def game_statistics():
@@ -2575,77 +2418,15 @@ def game_statistics():
     team_filter = request.args.get('team_filter', '')
     season_filter = request.args.get('season_filter', '')
     
-    # Get players with their statistics
-    query = Player.query
-    
-    if team_filter:
-        # Include players whose primary team matches or who list it in additional teams
-        query = query.filter(
-            db.or_(
-                Player.team == team_filter,
-                Player.extra_teams.ilike(f'%"{team_filter}"%')
-            )
-        )
-    if season_filter:
-        query = query.filter(Player.season == season_filter)
-    
-    players = query.order_by(Player.last_name, Player.first_name).all()
-    
-    # Calculate statistics for each player
-    player_stats = []
-    
-    def get_player_team_names(p: Player):
-        names = set()
-        if p.team:
-            names.add(p.team)
-        try:
-            import json as _json
-            extra = _json.loads(p.extra_teams) if p.extra_teams else []
-            for t in extra:
-                if t:
-                    names.add(t)
-        except Exception:
-            pass
-        return list(names)
-    
-    for player in players:
-        # Determine which teams to count stats for
-        teams_to_count = [team_filter] if team_filter else get_player_team_names(player)
-        if not teams_to_count:
-            teams_to_count = [player.team] if player.team else []
-        
-        # Get goals scored
-        goals_scored = Goal.query.join(Game).filter(
-            Goal.scorer_id == player.id,
-            Game.team_name.in_(teams_to_count)
-        ).count()
-        
-        # Get assists
-        assists = Assist.query.join(Game).filter(
-            Assist.assister_id == player.id,
-            Game.team_name.in_(teams_to_count)
-        ).count()
-        
-        # Get games played
-        games_played = Game.query.filter(Game.team_name.in_(teams_to_count)).count()
-        
-        player_stats.append({
-            'player': player,
-            'goals': goals_scored,
-            'assists': assists,
-            'points': goals_scored + assists,
-            'games_played': games_played
-        })
-    
-    # Sort by points (goals + assists)
-    player_stats.sort(key=lambda x: x['points'], reverse=True)
+    # Goals, assists and games played for every player, sorted by points, in one query
+    player_stats = get_player_leaderboard(team=team_filter or None, season=season_filter or None)
     
     # Get unique teams for filter dropdown
     teams = db.session.query(Player.team).distinct().filter(Player.team != '').filter(Player.team != None).all()
     teams = [team[0] for team in teams]
     
-    # Get unique seasons for filter dropdown
-    seasons = db.session.query(Player.season).distinct().filter(Player.season != None).order_by(Player.season.desc()).all()
+    # Get unique seasons for filter dropdown (seasons with games)
+    seasons = db.session.query(Game.season).distinct().order_by(Game.season.desc()).all()
     seasons = [season[0] for season in seasons]
     
     # Create filter form
@@ -2664,6 +2445,61 @@ def game_statistics():
                          current_season=season_filter)
 
 
+def resolve_game_season(requested, seasons):
+    """Pick the requested season, else the current season, else the newest season with completed games."""
+    if requested:
+        return requested
+    current_season = Game.season_for_date(datetime.now().date())
+    if current_season in seasons or not seasons:
+        return current_season
+    return seasons[0]
+
+
+@main.route("/game-tracker/standings")
+@login_required
+def standings():
+    """Display team standings for a season."""
+    seasons = get_standing_seasons()
+    season = resolve_game_season(request.args.get('season', ''), seasons)
+    if season not in seasons:
+        seasons = [season] + seasons
+    return render_template("standings.html",
+                         standings=get_standings(season),
+                         seasons=seasons,
+                         current_season=season,
+                         home_rinks=current_app.config.get('HOME_RINKS', []))
+
+
+@main.route("/api/standings")
+@login_required
+def standings_api():
+    """Return team standings for a season as JSON."""
+    try:
+        season = resolve_game_season(request.args.get('season', ''), get_standing_seasons())
+        team = request.args.get('team', '')
+        rows = get_standings(season, [team] if team else None)
+        return jsonify({
+            'success': True,
+            'season': season,
+            'home_rinks': get_home_rinks(),
+            'standings': [row.to_dict() for row in rows]
+        })
+    except Exception as e:
+        return jsonify({'success': False, 'error': str(e)}), 500
+
+
+@main.route("/api/statistics/analytics")
+@login_required
+def player_analytics_api():
+    """Return rolling point averages, period splits and goal-type shares for a season as JSON."""
+    try:
+        season = resolve_game_season(request.args.get('season', ''), get_standing_seasons())
+        analytics = get_player_analytics(season, team=request.args.get('team', '') or None)
+        return jsonify({'success': True, **analytics})
+    except Exception as e:
+        return jsonify({'success': False, 'error': str(e)}), 500
+
+
 ### CONTACT MANAGEMENT ROUTES ###
 
 @main.route("/contacts")
@@ -0,0 +1,665 @@
+"""
+Game scoresheet parsing, validation and bulk writes.
+
+The game form posts the whole scoresheet as one JSON field:
+
+    {"goals": [{"scorer_id": 12, "period": 2, "assists": [7, 9]}, ...],
+     "assists": [{"assister_id": 4}, ...]}
+
+Assists listed under a goal are linked to it; top-level assists (added on
+the form without picking a goal) are linked to the first goal. Goals may
+carry the "id" of a stored goal. The scoresheet is validated in one pass
+with a single team-membership query; when a game is edited, scorers and
+assisters it already stores are not checked against the current roster.
+
+New games are written with one INSERT for goals and one for assists. Edits
+are diffed against the stored goals and assists, and only the rows that
+changed are inserted, updated or deleted (one bulk statement of each kind),
+so goal IDs survive edits that leave them alone and saving a game costs the
+same number of statements however many goals it has. Goal fields a goal
+entry leaves out (or sends as null) keep their stored values; new goals get
+GOAL_DEFAULTS.
+
+Rinkside devices queue goals and assists offline and send them in batches
+of events, each carrying a client-generated key stored in Goal.client_key
+or Assist.client_key, so a resent batch never records a goal twice.
+"""
+
+import json
+import re
+from datetime import datetime
+
+from app import db
+from app.models import Player, Goal, Assist
+from app.roster_utils import team_member_filter
+from app.stats_utils import refresh_player_stats
+from app.analytics_utils import invalidate_player_analytics
+from app.live_utils import goal_event, assist_event
+
+GOAL_TYPES = ('even_strength', 'power_play', 'short_handed', 'empty_net')
+MAX_PERIOD = 4  # 1st-3rd period and overtime
+# Goal columns that tell goals of the same game apart
+GOAL_KEY_FIELDS = ('scorer_id', 'period', 'time_scored', 'goal_type')
+# Values of the optional goal fields when a new goal leaves them out
+GOAL_DEFAULTS = {'period': 1, 'time_scored': '', 'goal_type': 'even_strength'}
+# Events accepted per offline sync request
+MAX_SYNC_EVENTS = 200
+# Client-generated idempotency keys (UUIDs or similar)
+CLIENT_KEY_PATTERN = re.compile(r'[A-Za-z0-9_-]{8,64}')
+
+
+def _player_id(value):
+    try:
+        player_id = int(value)
+    except (TypeError, ValueError):
+        return None
+    return player_id if player_id > 0 else None
+
+
+def parse_scoresheet(raw):
+    """
+    Parse and normalize a scoresheet JSON payload.
+
+    Args:
+        raw: JSON text posted by the game form (empty means no goals)
+
+    Returns:
+        tuple: (sheet, errors) where sheet['goals'] is a list of dicts with id
+        (of a stored goal, or None), scorer_id, period, time_scored, goal_type
+        and assister_ids, and sheet['assists'] lists the IDs of assisters not
+        linked to a goal. period, time_scored and goal_type are None when the
+        entry leaves them out.
+    """
+    sheet = {'goals': [], 'assists': []}
+    if not raw:
+        return sheet, []
+    try:
+        payload = json.loads(raw)
+    except ValueError:
+        return sheet, ['Scoresheet is not valid JSON.']
+    if not isinstance(payload, dict):
+        return sheet, ['Scoresheet must be an object with goals and assists.']
+
+    goals = sheet['goals']
+    errors = []
+    for number, entry in enumerate(payload.get('goals') or [], start=1):
+        if not isinstance(entry, dict):
+            errors.append(f"Goal {number}: invalid entry.")
+            continue
+        scorer_id = _player_id(entry.get('scorer_id'))
+        if scorer_id is None:
+            errors.append(f"Goal {number}: missing scorer.")
+            continue
+        period = None
+        if entry.get('period') not in (None, ''):
+            try:
+                period = int(entry['period'])
+            except (TypeError, ValueError):
+                period = 0
+            if not 1 <= period <= MAX_PERIOD:
+                errors.append(f"Goal {number}: invalid period.")
+                continue
+        goal_type = entry.get('goal_type') or None
+        if goal_type is not None and goal_type not in GOAL_TYPES:
+            errors.append(f"Goal {number}: invalid goal type.")
+            continue
+        assister_ids = [_player_id(value) for value in entry.get('assists') or []]
+        if None in assister_ids:
+            errors.append(f"Goal {number}: invalid assist.")
+            continue
+        goals.append({
+            'id': _player_id(entry.get('id')),
+            'scorer_id': scorer_id,
+            'period': period,
+            'time_scored': None if entry.get('time_scored') is None else str(entry['time_scored'])[:10],
+            'goal_type': goal_type,
+            'assister_ids': assister_ids
+        })
+
+    for number, entry in enumerate(payload.get('assists') or [], start=1):
+        assister_id = _player_id(entry.get('assister_id') if isinstance(entry, dict) else entry)
+        if assister_id is None:
+            errors.append(f"Assist {number}: missing player.")
+            continue
+        sheet['assists'].append(assister_id)
+    if sheet['assists'] and not goals:
+        errors.append('Assists need at least one goal to be linked to.')
+    return sheet, errors
+
+
+def _stored_players(game_id):
+    """Return ({goal id: scorer id}, {(goal id, assister id)}) for the goals and assists stored on a game."""
+    scorers = dict(db.session.execute(
+        db.select(Goal.id, Goal.scorer_id).where(Goal.game_id == game_id)
+    ).all())
+    assisters = set(db.session.execute(
+        db.select(Assist.goal_id, Assist.assister_id).where(Assist.game_id == game_id)
+    ).all())
+    return scorers, assisters
+
+
+def validate_scoresheet(raw, team_name, game=None):
+    """
+    Parse a scoresheet and check that every scorer and assister plays for the team.
+
+    Membership (primary or additional team) is checked with one query for the
+    whole scoresheet. When an edited game keeps its team, entries matching its
+    stored goals and assists are not checked again, so a player who has since
+    moved to another team does not make the game impossible to save.
+
+    Args:
+        raw: JSON text posted by the game form
+        team_name: Team that played the game
+        game: Stored Game being edited (None for a new game)
+
+    Returns:
+        tuple: (sheet, errors) as returned by parse_scoresheet()
+    """
+    sheet, errors = parse_scoresheet(raw)
+    scorers, assisters = {}, set()
+    if game is not None and game.team_name == team_name:
+        scorers, assisters = _stored_players(game.id)
+    stored_assister_ids = {assister_id for _, assister_id in assisters}
+
+    # Only new or changed entries are checked
+    player_ids = {goal['scorer_id'] for goal in sheet['goals'] if scorers.get(goal['id']) != goal['scorer_id']}
+    player_ids.update(assister_id for goal in sheet['goals'] for assister_id in goal['assister_ids']
+                      if (goal['id'], assister_id) not in assisters)
+    player_ids.update(assister_id for assister_id in sheet['assists'] if assister_id not in stored_assister_ids)
+    if not player_ids:
+        return sheet, errors
+
+    members = set(db.session.execute(
+        db.select(Player.id).where(Player.id.in_(player_ids), team_member_filter(team_name))
+    ).scalars())
+    outsiders = sorted(player_ids - members)
+    if outsiders:
+        names = db.session.execute(
+            db.select(Player.id, Player.first_name, Player.last_name).where(Player.id.in_(outsiders))
+        ).all()
+        known = {player_id: f"{first_name} {last_name}" for player_id, first_name, last_name in names}
+        for player_id in outsiders:
+            name = known.get(player_id)
+            errors.append(f"{name} is not on the {team_name} roster." if name
+                          else f"Player {player_id} does not exist.")
+    return sheet, errors
+
+
+def _goal_key(goal):
+    return tuple(goal[field] for field in GOAL_KEY_FIELDS)
+
+
+def _complete_goal(goal, stored=None):
+    """Fill the fields a goal entry left out from its stored goal, or GOAL_DEFAULTS for a new goal."""
+    missing = [field for field in GOAL_DEFAULTS if goal[field] is None]
+    if not missing:
+        return goal
+    return dict(goal, **{field: getattr(stored, field) if stored is not None else GOAL_DEFAULTS[field]
+                         for field in missing})
+
+
+def _goal_matches(goal, stored):
+    """True when a stored goal has the scorer and every field the goal entry sent."""
+    return all(goal[field] is None or goal[field] == getattr(stored, field) for field in GOAL_KEY_FIELDS)
+
+
+def _insert_goals(game, goals, now):
+    """Insert goals with one executemany INSERT and return their IDs in the order given."""
+    goal_table = Goal.__table__
+    if not goals:
+        return []
+    created = db.session.execute(
+        goal_table.insert().returning(goal_table.c.id, *[goal_table.c[field] for field in GOAL_KEY_FIELDS]),
+        [dict({field: goal[field] for field in GOAL_KEY_FIELDS}, created_at=now, game_id=game.id)
+         for goal in goals]
+    ).all()
+    # RETURNING order is not guaranteed for batched inserts; goals with the same
+    # scorer, period, time and type are interchangeable, so match ids on those
+    ids_by_key = {}
+    for goal_id, *key in sorted(created):
+        ids_by_key.setdefault(tuple(key), []).append(goal_id)
+    return [ids_by_key[_goal_key(goal)].pop(0) for goal in goals]
+
+
+def _assist_values(goal, position):
+    return {
+        'period': goal['period'],
+        'time_assisted': goal['time_scored'],
+        'assist_type': 'primary' if position == 0 else 'secondary'
+    }
+
+
+def write_scoresheet(game, sheet):
+    """
+    Write the scoresheet of a new game with bulk INSERT statements.
+
+    Core statements skip the mapper hooks, so the team's stat rollups are
+    refreshed here, in the same transaction. The caller commits.
+
+    Args:
+        game: Flushed Game the goals belong to
+        sheet: Scoresheet as returned by validate_scoresheet()
+
+    Returns:
+        tuple: (goal_count, assist_count)
+    """
+    goals = [_complete_goal(goal) for goal in sheet['goals']]
+    now = datetime.utcnow()
+    goal_ids = _insert_goals(game, goals, now)
+
+    assists = []
+    for goal, goal_id in zip(goals, goal_ids):
+        for position, assister_id in enumerate(goal['assister_ids']):
+            assists.append(dict(_assist_values(goal, position), created_at=now, game_id=game.id,
+                                goal_id=goal_id, assister_id=assister_id))
+    if goals:
+        position = len(goals[0]['assister_ids'])
+        for assister_id in sheet['assists']:
+            assists.append(dict(_assist_values(goals[0], position), created_at=now, game_id=game.id,
+                                goal_id=goal_ids[0], assister_id=assister_id))
+            position += 1
+    if assists:
+        db.session.execute(Assist.__table__.insert(), assists)
+
+    refresh_player_stats(team_names=[game.team_name])
+    invalidate_player_analytics([game.season])
+    return len(goals), len(assists)
+
+
+def apply_scoresheet_changes(game, sheet):
+    """
+    Bring a game's stored goals and assists in line with a submitted scoresheet.
+
+    Submitted goals are matched to stored goals by id, then by scorer, period,
+    time and type. Linked assists are matched by assister on their goal and
+    top-level assists by assister on any kept goal. Only unmatched rows are
+    deleted or inserted, each kind with one bulk statement. A matched goal is
+    updated only when a field the entry sent differs from the stored value,
+    and its assists only follow a period or time that actually changed, so
+    an edit that leaves the goals alone writes no goal or assist rows. The
+    caller commits.
+
+    Args:
+        game: Flushed Game being edited
+        sheet: Scoresheet as returned by validate_scoresheet()
+
+    Returns:
+        dict: Counts of goals and assists inserted, updated and deleted
+    """
+    goal_table = Goal.__table__
+    assist_table = Assist.__table__
+    counts = {f'{kind}_{action}': 0 for kind in ('goals', 'assists') for action in ('inserted', 'updated', 'deleted')}
+
+    stored_goals = {row.id: row for row in db.session.execute(
+        db.select(goal_table.c.id, *[goal_table.c[field] for field in GOAL_KEY_FIELDS])
+        .where(goal_table.c.game_id == game.id).order_by(goal_table.c.id)
+    ).all()}
+    stored_assists = db.session.execute(
+        db.select(assist_table.c.id, assist_table.c.goal_id, assist_table.c.assister_id,
+                  assist_table.c.period, assist_table.c.time_assisted, assist_table.c.assist_type)
+        .where(assist_table.c.game_id == game.id).order_by(assist_table.c.id)
+    ).all()
+
+    # Goals: match by id first, then by the sent values among the goals left
+    matched = [None] * len(sheet['goals'])
+    unmatched_ids = set(stored_goals)
+    for index, goal in enumerate(sheet['goals']):
+        if goal['id'] in unmatched_ids:
+            matched[index] = goal['id']
+            unmatched_ids.discard(goal['id'])
+    for index, goal in enumerate(sheet['goals']):
+        if matched[index] is None:
+            matched[index] = next((goal_id for goal_id in sorted(unmatched_ids)
+                                   if _goal_matches(goal, stored_goals[goal_id])), None)
+            unmatched_ids.discard(matched[index])
+    goals = [_complete_goal(goal, stored_goals.get(goal_id)) for goal, goal_id in zip(sheet['goals'], matched)]
+
+    goal_updates = [dict({f'b_{field}': goal[field] for field in GOAL_KEY_FIELDS}, b_id=goal_id)
+                    for goal, goal_id in zip(goals, matched)
+                    if goal_id is not None
+                    and _goal_key(goal) != tuple(getattr(stored_goals[goal_id], field) for field in GOAL_KEY_FIELDS)]
+    now = datetime.utcnow()
+    new_goals = [goal for goal, goal_id in zip(goals, matched) if goal_id is None]
+    new_ids = iter(_insert_goals(game, new_goals, now))
+    goal_ids = [goal_id if goal_id is not None else next(new_ids) for goal_id in matched]
+    if goal_updates:
+        db.session.execute(
+            goal_table.update().where(goal_table.c.id == db.bindparam('b_id'))
+            .values(**{field: db.bindparam(f'b_{field}') for field in GOAL_KEY_FIELDS}),
+            goal_updates
+        )
+    counts['goals_inserted'] = len(new_goals)
+    counts['goals_updated'] = len(goal_updates)
+
+    # Assists: stored assists on kept goals can be reused; the rest are deleted
+    kept_goals = set(goal_ids)
+    free_assists = [assist for assist in stored_assists if assist.goal_id in kept_goals]
+    deleted_assists = [assist.id for assist in stored_assists if assist.goal_id not in kept_goals]
+
+    def take(assister_id, goal_id=None):
+        for position, assist in enumerate(free_assists):
+            if assist.assister_id == assister_id and (goal_id is None or assist.goal_id == goal_id):
+                return free_assists.pop(position)
+        return None
+
+    assist_inserts = []
+    reused_assists = []
+    for goal, goal_id in zip(goals, goal_ids):
+        for position, assister_id in enumerate(goal['assister_ids']):
+            assist = take(assister_id, goal_id)
+            if assist is None:
+                assist_inserts.append(dict(_assist_values(goal, position), created_at=now, game_id=game.id,
+                                           goal_id=goal_id, assister_id=assister_id))
+            else:
+                reused_assists.append(assist)
+    if goals:
+        missing = []
+        position = len(goals[0]['assister_ids'])
+        for assister_id in sheet['assists']:
+            assist = take(assister_id)
+            if assist is None:
+                missing.append(assister_id)
+                continue
+            reused_assists.append(assist)
+            if assist.goal_id == goal_ids[0]:
+                position += 1
+        for assister_id in missing:
+            assist_inserts.append(dict(_assist_values(goals[0], position), created_at=now, game_id=game.id,
+                                       goal_id=goal_ids[0], assister_id=assister_id))
+            position += 1
+    deleted_assists += [assist.id for assist in free_assists]
+
+    # Reused assists follow only the period or time their goal changed in this edit
+    assist_updates = []
+    goals_by_id = dict(zip(goal_ids, goals))
+    for assist in reused_assists:
+        goal, stored_goal = goals_by_id[assist.goal_id], stored_goals[assist.goal_id]
+        values = {
+            'period': goal['period'] if goal['period'] != stored_goal.period else assist.period,
+            'time_assisted': goal['time_scored'] if goal['time_scored'] != stored_goal.time_scored
+            else assist.time_assisted
+        }
+        if any(getattr(assist, field) != value for field, value in values.items()):
+            assist_updates.append(dict({f'b_{field}': value for field, value in values.items()}, b_id=assist.id))
+
+    if deleted_assists:
+        db.session.execute(assist_table.delete().where(assist_table.c.id.in_(deleted_assists)))
+    if unmatched_ids:
+        db.session.execute(goal_table.delete().where(goal_table.c.id.in_(sorted(unmatched_ids))))
+    if assist_updates:
+        db.session.execute(
+            assist_table.update().where(assist_table.c.id == db.bindparam('b_id'))
+            .values(**{field: db.bindparam(f'b_{field}') for field in ('period', 'time_assisted')}),
+            assist_updates
+        )
+    if assist_inserts:
+        db.session.execute(assist_table.insert(), assist_inserts)
+    counts['goals_deleted'] = len(unmatched_ids)
+    counts['assists_inserted'] = len(assist_inserts)
+    counts['assists_updated'] = len(assist_updates)
+    counts['assists_deleted'] = len(deleted_assists)
+
+    if any(counts.values()):
+        refresh_player_stats(team_names=[game.team_name])
+        invalidate_player_analytics([game.season])
+    return counts
+
+
+def load_scoresheet(game_id):
+    """
+    Read the stored goals of a game, each with its linked assisters.
+
+    Returns:
+        dict: Scoresheet in the shape parse_scoresheet() returns, with goals
+        and their assists in the order they were recorded
+    """
+    goal_table = Goal.__table__
+    goals = [{
+        'id': row.id,
+        'scorer_id': row.scorer_id,
+        'period': row.period,
+        'time_scored': row.time_scored,
+        'goal_type': row.goal_type,
+        'assister_ids': []
+    } for row in db.session.execute(
+        db.select(goal_table.c.id, *[goal_table.c[field] for field in GOAL_KEY_FIELDS])
+        .where(goal_table.c.game_id == game_id).order_by(goal_table.c.id)
+    )]
+    goals_by_id = {goal['id']: goal for goal in goals}
+    for goal_id, assister_id in db.session.execute(
+        db.select(Assist.goal_id, Assist.assister_id).where(Assist.game_id == game_id).order_by(Assist.id)
+    ):
+        goals_by_id[goal_id]['assister_ids'].append(assister_id)
+    return {'goals': goals, 'assists': []}
+
+
+def scoresheet_form_data(sheet):
+    """Return goals (with their linked assisters) and unlinked assists in the shape the game form's script loads."""
+    existing_goals = [dict({field: goal[field] for field in ('id',) + GOAL_KEY_FIELDS}, assists=goal['assister_ids'])
+                      for goal in sheet['goals']]
+    existing_assists = [{'assister_id': assister_id} for assister_id in sheet['assists']]
+    return existing_goals, existing_assists
+
+
+### Offline scoring sync ###
+
+def parse_client_key(value):
+    """Return a client-generated idempotency key, or None if it is missing or malformed."""
+    key = str(value or '').strip()
+    return key if CLIENT_KEY_PATTERN.fullmatch(key) else None
+
+
+def parse_scoring_events(raw_events):
+    """
+    Parse a batch of offline scoring events.
+
+    Each event is a dict with a client-generated "key" and a "type":
+
+        {"key": "3f0c...", "type": "goal", "scorer_id": 12, "period": 2,
+         "time_scored": "5:30", "goal_type": "power_play"}
+        {"key": "9a1e...", "type": "assist", "goal_key": "3f0c...", "assister_id": 7}
+
+    Assists name their goal by the goal event's key ("goal_key") or by a
+    stored goal's "goal_id".
+
+    Args:
+        raw_events: Decoded "events" list of the sync request
+
+    Returns:
+        tuple: (events, results) where events are normalized dicts and results
+        holds an error result for every event that could not be parsed
+
+    Raises:
+        ValueError: If the batch is not a list or has too many events
+    """
+    if not isinstance(raw_events, list):
+        raise ValueError('events must be a list.')
+    if len(raw_events) > MAX_SYNC_EVENTS:
+        raise ValueError(f"A sync batch holds at most {MAX_SYNC_EVENTS} events.")
+
+    events = []
+    results = []
+    seen = set()
+    for number, entry in enumerate(raw_events, start=1):
+        if not isinstance(entry, dict):
+            results.append({'key': None, 'status': 'error', 'error': f"Event {number}: invalid entry."})
+            continue
+        key = parse_client_key(entry.get('key'))
+        if key is None:
+            results.append({'key': entry.get('key'), 'status': 'error', 'error': f"Event {number}: invalid key."})
+            continue
+        if key in seen:
+            continue  # Queued twice on the device; the first copy is applied
+        seen.add(key)
+
+        if entry.get('type') == 'goal':
+            scorer_id = _player_id(entry.get('scorer_id'))
+            try:
+                period = int(entry.get('period') or 1)
+            except (TypeError, ValueError):
+                period = 0
+            goal_type = entry.get('goal_type') or 'even_strength'
+            if scorer_id is None:
+                error = 'missing scorer'
+            elif not 1 <= period <= MAX_PERIOD:
+                error = 'invalid period'
+            elif goal_type not in GOAL_TYPES:
+                error = 'invalid goal type'
+            else:
+                events.append({'key': key, 'type': 'goal', 'scorer_id': scorer_id, 'period': period,
+                               'time_scored': str(entry.get('time_scored') or '')[:10], 'goal_type': goal_type})
+                continue
+        elif entry.get('type') == 'assist':
+            assister_id = _player_id(entry.get('assister_id'))
+            goal_key = parse_client_key(entry.get('goal_key'))
+            goal_id = _player_id(entry.get('goal_id'))
+            if assister_id is None:
+                error = 'missing player'
+            elif goal_key is None and goal_id is None:
+                error = 'missing goal'
+            else:
+                events.append({'key': key, 'type': 'assist', 'assister_id': assister_id,
+                               'goal_key': goal_key, 'goal_id': goal_id})
+                continue
+        else:
+            error = 'unknown event type'
+        results.append({'key': key, 'status': 'error', 'error': f"Event {number}: {error}."})
+    return events, results
+
+
+def apply_scoring_events(game, raw_events):
+    """
+    Apply a batch of offline goal and assist events to a game, at most once per key.
+
+    Events whose key is already stored are reported as duplicates with the IDs
+    of the stored rows, so a device can resend a batch whose response it never
+    received. The batch costs a fixed number of statements: one lookup of
+    stored keys and referenced goals, one roster check, one assist count and
+    one INSERT each for goals and assists. The caller commits; a concurrent
+    sync of the same keys makes the commit fail on the unique client_key
+    index and the device retries.
+
+    Args:
+        game: Game the events were recorded for
+        raw_events: Decoded "events" list of the sync request
+
+    Returns:
+        tuple: (results, live_events) where results has one dict per event
+        (key, status "applied", "duplicate" or "error", goal_id/assist_id or
+        error) and live_events lists (event name, payload) pairs to publish
+        once committed
+    """
+    events, results = parse_scoring_events(raw_events)
+    goal_table = Goal.__table__
+    assist_table = Assist.__table__
+
+    goal_events = [event for event in events if event['type'] == 'goal']
+    assist_events = [event for event in events if event['type'] == 'assist']
+    keys = [event['key'] for event in events]
+    goal_keys = set(keys) | {event['goal_key'] for event in assist_events if event['goal_key']}
+    goal_ids = {event['goal_id'] for event in assist_events if event['goal_id']}
+
+    # Stored goals: already-applied goal events, goals named by key or by id
+    goal_conditions = [goal_table.c.client_key.in_(sorted(goal_keys))]
+    if goal_ids:
+        goal_conditions.append(goal_table.c.id.in_(sorted(goal_ids)))
+    stored_goals = db.session.execute(
+        db.select(goal_table.c.id, goal_table.c.client_key, goal_table.c.game_id,
+                  goal_table.c.period, goal_table.c.time_scored)
+        .where(db.or_(*goal_conditions))
+    ).all() if events else []
+    goals_by_key = {goal.client_key: goal for goal in stored_goals if goal.client_key}
+    goals_by_id = {goal.id: goal for goal in stored_goals}
+    stored_assists = {assist.client_key: assist for assist in db.session.execute(
+        db.select(assist_table.c.id, assist_table.c.client_key, assist_table.c.game_id)
+        .where(assist_table.c.client_key.in_(keys))
+    )} if assist_events else {}
+
+    def duplicate(event, stored, id_field):
+        if stored.game_id != game.id:
+            return {'key': event['key'], 'status': 'error', 'error': 'Key was already used for another game.'}
+        return {'key': event['key'], 'status': 'duplicate', id_field: stored.id}
+
+    pending = []
+    for event in events:
+        stored = (goals_by_key if event['type'] == 'goal' else stored_assists).get(event['key'])
+        if stored is not None:
+            results.append(duplicate(event, stored, f"{event['type']}_id"))
+        else:
+            pending.append(event)
+
+    # One roster check for every scorer and assister still to be written
+    player_ids = {event.get('scorer_id') or event.get('assister_id') for event in pending}
+    members = {player.id: player for player in db.session.execute(
+        db.select(Player.id, Player.first_name, Player.last_name, Player.jersey_number)
+        .where(Player.id.in_(sorted(player_ids)), team_member_filter(game.team_name))
+    )} if player_ids else {}
+
+    now = datetime.utcnow()
+    new_goals = []
+    for event in pending:
+        if event['type'] != 'goal':
+            continue
+        if event['scorer_id'] not in members:
+            results.append({'key': event['key'], 'status': 'error',
+                            'error': f"Player {event['scorer_id']} is not on the {game.team_name} roster."})
+            continue
+        new_goals.append(event)
+
+    live_events = []
+    if new_goals:
+        created = db.session.execute(
+            goal_table.insert().returning(goal_table.c.id, goal_table.c.client_key, goal_table.c.game_id,
+                                          goal_table.c.scorer_id, goal_table.c.period,
+                                          goal_table.c.time_scored, goal_table.c.goal_type),
+            [dict({field: event[field] for field in GOAL_KEY_FIELDS}, created_at=now, game_id=game.id,
+                  client_key=event['key']) for event in new_goals]
+        ).all()
+        for goal in created:
+            goals_by_key[goal.client_key] = goal
+            goals_by_id[goal.id] = goal
+            live_events.append(('goal', goal_event(game, goal, members[goal.scorer_id])))
+        results += [{'key': event['key'], 'status': 'applied', 'goal_id': goals_by_key[event['key']].id}
+                    for event in new_goals]
+
+    new_assists = []
+    for event in pending:
+        if event['type'] != 'assist':
+            continue
+        goal = goals_by_key.get(event['goal_key']) if event['goal_key'] else goals_by_id.get(event['goal_id'])
+        if goal is None or goal.game_id != game.id:
+            results.append({'key': event['key'], 'status': 'error', 'error': 'Goal of the assist was not found.'})
+        elif event['assister_id'] not in members:
+            results.append({'key': event['key'], 'status': 'error',
+                            'error': f"Player {event['assister_id']} is not on the {game.team_name} roster."})
+        else:
+            new_assists.append((event, goal))
+
+    if new_assists:
+        # The first assist on a goal is the primary one
+        positions = dict(db.session.execute(
+            db.select(assist_table.c.goal_id, db.func.count(assist_table.c.id))
+            .where(assist_table.c.goal_id.in_(sorted({goal.id for _, goal in new_assists})))
+            .group_by(assist_table.c.goal_id)
+        ).all())
+        rows = []
+        for event, goal in new_assists:
+            position = positions.get(goal.id, 0)
+            positions[goal.id] = position + 1
+            rows.append(dict(_assist_values({'period': goal.period, 'time_scored': goal.time_scored}, position),
+                             created_at=now, game_id=game.id, goal_id=goal.id,
+                             assister_id=event['assister_id'], client_key=event['key']))
+        created = {assist.client_key: assist for assist in db.session.execute(
+            assist_table.insert().returning(assist_table.c.id, assist_table.c.client_key,
+                                            assist_table.c.goal_id, assist_table.c.assister_id),
+            rows
+        )}
+        for event, _ in new_assists:
+            assist = created[event['key']]
+            results.append({'key': event['key'], 'status': 'applied', 'assist_id': assist.id})
+            live_events.append(('assist', assist_event(game.id, assist, members[assist.assister_id])))
+
+    if new_goals or new_assists:
+        refresh_player_stats(team_names=[game.team_name])
+        invalidate_player_analytics([game.season])
+    return results, live_events
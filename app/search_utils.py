@@ -0,0 +1,163 @@
+"""
+Full-text search over the player roster.
+
+SQLite uses an FTS5 virtual table (player_search) kept in sync with the player
+table by triggers. PostgreSQL uses a generated tsvector column
+(player.search_vector) with a GIN index. Both are maintained by the database,
+so ORM writes and bulk Core statements stay in sync alike. Other databases fall
+back to the original ILIKE scan.
+
+The index is created by the b7e2c94a1d03 migration. At startup only a local
+SQLite database (which is built by db.create_all()) gets it created on the fly;
+PostgreSQL deployments are only checked for it.
+"""
+
+import re
+
+from flask import current_app
+
+from app import db
+from app.models import Player
+
+# Player columns covered by the search index
+SEARCH_COLUMNS = [
+    'first_name', 'last_name',
+    'guardian_first_name', 'guardian_last_name',
+    'dad_first_name', 'dad_last_name', 'mom_first_name', 'mom_last_name',
+    'dad_phone', 'dad_email', 'mom_phone', 'mom_email',
+    'address', 'city', 'state', 'zip_code',
+]
+
+_COLUMN_LIST = ', '.join(SEARCH_COLUMNS)
+_NEW_VALUES = ', '.join(f'new.{column}' for column in SEARCH_COLUMNS)
+_OLD_VALUES = ', '.join(f'old.{column}' for column in SEARCH_COLUMNS)
+
+SQLITE_SEARCH_DDL = [
+    f"""CREATE VIRTUAL TABLE IF NOT EXISTS player_search USING fts5(
+        {_COLUMN_LIST},
+        content='player', content_rowid='id',
+        tokenize='unicode61 remove_diacritics 2', prefix='2 3'
+    )""",
+    f"""CREATE TRIGGER IF NOT EXISTS player_search_ai AFTER INSERT ON player BEGIN
+        INSERT INTO player_search(rowid, {_COLUMN_LIST}) VALUES (new.id, {_NEW_VALUES});
+    END""",
+    f"""CREATE TRIGGER IF NOT EXISTS player_search_ad AFTER DELETE ON player BEGIN
+        INSERT INTO player_search(player_search, rowid, {_COLUMN_LIST}) VALUES ('delete', old.id, {_OLD_VALUES});
+    END""",
+    f"""CREATE TRIGGER IF NOT EXISTS player_search_au AFTER UPDATE ON player BEGIN
+        INSERT INTO player_search(player_search, rowid, {_COLUMN_LIST}) VALUES ('delete', old.id, {_OLD_VALUES});
+        INSERT INTO player_search(rowid, {_COLUMN_LIST}) VALUES (new.id, {_NEW_VALUES});
+    END""",
+]
+
+# The 'simple' parser keeps an email address as one token, so the words of
+# each email's local part are indexed as well ("jane.doe@x.com" -> "jane doe")
+EMAIL_COLUMNS = ['dad_email', 'mom_email']
+_EMAIL_LOCAL_PARTS = [f"regexp_replace(split_part(coalesce({column}, ''), '@', 1), '[^[:alnum:]]+', ' ', 'g')"
+                      for column in EMAIL_COLUMNS]
+_TSVECTOR_SOURCE = " || ' ' || ".join([f"coalesce({column}, '')" for column in SEARCH_COLUMNS] + _EMAIL_LOCAL_PARTS)
+
+POSTGRES_SEARCH_DDL = [
+    f"""ALTER TABLE player ADD COLUMN IF NOT EXISTS search_vector tsvector
+        GENERATED ALWAYS AS (to_tsvector('simple'::regconfig, {_TSVECTOR_SOURCE})) STORED""",
+    "CREATE INDEX IF NOT EXISTS ix_player_search_vector ON player USING gin (search_vector)",
+]
+
+
+def init_search_index(app):
+    """
+    Pick the search backend for the configured database.
+
+    Sets app.config['PLAYER_SEARCH_BACKEND'] to 'fts5', 'tsvector' or 'like'.
+    A SQLite database missing the FTS5 table gets it created (local development,
+    like db.create_all()); PostgreSQL only uses the tsvector column if the
+    migration has added it and never runs DDL here. Must be called inside an
+    application context after db.create_all().
+    """
+    dialect = db.engine.dialect.name
+    backend = 'like'
+    try:
+        if dialect == 'sqlite':
+            with db.engine.begin() as connection:
+                existing = connection.execute(db.text(
+                    "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'player_search'"
+                )).first()
+                if existing is None:
+                    for statement in SQLITE_SEARCH_DDL:
+                        connection.execute(db.text(statement))
+                    # Index players that were stored before the search table existed
+                    connection.execute(db.text("INSERT INTO player_search(player_search) VALUES ('rebuild')"))
+            backend = 'fts5'
+        elif dialect == 'postgresql':
+            columns = [column['name'] for column in db.inspect(db.engine).get_columns('player')]
+            if 'search_vector' in columns:
+                backend = 'tsvector'
+            else:
+                print("Player search index missing (run flask db upgrade), falling back to LIKE search")
+    except Exception as e:
+        print(f"Full-text search unavailable, falling back to LIKE search: {str(e)}")
+        backend = 'like'
+    app.config['PLAYER_SEARCH_BACKEND'] = backend
+    return backend
+
+
+def search_tokens(search):
+    """Split a search string into the word tokens used for prefix matching."""
+    return re.findall(r'\w+', search.lower())
+
+
+def player_search_ranking(search):
+    """
+    Build a (player_id, rank) subquery for a search string.
+
+    Lower rank values are better matches on every backend. Returns None when
+    the search contains no searchable tokens or full-text search is disabled.
+    """
+    tokens = search_tokens(search)
+    backend = current_app.config.get('PLAYER_SEARCH_BACKEND', 'like')
+    if not tokens or backend == 'like':
+        return None
+
+    if backend == 'fts5':
+        match = ' '.join(f'"{token}"*' for token in tokens)
+        return db.select(
+            db.literal_column('player_search.rowid').label('player_id'),
+            db.literal_column('bm25(player_search)').label('rank')
+        ).select_from(db.table('player_search')) \
+            .where(db.text('player_search MATCH :player_search_query').bindparams(player_search_query=match)) \
+            .subquery('player_search_rank')
+
+    ts_query = db.func.to_tsquery(db.literal_column("'simple'::regconfig"),
+                                  ' & '.join(f'{token}:*' for token in tokens))
+    search_vector = db.literal_column('player.search_vector')
+    return db.select(
+        Player.id.label('player_id'),
+        (-db.func.ts_rank(search_vector, ts_query)).label('rank')
+    ).where(search_vector.op('@@')(ts_query)).subquery('player_search_rank')
+
+
+def _ilike_filter(search):
+    search_term = f"%{search}%"
+    return db.or_(*[getattr(Player, column).ilike(search_term) for column in SEARCH_COLUMNS])
+
+
+def apply_player_search(query, search, ranked=True):
+    """
+    Restrict a Player query to players matching a search string.
+
+    Args:
+        query: Player query to filter
+        search: Raw search string from the request
+        ranked: Order the results by relevance (best match first)
+
+    Returns:
+        Query: The filtered (and optionally ordered) query
+    """
+    ranking = player_search_ranking(search)
+    if ranking is None:
+        return query.filter(_ilike_filter(search))
+
+    query = query.join(ranking, ranking.c.player_id == Player.id)
+    if ranked:
+        query = query.order_by(ranking.c.rank)
+    return query
@@ -0,0 +1,301 @@
+"""
+Team standings.
+
+Season records, goal differential, home/away splits and current streaks are
+aggregated in SQL from the completed games of each (team, season) and cached
+in TeamSeasonStanding rows. Mapper hooks on Game record which (team, season)
+pairs a flush touched and their cached rows are deleted at the end of the
+flush; the standings read path recomputes missing rows in one INSERT ...
+SELECT the next time they are asked for.
+
+Games played at a rink listed in the HOME_RINKS setting count as home games,
+every other game counts as away.
+"""
+
+from datetime import datetime
+from itertools import product
+
+from flask import current_app
+from sqlalchemy import event
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import Session, object_session
+
+from app import db
+from app.models import Game, TeamSeasonStanding
+
+# Standings points per result
+POINTS_PER_WIN = 2
+POINTS_PER_TIE = 1
+
+# Game columns that change a team's standing (notes and rink location do not)
+STANDINGS_GAME_FIELDS = ('team_name', 'season', 'game_date', 'rink_name', 'badgers_score', 'opponent_score',
+                         'game_status')
+
+
+def get_home_rinks():
+    """Return the configured home rink names, lower-cased and sorted."""
+    return sorted({rink.strip().lower() for rink in current_app.config.get('HOME_RINKS', ()) if rink.strip()})
+
+
+def _home_rinks_key(home_rinks):
+    # Stored with each row so changing HOME_RINKS invalidates the cached splits
+    return ','.join(home_rinks)
+
+
+def _completed_games(season, team_names=None):
+    conditions = [Game.game_status == 'completed', Game.season == season]
+    if team_names is not None:
+        conditions.append(Game.team_name.in_(list(team_names)))
+    return conditions
+
+
+def _count_when(*conditions):
+    return db.func.coalesce(db.func.sum(db.case((db.and_(*conditions), 1), else_=0)), 0)
+
+
+def team_records_query(season, team_names=None, home_rinks=()):
+    """
+    Aggregate the record, goals and home/away splits of every team in a season.
+
+    Args:
+        season: Season of the games (Game.season), e.g., "2024-25"
+        team_names: Optional iterable of team names to restrict the rows to
+        home_rinks: Lower-cased rink names counted as home games
+
+    Returns:
+        Select: one row per team with games_played, wins, losses, ties,
+        goals_for, goals_against and home_/away_ wins, losses and ties
+    """
+    win = Game.badgers_score > Game.opponent_score
+    loss = Game.badgers_score < Game.opponent_score
+    tie = Game.badgers_score == Game.opponent_score
+    home = db.func.lower(Game.rink_name).in_(list(home_rinks)) if home_rinks else db.false()
+
+    return db.select(
+        Game.team_name.label('team_name'),
+        Game.season.label('season'),
+        db.func.count(Game.id).label('games_played'),
+        _count_when(win).label('wins'),
+        _count_when(loss).label('losses'),
+        _count_when(tie).label('ties'),
+        db.func.coalesce(db.func.sum(Game.badgers_score), 0).label('goals_for'),
+        db.func.coalesce(db.func.sum(Game.opponent_score), 0).label('goals_against'),
+        _count_when(home, win).label('home_wins'),
+        _count_when(home, loss).label('home_losses'),
+        _count_when(home, tie).label('home_ties'),
+        _count_when(db.not_(home), win).label('away_wins'),
+        _count_when(db.not_(home), loss).label('away_losses'),
+        _count_when(db.not_(home), tie).label('away_ties')
+    ).where(*_completed_games(season, team_names)).group_by(Game.team_name, Game.season)
+
+
+def team_streaks_query(season, team_names=None):
+    """
+    Find the current streak of every team in a season.
+
+    Each team's games are ranked newest first with ROW_NUMBER(); the streak is
+    the number of games before the first one whose result differs from the
+    latest game's.
+
+    Args:
+        season: Season of the games (Game.season)
+        team_names: Optional iterable of team names to restrict the rows to
+
+    Returns:
+        Select: team_name, season, streak_result ("W", "L" or "T") and streak_length
+    """
+    result = db.case(
+        (Game.badgers_score > Game.opponent_score, 'W'),
+        (Game.badgers_score < Game.opponent_score, 'L'),
+        else_='T'
+    )
+    ranked = db.select(
+        Game.team_name.label('team_name'),
+        Game.season.label('season'),
+        result.label('result'),
+        db.func.row_number().over(
+            partition_by=(Game.team_name, Game.season),
+            order_by=(Game.game_date.desc(), Game.id.desc())
+        ).label('rn')
+    ).where(*_completed_games(season, team_names)).subquery('ranked_games')
+
+    latest = db.select(ranked.c.team_name, ranked.c.season, ranked.c.result) \
+        .where(ranked.c.rn == 1).subquery('latest_results')
+
+    first_break = db.func.min(db.case((ranked.c.result != latest.c.result, ranked.c.rn)))
+    return db.select(
+        ranked.c.team_name,
+        ranked.c.season,
+        latest.c.result.label('streak_result'),
+        db.func.coalesce(first_break - 1, db.func.count()).label('streak_length')
+    ).join(latest, db.and_(ranked.c.team_name == latest.c.team_name, ranked.c.season == latest.c.season)) \
+        .group_by(ranked.c.team_name, ranked.c.season, latest.c.result)
+
+
+def team_standings_query(season, team_names=None, home_rinks=()):
+    """
+    Combine records and streaks into TeamSeasonStanding-shaped rows.
+
+    Returns:
+        Select: one row per team with every TeamSeasonStanding column except
+        id, refreshed_at and home_rinks
+    """
+    records = team_records_query(season, team_names, home_rinks).subquery('team_records')
+    streaks = team_streaks_query(season, team_names).subquery('team_streaks')
+    return db.select(
+        records.c.team_name,
+        records.c.season,
+        records.c.games_played,
+        records.c.wins,
+        records.c.losses,
+        records.c.ties,
+        (records.c.wins * POINTS_PER_WIN + records.c.ties * POINTS_PER_TIE).label('points'),
+        records.c.goals_for,
+        records.c.goals_against,
+        (records.c.goals_for - records.c.goals_against).label('goal_differential'),
+        records.c.home_wins,
+        records.c.home_losses,
+        records.c.home_ties,
+        records.c.away_wins,
+        records.c.away_losses,
+        records.c.away_ties,
+        streaks.c.streak_result,
+        streaks.c.streak_length
+    ).join(streaks, db.and_(records.c.team_name == streaks.c.team_name, records.c.season == streaks.c.season))
+
+
+### Cache maintenance ###
+
+def refresh_team_standings(season, team_names, home_rinks=None):
+    """
+    Recompute and store the cached standings of the given teams in a season.
+
+    Args:
+        season: Season of the games (Game.season)
+        team_names: Iterable of team names to refresh
+        home_rinks: Lower-cased home rink names (defaults to the HOME_RINKS setting)
+    """
+    team_names = sorted({team for team in team_names if team})
+    if not team_names:
+        return
+    if home_rinks is None:
+        home_rinks = get_home_rinks()
+
+    standing_table = TeamSeasonStanding.__table__
+    db.session.execute(standing_table.delete().where(
+        standing_table.c.season == season, standing_table.c.team_name.in_(team_names)))
+
+    # INSERT ... SELECT straight from the aggregate, no rows pass through Python
+    rows = team_standings_query(season, team_names, home_rinks).subquery()
+    db.session.execute(standing_table.insert().from_select(
+        list(rows.c.keys()) + ['home_rinks', 'refreshed_at'],
+        db.select(*rows.c,
+                  db.literal(_home_rinks_key(home_rinks), db.Text),
+                  db.literal(datetime.utcnow(), db.DateTime))
+    ))
+
+
+def invalidate_team_standings(pairs):
+    """
+    Delete the cached standings of (team_name, season) pairs.
+
+    Writes go through Core statements so this is safe to call while a flush is
+    finishing.
+    """
+    standing_table = TeamSeasonStanding.__table__
+    pairs = sorted({(team, season) for team, season in pairs if team and season})
+    if pairs:
+        db.session.execute(standing_table.delete().where(
+            db.tuple_(standing_table.c.team_name, standing_table.c.season).in_(pairs)))
+
+
+def clear_team_standings():
+    """Delete every cached standing; rows are recomputed on the next read."""
+    db.session.execute(TeamSeasonStanding.__table__.delete())
+
+
+def mark_standings_dirty(session, team_names, seasons):
+    """Queue (team, season) pairs whose cached standing must be dropped when the session next flushes."""
+    session.info.setdefault('dirty_standings', set()).update(product(team_names, seasons))
+
+
+def _attribute_values(target, attribute):
+    """Return the current value of an attribute plus any value it replaced."""
+    history = db.inspect(target).attrs[attribute].history
+    values = set(history.added or ()) | set(history.unchanged or ()) | set(history.deleted or ())
+    values.add(getattr(target, attribute))
+    return values
+
+
+def _game_changed(mapper, connection, target):
+    session = object_session(target)
+    if session is not None:
+        mark_standings_dirty(session, _attribute_values(target, 'team_name'), _attribute_values(target, 'season'))
+
+
+def _game_updated(mapper, connection, target):
+    state = db.inspect(target)
+    if any(state.attrs[field].history.has_changes() for field in STANDINGS_GAME_FIELDS):
+        _game_changed(mapper, connection, target)
+
+
+event.listen(Game, 'after_insert', _game_changed)
+event.listen(Game, 'after_delete', _game_changed)
+event.listen(Game, 'after_update', _game_updated)
+
+
+@event.listens_for(Session, 'after_flush_postexec')
+def _invalidate_dirty_standings(session, flush_context):
+    dirty = session.info.pop('dirty_standings', None)
+    if dirty:
+        invalidate_team_standings(dirty)
+
+
+### Standings read path ###
+
+def get_standing_seasons():
+    """Return the seasons that have completed games, newest first."""
+    return [season for season, in db.session.query(Game.season)
+            .filter(Game.game_status == 'completed')
+            .distinct().order_by(Game.season.desc()).all()]
+
+
+def _cached_standings(season, team_names, home_rinks_key):
+    return TeamSeasonStanding.query.filter(
+        TeamSeasonStanding.season == season,
+        TeamSeasonStanding.team_name.in_(team_names),
+        TeamSeasonStanding.home_rinks == home_rinks_key
+    ).all()
+
+
+def get_standings(season, team_names=None):
+    """
+    Read the standings of a season, computing any (team, season) rows missing from the cache.
+
+    Args:
+        season: Season of the games (Game.season), e.g., "2024-25"
+        team_names: Optional iterable of team names to restrict the standings to
+
+    Returns:
+        list: TeamSeasonStanding rows sorted by points, goal differential and wins
+    """
+    teams = db.session.query(Game.team_name).filter(*_completed_games(season, team_names)).distinct()
+    teams = {team for team, in teams.all()}
+    if not teams:
+        return []
+
+    home_rinks = get_home_rinks()
+    home_rinks_key = _home_rinks_key(home_rinks)
+    standings = _cached_standings(season, teams, home_rinks_key)
+    missing = teams - {standing.team_name for standing in standings}
+    if missing:
+        try:
+            refresh_team_standings(season, missing, home_rinks)
+            db.session.commit()
+        except IntegrityError:
+            # Another request cached the same rows first; read theirs
+            db.session.rollback()
+        standings = _cached_standings(season, teams, home_rinks_key)
+
+    return sorted(standings, key=lambda standing: (
+        -standing.points, -standing.goal_differential, -standing.wins, standing.team_name))
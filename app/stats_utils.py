@@ -0,0 +1,318 @@
+"""
+Player scoring statistics.
+
+Goals, assists and games played are kept per (player, team, season) in the
+PlayerTeamSeasonStats rollup table. Mapper hooks on Player, PlayerTeam, Game,
+Goal and Assist record which players and teams a flush touched, and those
+rows are recomputed at the end of the flush, in the same transaction as the
+change. The statistics pages read the rollup rows instead of aggregating the
+event tables.
+"""
+
+from datetime import datetime
+
+from sqlalchemy import event
+from sqlalchemy.orm import Session, object_session
+
+from app import db
+from app.models import Player, PlayerTeam, Game, Goal, Assist, PlayerTeamSeasonStats
+from app.roster_utils import team_member_filter
+
+# Player columns that decide which teams a player's stats belong to
+PLAYER_STATS_FIELDS = ('team',)
+
+
+def player_team_games():
+    """
+    Build a (player_id, team_name, season, games) subquery pairing players with
+    every team they play for and each season that team has games in, plus the
+    team's game count for the season.
+    """
+    game_counts = db.select(
+        Game.team_name.label('team_name'),
+        Game.season.label('season'),
+        db.func.count(Game.id).label('games')
+    ).group_by(Game.team_name, Game.season).subquery('team_games')
+
+    # Primary teams plus additional teams from player_team
+    teams = db.union(
+        db.select(Player.id.label('player_id'), Player.team.label('team_name')),
+        db.select(PlayerTeam.player_id, PlayerTeam.team_name)
+    ).subquery('player_teams')
+
+    return db.select(
+        teams.c.player_id,
+        teams.c.team_name,
+        game_counts.c.season,
+        game_counts.c.games
+    ).join(game_counts, teams.c.team_name == game_counts.c.team_name).subquery('player_team_games')
+
+
+def _event_counts(model, player_column, label):
+    # Goals or assists per (player, team, season)
+    return db.select(
+        player_column.label('player_id'),
+        Game.team_name.label('team_name'),
+        Game.season.label('season'),
+        db.func.count(model.id).label(label)
+    ).join(Game, model.game_id == Game.id) \
+        .group_by(player_column, Game.team_name, Game.season).subquery(f'{label}_counts')
+
+
+def player_team_stats_query(team_names=None, player_ids=None):
+    """
+    Aggregate goals, assists and games played per (player, team, season) from the event tables.
+
+    Args:
+        team_names: Optional iterable of team names to restrict the rows to
+        player_ids: Optional iterable of player IDs to restrict the rows to
+            (rows matching either restriction are returned)
+
+    Returns:
+        Select: player_id, team_name, season, goals, assists, points and games_played
+    """
+    memberships = player_team_games()
+    goal_counts = _event_counts(Goal, Goal.scorer_id, 'goals')
+    assist_counts = _event_counts(Assist, Assist.assister_id, 'assists')
+
+    def same_row(counts):
+        return db.and_(
+            counts.c.player_id == memberships.c.player_id,
+            counts.c.team_name == memberships.c.team_name,
+            counts.c.season == memberships.c.season
+        )
+
+    goals = db.func.coalesce(goal_counts.c.goals, 0)
+    assists = db.func.coalesce(assist_counts.c.assists, 0)
+    query = db.select(
+        memberships.c.player_id,
+        memberships.c.team_name,
+        memberships.c.season,
+        goals.label('goals'),
+        assists.label('assists'),
+        (goals + assists).label('points'),
+        memberships.c.games.label('games_played')
+    ).select_from(memberships) \
+        .outerjoin(goal_counts, same_row(goal_counts)) \
+        .outerjoin(assist_counts, same_row(assist_counts))
+
+    conditions = []
+    if team_names is not None:
+        conditions.append(memberships.c.team_name.in_(list(team_names)))
+    if player_ids is not None:
+        conditions.append(memberships.c.player_id.in_(list(player_ids)))
+    if conditions:
+        query = query.where(db.or_(*conditions))
+    return query
+
+
+### Rollup maintenance ###
+
+def _insert_stats_rows(query):
+    # INSERT ... SELECT straight from the aggregate, no rows pass through Python
+    rows = query.subquery()
+    columns = ['player_id', 'team_name', 'season', 'goals', 'assists', 'points', 'games_played']
+    db.session.execute(PlayerTeamSeasonStats.__table__.insert().from_select(
+        columns + ['refreshed_at'],
+        db.select(*[rows.c[column] for column in columns], db.literal(datetime.utcnow(), db.DateTime))
+    ))
+
+
+def refresh_player_stats(team_names=(), player_ids=()):
+    """
+    Recompute and store the rollup rows of the given teams and players.
+
+    Writes go through Core statements so this is safe to call while a flush is
+    finishing.
+
+    Args:
+        team_names: Iterable of team names whose rows are refreshed
+        player_ids: Iterable of player IDs whose rows are refreshed
+    """
+    team_names = sorted({team for team in team_names if team})
+    player_ids = sorted({player_id for player_id in player_ids if player_id is not None})
+    if not team_names and not player_ids:
+        return
+
+    stats_table = PlayerTeamSeasonStats.__table__
+    conditions = []
+    if team_names:
+        conditions.append(stats_table.c.team_name.in_(team_names))
+    if player_ids:
+        conditions.append(stats_table.c.player_id.in_(player_ids))
+    db.session.execute(stats_table.delete().where(db.or_(*conditions)))
+
+    _insert_stats_rows(player_team_stats_query(team_names, player_ids))
+
+
+def rebuild_player_stats():
+    """
+    Recompute every rollup row from the event tables.
+
+    Returns:
+        int: Number of rollup rows written
+    """
+    stats_table = PlayerTeamSeasonStats.__table__
+    db.session.execute(stats_table.delete())
+    _insert_stats_rows(player_team_stats_query())
+    return db.session.query(db.func.count(PlayerTeamSeasonStats.id)).scalar()
+
+
+def mark_stats_dirty(session, team_names=(), player_ids=()):
+    """Queue teams and players whose rollup rows must be refreshed when the session next flushes."""
+    session.info.setdefault('dirty_stats_teams', set()).update(team for team in team_names if team)
+    session.info.setdefault('dirty_stats_players', set()).update(
+        int(player_id) for player_id in player_ids if player_id not in (None, '')  # form posts send strings
+    )
+
+
+def _attribute_values(target, attribute):
+    """Return the current value of an attribute plus any value it replaced."""
+    history = db.inspect(target).attrs[attribute].history
+    values = set(history.added or ()) | set(history.unchanged or ()) | set(history.deleted or ())
+    values.add(getattr(target, attribute))
+    return values
+
+
+def _attribute_changed(target, attribute):
+    return db.inspect(target).attrs[attribute].history.has_changes()
+
+
+def _player_changed(mapper, connection, target):
+    session = object_session(target)
+    if session is not None:
+        mark_stats_dirty(session, player_ids=[target.id])
+
+
+def _player_updated(mapper, connection, target):
+    # Tuition, contact and equipment edits do not move a player's stats
+    if any(_attribute_changed(target, field) for field in PLAYER_STATS_FIELDS):
+        _player_changed(mapper, connection, target)
+
+
+def _player_team_changed(mapper, connection, target):
+    session = object_session(target)
+    if session is not None:
+        mark_stats_dirty(session, player_ids=[target.player_id])
+
+
+def _game_changed(mapper, connection, target):
+    session = object_session(target)
+    if session is not None:
+        mark_stats_dirty(session, team_names=_attribute_values(target, 'team_name'))
+
+
+def _game_updated(mapper, connection, target):
+    # Score, rink and note edits do not change goals, assists or games played
+    if _attribute_changed(target, 'team_name') or _attribute_changed(target, 'season'):
+        _game_changed(mapper, connection, target)
+
+
+def _goal_changed(mapper, connection, target):
+    session = object_session(target)
+    if session is not None:
+        mark_stats_dirty(session, player_ids=_attribute_values(target, 'scorer_id'))
+
+
+def _assist_changed(mapper, connection, target):
+    session = object_session(target)
+    if session is not None:
+        mark_stats_dirty(session, player_ids=_attribute_values(target, 'assister_id'))
+
+
+for _model, _insert_delete_listener, _update_listener in (
+        (Player, _player_changed, _player_updated), (PlayerTeam, _player_team_changed, _player_team_changed),
+        (Game, _game_changed, _game_updated),
+        (Goal, _goal_changed, _goal_changed), (Assist, _assist_changed, _assist_changed)):
+    event.listen(_model, 'after_insert', _insert_delete_listener)
+    event.listen(_model, 'after_delete', _insert_delete_listener)
+    event.listen(_model, 'after_update', _update_listener)
+
+
+@event.listens_for(Session, 'after_flush_postexec')
+def _refresh_dirty_stats(session, flush_context):
+    teams = session.info.pop('dirty_stats_teams', None)
+    players = session.info.pop('dirty_stats_players', None)
+    if teams or players:
+        refresh_player_stats(teams or (), players or ())
+
+
+### Statistics read path ###
+
+def ensure_player_stats():
+    """Build the rollup on the fly the first time it is read after deploying."""
+    if db.session.query(PlayerTeamSeasonStats.id).first() is None \
+            and db.session.query(Game.id).first() is not None:
+        rebuild_player_stats()
+        db.session.commit()
+
+
+def get_player_leaderboard(team=None, season=None):
+    """
+    Read goals, assists, points and games played for every player from the rollup.
+
+    Args:
+        team: Only count games of this team and only list its players
+        season: Only count games of this season and only list players who
+            played that season or are registered for it
+
+    Returns:
+        list: Dicts with player, goals, assists, points and games_played,
+        sorted by points (then name)
+    """
+    ensure_player_stats()
+
+    per_player = db.select(
+        PlayerTeamSeasonStats.player_id,
+        db.func.sum(PlayerTeamSeasonStats.goals).label('goals'),
+        db.func.sum(PlayerTeamSeasonStats.assists).label('assists'),
+        db.func.sum(PlayerTeamSeasonStats.games_played).label('games_played')
+    )
+    if team:
+        per_player = per_player.where(PlayerTeamSeasonStats.team_name == team)
+    if season:
+        per_player = per_player.where(PlayerTeamSeasonStats.season == season)
+    per_player = per_player.group_by(PlayerTeamSeasonStats.player_id).subquery('player_stats')
+
+    goals = db.func.coalesce(per_player.c.goals, 0)
+    assists = db.func.coalesce(per_player.c.assists, 0)
+    points = goals + assists
+    query = db.session.query(
+        Player,
+        goals.label('goals'),
+        assists.label('assists'),
+        points.label('points'),
+        db.func.coalesce(per_player.c.games_played, 0).label('games_played')
+    )
+
+    query = query.outerjoin(per_player, per_player.c.player_id == Player.id)
+    if team:
+        # Players of the team who have no games yet are listed with zeros
+        query = query.filter(team_member_filter(team))
+    if season:
+        query = query.filter(db.or_(per_player.c.player_id.isnot(None), Player.season == season))
+
+    rows = query.order_by(points.desc(), Player.last_name, Player.first_name, Player.id).all()
+    return [{
+        'player': player,
+        'goals': int(goal_count),
+        'assists': int(assist_count),
+        'points': int(point_count),
+        'games_played': int(games_played)
+    } for player, goal_count, assist_count, point_count, games_played in rows]
+
+
+def get_player_team_stats(player_id):
+    """
+    Read a player's rollup rows, one per team and season.
+
+    Args:
+        player_id: ID of the player
+
+    Returns:
+        list: PlayerTeamSeasonStats rows ordered by season (newest first) and team
+    """
+    ensure_player_stats()
+    return PlayerTeamSeasonStats.query.filter_by(player_id=player_id) \
+        .order_by(PlayerTeamSeasonStats.season.desc(), PlayerTeamSeasonStats.team_name) \
+        .all()
@@ -0,0 +1,78 @@
+"""
+Compare the generic and PostgreSQL COPY paths for roster imports and exports.
+
+Usage:
+    DATABASE_URL=postgresql://... python benchmark_bulk_io.py [rows]
+
+Imports the given number of synthetic players (default 20000) under a
+throwaway season, exports them, re-imports them in upsert mode, and removes
+them again, once per path. On databases without COPY support only the
+generic path is measured.
+"""
+import io
+import sys
+import time
+from datetime import datetime
+
+from app import create_app, db
+from app.models import Player
+from app.import_utils import import_players, sync_after_bulk_player_write
+from app.export_utils import write_roster_csv
+from app.pg_copy_utils import copy_supported
+
+IMPORT_HEADER = ['season', 'first_name', 'last_name', 'birth_year', 'team', 'position',
+                 'dad_email', 'city', 'paid_tuition', 'total_tuition_amount', 'amount_paid']
+
+
+def build_csv(season, rows):
+    lines = [','.join(IMPORT_HEADER)]
+    for i in range(rows):
+        lines.append(f"{season},Bench{i},Player{i % 997},{2008 + i % 10},BENCH,F,"
+                     f"parent{i}@example.com,Bayonne,{'yes' if i % 3 else 'no'},1200,{i % 1200}")
+    return '\n'.join(lines).encode('utf-8')
+
+
+def timed(label, fn):
+    started = time.perf_counter()
+    result = fn()
+    elapsed = time.perf_counter() - started
+    print(f"  {label:<16} {elapsed:8.2f}s")
+    return result
+
+
+def remove_season(season):
+    player_table = Player.__table__
+    db.session.execute(player_table.delete().where(player_table.c.season == season))
+    sync_after_bulk_player_write(['BENCH'])
+    db.session.commit()
+
+
+def run(app, rows, use_copy):
+    app.config['PG_COPY_ENABLED'] = use_copy
+    season = f"B{datetime.utcnow():%H%M%S}"[:10]
+    data = build_csv(season, rows)
+    print(f"{'COPY' if copy_supported() else 'generic'} path, {rows} rows:")
+    try:
+        result = timed('import', lambda: import_players(io.BytesIO(data)))
+        print(f"  {'':<16} {result['inserted']} inserted in {result['chunks']} chunks")
+        timed('export', lambda: write_roster_csv({'season': season}, io.StringIO()))
+        result = timed('re-import upsert', lambda: import_players(io.BytesIO(data), upsert=True))
+        print(f"  {'':<16} {result['unchanged']} unchanged")
+    finally:
+        remove_season(season)
+
+
+def main():
+    rows = int(sys.argv[1]) if len(sys.argv) > 1 else 20000
+    app = create_app()
+    with app.app_context():
+        run(app, rows, use_copy=False)
+        app.config['PG_COPY_ENABLED'] = True
+        if copy_supported():
+            run(app, rows, use_copy=True)
+        else:
+            print("COPY path not available on this database; skipped.")
+
+
+if __name__ == "__main__":
+    main()
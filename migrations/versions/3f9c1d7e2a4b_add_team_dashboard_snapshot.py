@@ -0,0 +1,51 @@
+"""add team_dashboard_snapshot table
+
+Revision ID: 3f9c1d7e2a4b
+Revises: 84ea5ec44d04
+Create Date: 2026-10-17 09:12:41.530214
+
+"""
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy import inspect
+
+
+# revision identifiers, used by Alembic.
+revision = '3f9c1d7e2a4b'
+down_revision = '84ea5ec44d04'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    bind = op.get_bind()
+    inspector = inspect(bind)
+    tables = inspector.get_table_names()
+
+    if 'team_dashboard_snapshot' not in tables:
+        op.create_table(
+            'team_dashboard_snapshot',
+            sa.Column('id', sa.Integer(), primary_key=True),
+            sa.Column('refreshed_at', sa.DateTime(), nullable=False),
+            sa.Column('team_name', sa.String(length=50), nullable=False),
+            sa.Column('player_count', sa.Integer(), nullable=False),
+            sa.Column('unpaid_count', sa.Integer(), nullable=False),
+            sa.Column('wins', sa.Integer(), nullable=False),
+            sa.Column('losses', sa.Integer(), nullable=False),
+            sa.Column('ties', sa.Integer(), nullable=False),
+            sa.Column('recent_games', sa.Text(), nullable=True),
+            sa.Column('next_practice_id', sa.Integer(), nullable=True),
+            sa.Column('next_practice_title', sa.String(length=200), nullable=True),
+            sa.Column('next_practice_date', sa.Date(), nullable=True)
+        )
+        op.create_index('ix_team_dashboard_snapshot_team_name', 'team_dashboard_snapshot', ['team_name'], unique=True)
+
+
+def downgrade():
+    bind = op.get_bind()
+    inspector = inspect(bind)
+    tables = inspector.get_table_names()
+
+    if 'team_dashboard_snapshot' in tables:
+        op.drop_index('ix_team_dashboard_snapshot_team_name', table_name='team_dashboard_snapshot')
+        op.drop_table('team_dashboard_snapshot')
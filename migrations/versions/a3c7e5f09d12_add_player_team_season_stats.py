@@ -0,0 +1,52 @@
+"""add player_team_season_stats rollup table
+
+Revision ID: a3c7e5f09d12
+Revises: f2b8d4c61e39
+Create Date: 2026-10-17 16:02:18.447120
+
+"""
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy import inspect
+
+
+# revision identifiers, used by Alembic.
+revision = 'a3c7e5f09d12'
+down_revision = 'f2b8d4c61e39'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    bind = op.get_bind()
+    inspector = inspect(bind)
+    tables = inspector.get_table_names()
+
+    if 'player_team_season_stats' not in tables:
+        op.create_table(
+            'player_team_season_stats',
+            sa.Column('id', sa.Integer(), primary_key=True),
+            sa.Column('refreshed_at', sa.DateTime(), nullable=False),
+            sa.Column('player_id', sa.Integer(), sa.ForeignKey('player.id', ondelete='CASCADE'), nullable=False),
+            sa.Column('team_name', sa.String(length=50), nullable=False),
+            sa.Column('season', sa.String(length=10), nullable=True),
+            sa.Column('goals', sa.Integer(), nullable=False),
+            sa.Column('assists', sa.Integer(), nullable=False),
+            sa.Column('points', sa.Integer(), nullable=False),
+            sa.Column('games_played', sa.Integer(), nullable=False),
+            sa.UniqueConstraint('player_id', 'team_name', 'season', name='uq_player_team_season_stats')
+        )
+        op.create_index('ix_player_team_season_stats_player_id', 'player_team_season_stats', ['player_id'])
+        op.create_index('ix_player_team_season_stats_team_name', 'player_team_season_stats', ['team_name'])
+    # Rows are filled by `flask stats rebuild` (or on the first statistics page view)
+
+
+def downgrade():
+    bind = op.get_bind()
+    inspector = inspect(bind)
+    tables = inspector.get_table_names()
+
+    if 'player_team_season_stats' in tables:
+        op.drop_index('ix_player_team_season_stats_team_name', table_name='player_team_season_stats')
+        op.drop_index('ix_player_team_season_stats_player_id', table_name='player_team_season_stats')
+        op.drop_table('player_team_season_stats')
@@ -0,0 +1,55 @@
+"""index email local parts in the player search vector
+
+Revision ID: a3d8e6f1b295
+Revises: f1c5d8e2a473
+Create Date: 2026-10-17 22:41:05.318220
+
+"""
+from alembic import op
+
+
+# Mirrors app.search_utils at the time of this migration
+SEARCH_COLUMNS = [
+    'first_name', 'last_name', 'guardian_first_name', 'guardian_last_name',
+    'dad_first_name', 'dad_last_name', 'mom_first_name', 'mom_last_name',
+    'dad_phone', 'dad_email', 'mom_phone', 'mom_email',
+    'address', 'city', 'state', 'zip_code'
+]
+EMAIL_COLUMNS = ['dad_email', 'mom_email']
+
+_COLUMN_SOURCE = " || ' ' || ".join(f"coalesce({column}, '')" for column in SEARCH_COLUMNS)
+_EMAIL_LOCAL_PARTS = " || ' ' || ".join(
+    f"regexp_replace(split_part(coalesce({column}, ''), '@', 1), '[^[:alnum:]]+', ' ', 'g')"
+    for column in EMAIL_COLUMNS)
+
+
+def _add_search_vector(source):
+    op.execute(f"""ALTER TABLE player ADD COLUMN search_vector tsvector
+        GENERATED ALWAYS AS (to_tsvector('simple'::regconfig, {source})) STORED""")
+    op.execute("CREATE INDEX ix_player_search_vector ON player USING gin (search_vector)")
+
+
+# revision identifiers, used by Alembic.
+revision = 'a3d8e6f1b295'
+down_revision = 'f1c5d8e2a473'
+branch_labels = None
+depends_on = None
+
+
+def _drop_search_vector():
+    op.execute("DROP INDEX IF EXISTS ix_player_search_vector")
+    op.execute("ALTER TABLE player DROP COLUMN IF EXISTS search_vector")
+
+
+def upgrade():
+    # A generated column's expression cannot be altered in place; SQLite's FTS5
+    # tokenizer already splits emails into words, so only PostgreSQL changes
+    if op.get_bind().dialect.name == 'postgresql':
+        _drop_search_vector()
+        _add_search_vector(f"{_COLUMN_SOURCE} || ' ' || {_EMAIL_LOCAL_PARTS}")
+
+
+def downgrade():
+    if op.get_bind().dialect.name == 'postgresql':
+        _drop_search_vector()
+        _add_search_vector(_COLUMN_SOURCE)
@@ -0,0 +1,82 @@
+"""add player full-text search index
+
+Revision ID: b7e2c94a1d03
+Revises: 3f9c1d7e2a4b
+Create Date: 2026-10-17 10:03:12.118406
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# Mirrors app.search_utils at the time of this migration
+SEARCH_COLUMNS = [
+    'first_name', 'last_name', 'guardian_first_name', 'guardian_last_name',
+    'dad_first_name', 'dad_last_name', 'mom_first_name', 'mom_last_name',
+    'dad_phone', 'dad_email', 'mom_phone', 'mom_email',
+    'address', 'city', 'state', 'zip_code'
+]
+
+_COLUMN_LIST = ', '.join(SEARCH_COLUMNS)
+_NEW_VALUES = ', '.join(f'new.{column}' for column in SEARCH_COLUMNS)
+_OLD_VALUES = ', '.join(f'old.{column}' for column in SEARCH_COLUMNS)
+
+SQLITE_SEARCH_DDL = [
+    f"""CREATE VIRTUAL TABLE IF NOT EXISTS player_search USING fts5(
+        {_COLUMN_LIST},
+        content='player', content_rowid='id',
+        tokenize='unicode61 remove_diacritics 2', prefix='2 3'
+    )""",
+    f"""CREATE TRIGGER IF NOT EXISTS player_search_ai AFTER INSERT ON player BEGIN
+        INSERT INTO player_search(rowid, {_COLUMN_LIST}) VALUES (new.id, {_NEW_VALUES});
+    END""",
+    f"""CREATE TRIGGER IF NOT EXISTS player_search_ad AFTER DELETE ON player BEGIN
+        INSERT INTO player_search(player_search, rowid, {_COLUMN_LIST}) VALUES ('delete', old.id, {_OLD_VALUES});
+    END""",
+    f"""CREATE TRIGGER IF NOT EXISTS player_search_au AFTER UPDATE ON player BEGIN
+        INSERT INTO player_search(player_search, rowid, {_COLUMN_LIST}) VALUES ('delete', old.id, {_OLD_VALUES});
+        INSERT INTO player_search(rowid, {_COLUMN_LIST}) VALUES (new.id, {_NEW_VALUES});
+    END"""
+]
+
+_TSVECTOR_SOURCE = " || ' ' || ".join(f"coalesce({column}, '')" for column in SEARCH_COLUMNS)
+
+POSTGRES_SEARCH_DDL = [
+    f"""ALTER TABLE player ADD COLUMN IF NOT EXISTS search_vector tsvector
+        GENERATED ALWAYS AS (to_tsvector('simple'::regconfig, {_TSVECTOR_SOURCE})) STORED""",
+    "CREATE INDEX IF NOT EXISTS ix_player_search_vector ON player USING gin (search_vector)"
+]
+
+
+# revision identifiers, used by Alembic.
+revision = 'b7e2c94a1d03'
+down_revision = '3f9c1d7e2a4b'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    bind = op.get_bind()
+    if bind.dialect.name == 'sqlite':
+        existing = bind.execute(sa.text(
+            "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'player_search'"
+        )).first()
+        for statement in SQLITE_SEARCH_DDL:
+            op.execute(statement)
+        if existing is None:
+            op.execute("INSERT INTO player_search(player_search) VALUES ('rebuild')")
+    elif bind.dialect.name == 'postgresql':
+        for statement in POSTGRES_SEARCH_DDL:
+            op.execute(statement)
+
+
+def downgrade():
+    bind = op.get_bind()
+    if bind.dialect.name == 'sqlite':
+        op.execute("DROP TRIGGER IF EXISTS player_search_ai")
+        op.execute("DROP TRIGGER IF EXISTS player_search_ad")
+        op.execute("DROP TRIGGER IF EXISTS player_search_au")
+        op.execute("DROP TABLE IF EXISTS player_search")
+    elif bind.dialect.name == 'postgresql':
+        op.execute("DROP INDEX IF EXISTS ix_player_search_vector")
+        op.execute("ALTER TABLE player DROP COLUMN IF EXISTS search_vector")
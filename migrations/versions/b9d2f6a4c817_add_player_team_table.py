@@ -0,0 +1,96 @@
+"""move player extra_teams JSON into a player_team table
+
+Revision ID: b9d2f6a4c817
+Revises: a3c7e5f09d12
+Create Date: 2026-10-17 16:48:05.712934
+
+"""
+import json
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy import inspect
+
+
+# revision identifiers, used by Alembic.
+revision = 'b9d2f6a4c817'
+down_revision = 'a3c7e5f09d12'
+branch_labels = None
+depends_on = None
+
+
+player_team = sa.table('player_team', sa.column('player_id', sa.Integer), sa.column('team_name', sa.String))
+
+
+def parse_extra_teams(value):
+    try:
+        teams = json.loads(value) if value else []
+    except ValueError:
+        return []
+    if not isinstance(teams, list):
+        return []
+    return [str(team).strip()[:50] for team in teams if team and str(team).strip()]
+
+
+def upgrade():
+    bind = op.get_bind()
+    inspector = inspect(bind)
+    tables = inspector.get_table_names()
+    columns = [column['name'] for column in inspector.get_columns('player')]
+
+    if 'player_team' not in tables:
+        op.create_table(
+            'player_team',
+            sa.Column('player_id', sa.Integer(), sa.ForeignKey('player.id', ondelete='CASCADE'), nullable=False),
+            sa.Column('team_name', sa.String(length=50), nullable=False),
+            sa.PrimaryKeyConstraint('player_id', 'team_name')
+        )
+        op.create_index('ix_player_team_team_player', 'player_team', ['team_name', 'player_id'])
+
+    if 'extra_teams' in columns:
+        # Backfill one row per additional team; the primary team is not repeated
+        player = sa.table('player', sa.column('id', sa.Integer), sa.column('team', sa.String),
+                          sa.column('extra_teams', sa.Text))
+        existing = set(bind.execute(sa.select(player_team.c.player_id, player_team.c.team_name)).all())
+        rows = []
+        for player_id, team, extra_teams in bind.execute(
+                sa.select(player.c.id, player.c.team, player.c.extra_teams).where(player.c.extra_teams.isnot(None))):
+            for team_name in parse_extra_teams(extra_teams):
+                if team_name != team and (player_id, team_name) not in existing:
+                    existing.add((player_id, team_name))
+                    rows.append({'player_id': player_id, 'team_name': team_name})
+        if rows:
+            bind.execute(player_team.insert(), rows)
+
+        # Plain ALTER TABLE (SQLite >= 3.35 supports DROP COLUMN); batch mode would
+        # rebuild player and lose its expression index and search triggers
+        op.drop_column('player', 'extra_teams')
+
+
+def downgrade():
+    bind = op.get_bind()
+    inspector = inspect(bind)
+    tables = inspector.get_table_names()
+    columns = [column['name'] for column in inspector.get_columns('player')]
+
+    if 'extra_teams' not in columns:
+        with op.batch_alter_table('player') as batch_op:
+            batch_op.add_column(sa.Column('extra_teams', sa.Text(), nullable=True))
+
+    if 'player_team' in tables:
+        teams_by_player = {}
+        for player_id, team_name in bind.execute(
+                sa.select(player_team.c.player_id, player_team.c.team_name)
+                .order_by(player_team.c.player_id, player_team.c.team_name)):
+            teams_by_player.setdefault(player_id, []).append(team_name)
+        if teams_by_player:
+            player = sa.table('player', sa.column('id', sa.Integer), sa.column('extra_teams', sa.Text))
+            bind.execute(
+                player.update().where(player.c.id == sa.bindparam('player_id'))
+                .values(extra_teams=sa.bindparam('teams')),
+                [{'player_id': player_id, 'teams': json.dumps(teams)}
+                 for player_id, teams in teams_by_player.items()]
+            )
+
+        op.drop_index('ix_player_team_team_player', table_name='player_team')
+        op.drop_table('player_team')
@@ -0,0 +1,39 @@
+"""add roster order index to player
+
+Revision ID: c41a8f0e6b25
+Revises: b7e2c94a1d03
+Create Date: 2026-10-17 11:26:05.774312
+
+"""
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy import inspect
+
+
+# revision identifiers, used by Alembic.
+revision = 'c41a8f0e6b25'
+down_revision = 'b7e2c94a1d03'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    bind = op.get_bind()
+    inspector = inspect(bind)
+    indexes = [index['name'] for index in inspector.get_indexes('player')]
+
+    if 'ix_player_roster_order' not in indexes:
+        op.create_index(
+            'ix_player_roster_order',
+            'player',
+            [sa.text("coalesce(last_name, '')"), sa.text("coalesce(first_name, '')"), 'id']
+        )
+
+
+def downgrade():
+    bind = op.get_bind()
+    inspector = inspect(bind)
+    indexes = [index['name'] for index in inspector.get_indexes('player')]
+
+    if 'ix_player_roster_order' in indexes:
+        op.drop_index('ix_player_roster_order', table_name='player')
@@ -0,0 +1,79 @@
+"""add season to game with a (team_name, season, game_date) index
+
+Revision ID: c6e1a8b5d234
+Revises: b9d2f6a4c817
+Create Date: 2026-10-17 17:31:40.268519
+
+"""
+from datetime import datetime
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy import inspect
+
+
+# revision identifiers, used by Alembic.
+revision = 'c6e1a8b5d234'
+down_revision = 'b9d2f6a4c817'
+branch_labels = None
+depends_on = None
+
+
+def season_for_date(game_date):
+    # Mirrors Game.season_for_date at the time of this migration (seasons start in August)
+    if isinstance(game_date, str):
+        game_date = datetime.strptime(game_date[:10], '%Y-%m-%d').date()
+    start_year = game_date.year if game_date.month >= 8 else game_date.year - 1
+    return f"{start_year}-{(start_year + 1) % 100:02d}"
+
+
+def upgrade():
+    bind = op.get_bind()
+    inspector = inspect(bind)
+    columns = [column['name'] for column in inspector.get_columns('game')]
+    indexes = [index['name'] for index in inspector.get_indexes('game')]
+
+    if 'season' not in columns:
+        with op.batch_alter_table('game') as batch_op:
+            batch_op.add_column(sa.Column('season', sa.String(length=10), nullable=True))
+
+    # Backfill from game_date
+    game = sa.table('game', sa.column('id', sa.Integer), sa.column('game_date', sa.Date),
+                    sa.column('season', sa.String))
+    updates = [{'game_id': game_id, 'game_season': season_for_date(game_date)}
+               for game_id, game_date in bind.execute(
+                   sa.select(game.c.id, game.c.game_date).where(game.c.season.is_(None)))]
+    if updates:
+        bind.execute(
+            game.update().where(game.c.id == sa.bindparam('game_id')).values(season=sa.bindparam('game_season')),
+            updates
+        )
+
+    with op.batch_alter_table('game') as batch_op:
+        batch_op.alter_column('season', existing_type=sa.String(length=10), nullable=False)
+
+    if 'ix_game_season' not in indexes:
+        op.create_index('ix_game_season', 'game', ['season'])
+    if 'ix_game_team_season_date' not in indexes:
+        op.create_index('ix_game_team_season_date', 'game', ['team_name', 'season', 'game_date'])
+
+    # Stat rollups were keyed by the player's season; they are rebuilt per game season on next read
+    if 'player_team_season_stats' in inspector.get_table_names():
+        op.execute('DELETE FROM player_team_season_stats')
+
+
+def downgrade():
+    bind = op.get_bind()
+    inspector = inspect(bind)
+    columns = [column['name'] for column in inspector.get_columns('game')]
+    indexes = [index['name'] for index in inspector.get_indexes('game')]
+
+    if 'ix_game_team_season_date' in indexes:
+        op.drop_index('ix_game_team_season_date', table_name='game')
+    if 'ix_game_season' in indexes:
+        op.drop_index('ix_game_season', table_name='game')
+    if 'season' in columns:
+        with op.batch_alter_table('game') as batch_op:
+            batch_op.drop_column('season')
+    if 'player_team_season_stats' in inspector.get_table_names():
+        op.execute('DELETE FROM player_team_season_stats')
@@ -0,0 +1,51 @@
+"""add export_job table
+
+Revision ID: d58b3e7f9a16
+Revises: c41a8f0e6b25
+Create Date: 2026-10-17 13:08:47.201947
+
+"""
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy import inspect
+
+
+# revision identifiers, used by Alembic.
+revision = 'd58b3e7f9a16'
+down_revision = 'c41a8f0e6b25'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    bind = op.get_bind()
+    inspector = inspect(bind)
+    tables = inspector.get_table_names()
+
+    if 'export_job' not in tables:
+        op.create_table(
+            'export_job',
+            sa.Column('id', sa.Integer(), primary_key=True),
+            sa.Column('created_at', sa.DateTime(), nullable=False),
+            sa.Column('updated_at', sa.DateTime(), nullable=False),
+            sa.Column('completed_at', sa.DateTime(), nullable=True),
+            sa.Column('job_key', sa.String(length=64), nullable=False),
+            sa.Column('filters', sa.Text(), nullable=False),
+            sa.Column('status', sa.String(length=20), nullable=False),
+            sa.Column('error', sa.Text(), nullable=True),
+            sa.Column('file_path', sa.String(length=500), nullable=True),
+            sa.Column('file_size', sa.BigInteger(), nullable=True),
+            sa.Column('row_count', sa.Integer(), nullable=True),
+            sa.Column('user_id', sa.Integer(), sa.ForeignKey('user.id'), nullable=False)
+        )
+        op.create_index('ix_export_job_job_key', 'export_job', ['job_key'], unique=False)
+
+
+def downgrade():
+    bind = op.get_bind()
+    inspector = inspect(bind)
+    tables = inspector.get_table_names()
+
+    if 'export_job' in tables:
+        op.drop_index('ix_export_job_job_key', table_name='export_job')
+        op.drop_table('export_job')
@@ -0,0 +1,62 @@
+"""add team_season_standing cache table
+
+Revision ID: d7f3a9c2e614
+Revises: c6e1a8b5d234
+Create Date: 2026-10-17 18:12:05.931264
+
+"""
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy import inspect
+
+
+# revision identifiers, used by Alembic.
+revision = 'd7f3a9c2e614'
+down_revision = 'c6e1a8b5d234'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    bind = op.get_bind()
+    inspector = inspect(bind)
+    tables = inspector.get_table_names()
+
+    if 'team_season_standing' not in tables:
+        op.create_table(
+            'team_season_standing',
+            sa.Column('id', sa.Integer(), primary_key=True),
+            sa.Column('refreshed_at', sa.DateTime(), nullable=False),
+            sa.Column('team_name', sa.String(length=50), nullable=False),
+            sa.Column('season', sa.String(length=10), nullable=False),
+            sa.Column('home_rinks', sa.Text(), nullable=False),
+            sa.Column('games_played', sa.Integer(), nullable=False),
+            sa.Column('wins', sa.Integer(), nullable=False),
+            sa.Column('losses', sa.Integer(), nullable=False),
+            sa.Column('ties', sa.Integer(), nullable=False),
+            sa.Column('points', sa.Integer(), nullable=False),
+            sa.Column('goals_for', sa.Integer(), nullable=False),
+            sa.Column('goals_against', sa.Integer(), nullable=False),
+            sa.Column('goal_differential', sa.Integer(), nullable=False),
+            sa.Column('home_wins', sa.Integer(), nullable=False),
+            sa.Column('home_losses', sa.Integer(), nullable=False),
+            sa.Column('home_ties', sa.Integer(), nullable=False),
+            sa.Column('away_wins', sa.Integer(), nullable=False),
+            sa.Column('away_losses', sa.Integer(), nullable=False),
+            sa.Column('away_ties', sa.Integer(), nullable=False),
+            sa.Column('streak_result', sa.String(length=1), nullable=True),
+            sa.Column('streak_length', sa.Integer(), nullable=False),
+            sa.UniqueConstraint('team_name', 'season', name='uq_team_season_standing')
+        )
+        op.create_index('ix_team_season_standing_season', 'team_season_standing', ['season'])
+    # Rows are computed on the first standings view of each season
+
+
+def downgrade():
+    bind = op.get_bind()
+    inspector = inspect(bind)
+    tables = inspector.get_table_names()
+
+    if 'team_season_standing' in tables:
+        op.drop_index('ix_team_season_standing_season', table_name='team_season_standing')
+        op.drop_table('team_season_standing')
@@ -0,0 +1,73 @@
+"""add natural_key to player
+
+Revision ID: e6a9c3d18b47
+Revises: d58b3e7f9a16
+Create Date: 2026-10-17 14:02:31.468205
+
+"""
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy import inspect
+
+
+# revision identifiers, used by Alembic.
+revision = 'e6a9c3d18b47'
+down_revision = 'd58b3e7f9a16'
+branch_labels = None
+depends_on = None
+
+
+def build_natural_key(season, first_name, last_name, birth_year):
+    # Mirrors Player.build_natural_key at the time of this migration
+    parts = [season, first_name, last_name, birth_year]
+    return '|'.join(' '.join((part or '').split()).lower() for part in parts)
+
+
+def upgrade():
+    bind = op.get_bind()
+    inspector = inspect(bind)
+    columns = [column['name'] for column in inspector.get_columns('player')]
+    indexes = [index['name'] for index in inspector.get_indexes('player')]
+
+    if 'natural_key' not in columns:
+        with op.batch_alter_table('player') as batch_op:
+            batch_op.add_column(sa.Column('natural_key', sa.String(length=140), nullable=True))
+
+    # Backfill: the newest player keeps each key, older duplicates stay NULL
+    player = sa.table('player',
+                      sa.column('id', sa.Integer), sa.column('season', sa.String),
+                      sa.column('first_name', sa.String), sa.column('last_name', sa.String),
+                      sa.column('birth_year', sa.String), sa.column('natural_key', sa.String))
+    rows = bind.execute(
+        sa.select(player.c.id, player.c.season, player.c.first_name, player.c.last_name, player.c.birth_year)
+        .where(player.c.natural_key.is_(None))
+        .order_by(player.c.id.desc())
+    ).all()
+    taken = set(bind.execute(sa.select(player.c.natural_key).where(player.c.natural_key.isnot(None))).scalars())
+    updates = []
+    for player_id, season, first_name, last_name, birth_year in rows:
+        key = build_natural_key(season, first_name, last_name, birth_year)
+        if key not in taken:
+            taken.add(key)
+            updates.append({'player_id': player_id, 'key': key})
+    if updates:
+        bind.execute(
+            player.update().where(player.c.id == sa.bindparam('player_id')).values(natural_key=sa.bindparam('key')),
+            updates
+        )
+
+    if 'ix_player_natural_key' not in indexes:
+        op.create_index('ix_player_natural_key', 'player', ['natural_key'], unique=True)
+
+
+def downgrade():
+    bind = op.get_bind()
+    inspector = inspect(bind)
+    columns = [column['name'] for column in inspector.get_columns('player')]
+    indexes = [index['name'] for index in inspector.get_indexes('player')]
+
+    if 'ix_player_natural_key' in indexes:
+        op.drop_index('ix_player_natural_key', table_name='player')
+    if 'natural_key' in columns:
+        with op.batch_alter_table('player') as batch_op:
+            batch_op.drop_column('natural_key')
@@ -0,0 +1,44 @@
+"""add player_analytics_snapshot cache table
+
+Revision ID: e9a4b7c3d508
+Revises: d7f3a9c2e614
+Create Date: 2026-10-17 19:04:51.270336
+
+"""
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy import inspect
+
+
+# revision identifiers, used by Alembic.
+revision = 'e9a4b7c3d508'
+down_revision = 'd7f3a9c2e614'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    bind = op.get_bind()
+    inspector = inspect(bind)
+    tables = inspector.get_table_names()
+
+    if 'player_analytics_snapshot' not in tables:
+        op.create_table(
+            'player_analytics_snapshot',
+            sa.Column('id', sa.Integer(), primary_key=True),
+            sa.Column('refreshed_at', sa.DateTime(), nullable=False),
+            sa.Column('season', sa.String(length=10), nullable=False),
+            sa.Column('payload', sa.Text(), nullable=False)
+        )
+        op.create_index('ix_player_analytics_snapshot_season', 'player_analytics_snapshot', ['season'], unique=True)
+    # Payloads are computed on the first analytics request of each season
+
+
+def downgrade():
+    bind = op.get_bind()
+    inspector = inspect(bind)
+    tables = inspector.get_table_names()
+
+    if 'player_analytics_snapshot' in tables:
+        op.drop_index('ix_player_analytics_snapshot_season', table_name='player_analytics_snapshot')
+        op.drop_table('player_analytics_snapshot')
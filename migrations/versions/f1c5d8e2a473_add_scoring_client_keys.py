@@ -0,0 +1,46 @@
+"""add client_key idempotency keys to game, goal and assist
+
+Revision ID: f1c5d8e2a473
+Revises: e9a4b7c3d508
+Create Date: 2026-10-17 20:21:37.604118
+
+"""
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy import inspect
+
+
+# revision identifiers, used by Alembic.
+revision = 'f1c5d8e2a473'
+down_revision = 'e9a4b7c3d508'
+branch_labels = None
+depends_on = None
+
+TABLES = ('game', 'goal', 'assist')
+
+
+def upgrade():
+    bind = op.get_bind()
+    inspector = inspect(bind)
+
+    for table in TABLES:
+        columns = [column['name'] for column in inspector.get_columns(table)]
+        indexes = [index['name'] for index in inspector.get_indexes(table)]
+        if 'client_key' not in columns:
+            # Plain ADD COLUMN; NULL keys (rows entered before this change) never collide
+            op.add_column(table, sa.Column('client_key', sa.String(length=64), nullable=True))
+        if f'ix_{table}_client_key' not in indexes:
+            op.create_index(f'ix_{table}_client_key', table, ['client_key'], unique=True)
+
+
+def downgrade():
+    bind = op.get_bind()
+    inspector = inspect(bind)
+
+    for table in TABLES:
+        columns = [column['name'] for column in inspector.get_columns(table)]
+        indexes = [index['name'] for index in inspector.get_indexes(table)]
+        if f'ix_{table}_client_key' in indexes:
+            op.drop_index(f'ix_{table}_client_key', table_name=table)
+        if 'client_key' in columns:
+            op.drop_column(table, 'client_key')
@@ -0,0 +1,35 @@
+"""add user/team/age group index to contact
+
+Revision ID: f2b8d4c61e39
+Revises: e6a9c3d18b47
+Create Date: 2026-10-17 15:11:52.093418
+
+"""
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy import inspect
+
+
+# revision identifiers, used by Alembic.
+revision = 'f2b8d4c61e39'
+down_revision = 'e6a9c3d18b47'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    bind = op.get_bind()
+    inspector = inspect(bind)
+    indexes = [index['name'] for index in inspector.get_indexes('contact')]
+
+    if 'ix_contact_user_team_age' not in indexes:
+        op.create_index('ix_contact_user_team_age', 'contact', ['user_id', 'team_name', 'age_group'], unique=False)
+
+
+def downgrade():
+    bind = op.get_bind()
+    inspector = inspect(bind)
+    indexes = [index['name'] for index in inspector.get_indexes('contact')]
+
+    if 'ix_contact_user_team_age' in indexes:
+        op.drop_index('ix_contact_user_team_age', table_name='contact')
@@ -0,0 +1,118 @@
+"""Shared fixtures: an app on in-memory SQLite and a logged-in test client."""
+
+import os
+import uuid
+from datetime import date, timedelta
+
+import pytest
+from sqlalchemy import create_engine, event, text
+
+from app import create_app, db, bcrypt
+from app.models import User, Team, Player, Game, Goal, PracticePlan
+
+
+@pytest.fixture
+def app(monkeypatch):
+    monkeypatch.setenv('DATABASE_URL', 'sqlite:///:memory:')
+    app = create_app()
+    app.config.update(TESTING=True, WTF_CSRF_ENABLED=False)
+    with app.app_context():
+        yield app
+        db.session.remove()
+        db.drop_all()
+
+
+# PostgreSQL-only code paths (COPY, tsvector migrations) run when DATABASE_URL
+# points at PostgreSQL; each test gets a throwaway schema in that database
+PG_DATABASE_URL = os.environ.get('DATABASE_URL', '').replace('postgres://', 'postgresql://', 1)
+
+
+@pytest.fixture
+def pg_app(monkeypatch):
+    if not PG_DATABASE_URL.startswith('postgresql'):
+        pytest.skip('set DATABASE_URL to a PostgreSQL database to run PostgreSQL tests')
+    schema = f'test_{uuid.uuid4().hex[:12]}'
+    engine = create_engine(PG_DATABASE_URL)
+    with engine.begin() as connection:
+        connection.execute(text(f'CREATE SCHEMA {schema}'))
+    separator = '&' if '?' in PG_DATABASE_URL else '?'
+    monkeypatch.setenv('DATABASE_URL', f'{PG_DATABASE_URL}{separator}options=-csearch_path%3D{schema}')
+    try:
+        app = create_app()
+        app.config.update(TESTING=True, WTF_CSRF_ENABLED=False)
+        with app.app_context():
+            yield app
+            db.session.remove()
+            db.engine.dispose()
+    finally:
+        with engine.begin() as connection:
+            connection.execute(text(f'DROP SCHEMA {schema} CASCADE'))
+        engine.dispose()
+
+
+@pytest.fixture
+def user(app):
+    user = User(username='coach', email='coach@example.com',
+                password=bcrypt.generate_password_hash('password').decode('utf-8'))
+    db.session.add(user)
+    db.session.commit()
+    return user
+
+
+@pytest.fixture
+def client(app, user):
+    client = app.test_client()
+    client.post('/login', data={'email': user.email, 'password': 'password'})
+    return client
+
+
+@pytest.fixture
+def count_queries(app):
+    """Return a function that runs a callable and returns the SQL statements it executed."""
+    def count(fn):
+        statements = []
+
+        def before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+            statements.append(statement)
+
+        event.listen(db.engine, 'before_cursor_execute', before_cursor_execute)
+        try:
+            fn()
+        finally:
+            event.remove(db.engine, 'before_cursor_execute', before_cursor_execute)
+        return statements
+    return count
+
+
+@pytest.fixture
+def seed_club(user):
+    """Return a function that adds teams with players, completed games (one goal each) and a practice."""
+    def seed(teams, players_per_team, games_per_team=6, first_team=0):
+        _seed_club(user, range(first_team, first_team + teams), players_per_team, games_per_team)
+    return seed
+
+
+def _seed_club(user, team_numbers, players_per_team, games_per_team):
+    today = date.today()
+    for t in team_numbers:
+        team_name = f'{8 + 2 * t}U'
+        team = Team(name=team_name, user_id=user.id)
+        db.session.add(team)
+        db.session.flush()
+        db.session.add(PracticePlan(title=f'{team_name} practice', date=today + timedelta(days=2),
+                                    primary_focus='Skating', team_id=team.id, user_id=user.id))
+
+        players = [Player(first_name=f'Player{p}', last_name=f'Team{t}', birth_year='2015', team=team_name,
+                          season='2024-25', paid=p % 2 == 0, paid_tuition=p % 2 == 0)
+                   for p in range(players_per_team)]
+        db.session.add_all(players)
+        db.session.flush()
+
+        for g in range(games_per_team):
+            game = Game(game_date=today - timedelta(days=g), opponent_team='Opponent', rink_name='Rink',
+                        team_name=team_name, badgers_score=g % 3, opponent_score=1, game_status='completed',
+                        user_id=user.id)
+            db.session.add(game)
+            db.session.flush()
+            db.session.add(Goal(game_id=game.id, scorer_id=players[g % len(players)].id, period=1))
+    db.session.commit()
@@ -0,0 +1,88 @@
+"""Set-based roster bulk actions."""
+
+import re
+
+import pytest
+
+from app import db
+from app.bulk_utils import bulk_delete_players
+from app.models import Player, Game, Goal, Assist
+
+
+@pytest.fixture
+def csrf_token(client):
+    html = client.get('/roster').get_data(as_text=True)
+    return re.search(r'name="csrf-token" content="([^"]+)"', html).group(1)
+
+
+def test_bulk_delete_keeps_players_with_goals_or_assists(client, seed_club):
+    # Player0 and Player1 scored the two games' goals; Player2 assisted one
+    seed_club(teams=1, players_per_team=4, games_per_team=2)
+    players = Player.query.order_by(Player.id).all()
+    goal = Goal.query.first()
+    db.session.add(Assist(game_id=goal.game_id, goal_id=goal.id, assister_id=players[2].id, period=1))
+    db.session.commit()
+
+    deleted, kept = bulk_delete_players([player.id for player in players])
+
+    assert deleted == 1
+    assert kept == ['Player0 Team0', 'Player1 Team0', 'Player2 Team0']
+    assert [player.first_name for player in Player.query.order_by(Player.id)] == ['Player0', 'Player1', 'Player2']
+    assert Goal.query.count() == 2 and Assist.query.count() == 1
+    assert all(goal.scorer is not None for goal in Goal.query)
+
+
+def test_bulk_delete_route_reports_kept_players(client, seed_club, csrf_token):
+    seed_club(teams=1, players_per_team=3, games_per_team=1)
+    ids = [player.id for player in Player.query.order_by(Player.id)]
+
+    response = client.post('/bulk-action', data={'csrf_token': csrf_token, 'action': 'delete',
+                                                 'player_ids': ids}, follow_redirects=True)
+
+    html = response.get_data(as_text=True)
+    assert 'Deleted 2 players.' in html
+    assert 'Kept 1 players with goals or assists on a scoresheet: Player0 Team0.' in html
+    assert Player.query.count() == 1 and Game.query.count() == 1
+
+
+def filter_action(client, csrf_token, action, expected_count, **filters):
+    data = {'csrf_token': csrf_token, 'action': action, 'scope': 'filter', 'expected_count': expected_count}
+    return client.post('/bulk-action', data={**data, **filters}, follow_redirects=True)
+
+
+def paid_by_player():
+    return {(player.team, player.first_name): player.paid_tuition for player in Player.query}
+
+
+def test_filter_scoped_paid_update_only_touches_matching_players(client, seed_club, csrf_token):
+    seed_club(teams=2, players_per_team=4, games_per_team=0)
+    before = paid_by_player()
+    preview = client.get('/api/roster/bulk-preview?team=8U&paid=false').get_json()
+    assert preview['count'] == 2
+
+    response = filter_action(client, csrf_token, 'mark_paid', preview['count'], team='8U', paid='false')
+
+    assert 'Marked 2 players as paid.' in response.get_data(as_text=True)
+    changed = {key for key, paid in paid_by_player().items() if paid != before[key]}
+    assert changed == {('8U', 'Player1'), ('8U', 'Player3')}
+
+
+def test_filter_scoped_delete_only_removes_matching_players(client, seed_club, csrf_token):
+    seed_club(teams=2, players_per_team=4, games_per_team=0)
+
+    response = filter_action(client, csrf_token, 'delete', 4, team='10U')
+
+    assert 'Deleted 4 players.' in response.get_data(as_text=True)
+    assert {player.team for player in Player.query} == {'8U'}
+    assert Player.query.count() == 4
+
+
+@pytest.mark.parametrize('action', ['mark_paid', 'delete'])
+def test_filter_action_rejects_a_changed_match_count(client, seed_club, csrf_token, action):
+    seed_club(teams=2, players_per_team=4, games_per_team=0)
+    before = paid_by_player()
+
+    response = filter_action(client, csrf_token, action, 3, team='8U')
+
+    assert 'The players matching these filters have changed.' in response.get_data(as_text=True)
+    assert paid_by_player() == before
@@ -0,0 +1,67 @@
+"""Chunked contacts CSV import with dedupe."""
+
+from io import BytesIO
+
+from app.contact_import_utils import import_contacts
+from app.models import Contact, ContactPerson
+
+HEADER = 'team_name,age_group,division,color,coach_full_name,coach_email,person1_role,person1_full_name,person1_email\n'
+
+
+def import_csv(user, *rows, chunk_size=500):
+    return import_contacts(BytesIO((HEADER + ''.join(f'{row}\n' for row in rows)).encode('utf-8')),
+                           user.id, chunk_size=chunk_size)
+
+
+def people(contact):
+    return sorted((person.role, person.full_name, person.email)
+                  for person in ContactPerson.query.filter_by(contact_id=contact.id))
+
+
+def test_reimport_updates_contacts_instead_of_adding_them(user):
+    first = import_csv(user, 'Sharks,10U,A,Teal,Ann Coach,ann@example.com,,,',
+                       'Rangers,12U,B,Blue,Bob Coach,bob@example.com,,,')
+    second = import_csv(user, 'Sharks,10U,AA,Teal,Ann Coach,ann@example.com,,,',
+                        'Rangers,12U,B,Blue,Bob Coach,bob@example.com,,,')
+
+    assert (first['inserted'], first['updated']) == (2, 0)
+    assert (second['inserted'], second['updated']) == (0, 2)
+    assert Contact.query.count() == 2
+    assert Contact.query.filter_by(team_name='Sharks').one().division == 'AA'
+
+
+def test_blank_cells_keep_stored_values(user):
+    import_csv(user, 'Sharks,10U,A,Teal,Ann Coach,ann@example.com,,,')
+    import_csv(user, 'Sharks,10U,,Black,,,,,')
+
+    contact = Contact.query.one()
+    assert (contact.division, contact.color, contact.coach_full_name, contact.coach_email) == \
+        ('A', 'Black', 'Ann Coach', 'ann@example.com')
+
+
+def test_repeated_person_is_not_added_twice(user):
+    import_csv(user, 'Sharks,10U,A,Teal,,,manager,Max Manager,max@example.com')
+    stats = import_csv(user, 'Sharks,10U,A,Teal,,,manager,max manager,max@example.com')
+
+    assert stats['people'] == 0
+    assert people(Contact.query.one()) == [('manager', 'Max Manager', 'max@example.com')]
+
+
+def test_rows_repeated_within_a_chunk_are_merged(user):
+    stats = import_csv(user, 'Sharks,10U,A,,Ann Coach,,manager,Max Manager,',
+                       'Sharks,10U,,Teal,,ann@example.com,other,Sam Scorekeeper,',
+                       'Sharks,10U,,,,,manager,Max Manager,')
+
+    assert (stats['inserted'], stats['updated'], stats['people'], stats['chunks']) == (1, 0, 2, 1)
+    contact = Contact.query.one()
+    assert (contact.division, contact.color, contact.coach_full_name, contact.coach_email) == \
+        ('A', 'Teal', 'Ann Coach', 'ann@example.com')
+    assert people(contact) == [('manager', 'Max Manager', None), ('other', 'Sam Scorekeeper', None)]
+
+
+def test_rows_split_across_chunks_still_update_one_contact(user):
+    stats = import_csv(user, 'Sharks,10U,A,,,,,,', 'Sharks,10U,,Teal,,,,,', chunk_size=1)
+
+    assert (stats['inserted'], stats['updated'], stats['chunks']) == (1, 1, 2)
+    contact = Contact.query.one()
+    assert (contact.division, contact.color) == ('A', 'Teal')
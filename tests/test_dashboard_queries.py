@@ -0,0 +1,27 @@
+"""The dashboard builds every team card in a constant number of queries."""
+
+
+def dashboard_queries(client, count_queries):
+    # The first hit may compute missing snapshot rows; pin the steady state too
+    first = count_queries(lambda: client.get('/dashboard'))
+    second = count_queries(lambda: client.get('/dashboard'))
+    return len(first), len(second)
+
+
+def test_dashboard_query_count_does_not_grow_with_teams(app, client, count_queries, seed_club):
+    seed_club(teams=2, players_per_team=5)
+    small = dashboard_queries(client, count_queries)
+
+    seed_club(teams=10, players_per_team=5, first_team=2)
+    large = dashboard_queries(client, count_queries)
+
+    assert large == small
+
+
+def test_dashboard_renders_team_cards(client, seed_club):
+    seed_club(teams=3, players_per_team=4)
+    response = client.get('/dashboard')
+
+    assert response.status_code == 200
+    for team_name in ('8U', '10U', '12U'):
+        assert team_name.encode() in response.data
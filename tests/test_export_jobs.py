@@ -0,0 +1,60 @@
+"""Background roster exports and their cached files."""
+
+import pytest
+
+from app import db
+from app import export_jobs
+from app.models import ExportJob, Player
+
+
+class InlineExecutor:
+    """Runs export jobs as soon as they are submitted."""
+
+    def submit(self, fn, *args):
+        fn(*args)
+
+
+@pytest.fixture
+def exports(app, monkeypatch, tmp_path):
+    monkeypatch.setattr(app, 'instance_path', str(tmp_path))
+    monkeypatch.setattr(export_jobs, '_get_executor', InlineExecutor)
+
+
+def request_export(client, **filters):
+    """Queue an export and return its status once the job has run."""
+    job = client.post('/roster/export/jobs', data=filters).get_json()
+    return client.get(job['status_url']).get_json()
+
+
+def test_same_filters_reuse_the_finished_file(client, seed_club, exports):
+    seed_club(teams=2, players_per_team=3)
+
+    first = request_export(client, team='8U', search='player')
+    second = request_export(client, team='8U', search='  PLAYER ')
+
+    assert first['status'] == 'completed' and first['row_count'] == 3
+    assert second['job_id'] == first['job_id']
+    assert ExportJob.query.count() == 1
+    download = client.get(second['download_url'])
+    assert download.status_code == 200
+    assert download.get_data(as_text=True).count('Team0') == 3
+    download.close()
+
+
+def test_player_write_marks_every_export_stale(client, seed_club, exports):
+    seed_club(teams=2, players_per_team=3)
+    jobs = [request_export(client, team='8U'), request_export(client, team='10U')]
+
+    player = Player.query.first()
+    player.city = 'Bayonne'
+    db.session.commit()
+
+    for job in jobs:
+        status = client.get(job['status_url']).get_json()
+        assert status['status'] == 'stale' and status['download_url'] is None
+    # Polling does not queue anything; the client asks for a new export instead
+    assert ExportJob.query.count() == 2
+
+    fresh = request_export(client, team='8U')
+    assert fresh['job_id'] not in [job['job_id'] for job in jobs]
+    assert fresh['status'] == 'completed'
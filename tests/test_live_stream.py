@@ -0,0 +1,34 @@
+"""Live score streams and the polling fallback."""
+
+from app.live_utils import subscribe, unsubscribe, open_stream_count
+from app.models import Game, Goal
+
+
+def test_stream_refused_when_process_is_at_limit(app, client, seed_club):
+    seed_club(teams=1, players_per_team=2, games_per_team=1)
+    game = Game.query.first()
+    app.config['LIVE_STREAM_LIMIT'] = 2
+    viewers = [subscribe(game.id, 2), subscribe(game.id, 2)]
+    try:
+        assert subscribe(game.id, 2) is None
+        assert open_stream_count() == 2
+
+        response = client.get(f'/game-tracker/{game.id}/stream')
+        assert response.status_code == 503
+        assert response.get_json()['success'] is False
+    finally:
+        for viewer in viewers:
+            unsubscribe(viewer)
+    assert open_stream_count() == 0
+
+
+def test_live_snapshot_for_polling_viewers(client, seed_club):
+    seed_club(teams=1, players_per_team=2, games_per_team=1)
+    game = Game.query.first()
+
+    data = client.get(f'/game-tracker/{game.id}/live').get_json()
+    assert data['game_id'] == game.id
+    assert data['badgers_score'] == game.badgers_score
+    assert data['goal_ids'] == [goal.id for goal in Goal.query.filter_by(game_id=game.id).order_by(Goal.id)]
+
+    assert client.get('/game-tracker/999999/live').status_code == 404
@@ -0,0 +1,82 @@
+"""PostgreSQL COPY imports and exports match the generic SQLAlchemy path.
+
+These tests need DATABASE_URL to point at a PostgreSQL database (see the
+pg_app fixture) and are skipped otherwise.
+"""
+
+import csv
+import io
+
+from app import db
+from app.bulk_utils import bulk_delete_players
+from app.export_utils import write_roster_csv
+from app.import_utils import import_players
+from app.models import Player
+from app.pg_copy_utils import copy_supported
+from app.roster_utils import get_roster_filters
+
+PLAYERS_CSV = (
+    'season,first_name,last_name,birth_year,team,position,jersey_number,dad_first_name,dad_last_name,'
+    'dad_email,mom_phone,address,city,paid_tuition,total_tuition_amount,amount_paid,signed_waiver\n'
+    '2024-25,Sam,Kowalski,2015,8U,Forward,17,Jan,Kowalski,jan@example.com,,"1 Main St, Apt 2",Bayonne,yes,1200,450.5,yes\n'
+    "2024-25,Liam,O'Brien,2015,8U,,,,,,555-0100,,,no,,,\n"
+    '2024-25,Zoë,Nowak,2013,10U,Goalie,1,Piotr,Nowak,,,"He said ""hi""",Jersey City,yes,1500.25,1500.25,no\n'
+)
+UPSERT_CSV = (
+    'season,first_name,last_name,birth_year,team,address,paid_tuition\n'
+    '2024-25,Sam,Kowalski,2015,8U,2 Broadway,no\n'
+    '2024-25,Ava,Lee,2014,10U,,yes\n'
+)
+
+# Columns compared between the two paths (ids and timestamps always differ)
+COMPARED_COLUMNS = [column for column in Player.__table__.c if column.name not in ('id', 'created_at', 'updated_at')]
+
+
+def use_copy(app, enabled):
+    app.config['PG_COPY_ENABLED'] = enabled
+    assert copy_supported() is enabled
+
+
+def run_import(csv_text, upsert=False):
+    stats = import_players(io.BytesIO(csv_text.encode('utf-8')), upsert=upsert)
+    return {key: stats[key] for key in ('inserted', 'updated', 'unchanged', 'error_count')}
+
+
+def stored_players():
+    return [tuple(row) for row in db.session.execute(
+        db.select(*COMPARED_COLUMNS).order_by(Player.natural_key)).all()]
+
+
+def import_with(app, copy):
+    bulk_delete_players(db.select(Player.id))
+    use_copy(app, copy)
+    stats = [run_import(PLAYERS_CSV), run_import(PLAYERS_CSV), run_import(UPSERT_CSV, upsert=True)]
+    return stats, stored_players()
+
+
+def test_copy_import_matches_generic_import(pg_app):
+    generic_stats, generic_players = import_with(pg_app, copy=False)
+    copy_stats, copy_players = import_with(pg_app, copy=True)
+
+    assert generic_stats[0]['inserted'] == 3 and generic_stats[1]['unchanged'] == 3
+    assert copy_stats == generic_stats
+    assert copy_players == generic_players
+
+
+def export_rows(app, copy, filters):
+    use_copy(app, copy)
+    output = io.StringIO(newline='')
+    row_count = write_roster_csv(get_roster_filters(filters), output)
+    return row_count, list(csv.reader(io.StringIO(output.getvalue(), newline='')))
+
+
+def test_copy_export_matches_generic_export(pg_app):
+    use_copy(pg_app, False)
+    run_import(PLAYERS_CSV)
+
+    # The filtered export binds a quoted search term into the COPY statement
+    for filters in ({}, {'team': '8U', 'search': "o'brien"}, {'paid': 'true'}):
+        generic = export_rows(pg_app, False, filters)
+        assert export_rows(pg_app, True, filters) == generic
+        assert generic[0] == len(generic[1]) - 1
+    assert export_rows(pg_app, True, {'team': '8U', 'search': "o'brien"})[0] == 1
@@ -0,0 +1,122 @@
+"""Advanced player metrics and their cached snapshots."""
+
+from datetime import date, timedelta
+
+import app.routes
+from app import db
+from app.analytics_utils import get_player_analytics
+from app.models import Player, Game, Goal, Assist, PlayerAnalyticsSnapshot
+
+SEASON = '2024-25'
+SEASON_START = date(2024, 10, 1)
+
+
+def add_player(first_name, team='8U'):
+    player = Player(first_name=first_name, last_name='Skater', birth_year='2015', team=team, season=SEASON)
+    db.session.add(player)
+    db.session.commit()
+    return player
+
+
+def add_game(user, day, team='8U', status='completed', game_date=None):
+    game = Game(game_date=game_date or SEASON_START + timedelta(days=day), opponent_team='Opponent',
+                rink_name='Rink', team_name=team, badgers_score=0, opponent_score=0, game_status=status,
+                user_id=user.id)
+    db.session.add(game)
+    db.session.commit()
+    return game
+
+
+def add_goal(game, scorer, period=1, goal_type='even_strength', assister=None):
+    goal = Goal(game_id=game.id, scorer_id=scorer.id, period=period, goal_type=goal_type)
+    db.session.add(goal)
+    db.session.flush()
+    if assister is not None:
+        db.session.add(Assist(game_id=game.id, goal_id=goal.id, assister_id=assister.id, period=period))
+    db.session.commit()
+    return goal
+
+
+def entry(analytics, player):
+    return next(item for item in analytics['players'] if item['player_id'] == player.id)
+
+
+def test_rolling_points_average_the_last_five_games(user):
+    scorer = add_player('Sam')
+    helper = add_player('Alex')
+    points = [1, 0, 2, 1, 0, 3, 1]
+    for day, count in enumerate(points):
+        game = add_game(user, day)
+        for _ in range(count):
+            add_goal(game, scorer, assister=helper)
+    # Not completed yet, so never part of the series
+    add_goal(add_game(user, len(points), status='scheduled'), scorer)
+
+    analytics = get_player_analytics(SEASON)
+
+    sam = entry(analytics, scorer)
+    expected = [round(sum(points[max(0, i - 4):i + 1]) / len(points[max(0, i - 4):i + 1]), 2)
+                for i in range(len(points))]
+    assert [game['points'] for game in sam['rolling_points']] == points
+    assert [game['rolling_points'] for game in sam['rolling_points']] == expected
+    assert sam['rolling_points_avg'] == expected[-1] == 1.4
+    assert (sam['games_played'], sam['goals'], sam['points'], sam['points_per_game']) == (7, 8, 8, 1.14)
+    alex = entry(analytics, helper)
+    assert (alex['goals'], alex['assists'], alex['points']) == (0, 8, 8)
+    # Same points and rolling average, so the two are listed by name
+    assert [item['player_id'] for item in analytics['players']] == [helper.id, scorer.id]
+
+
+def test_period_and_goal_type_shares(user):
+    scorer = add_player('Sam')
+    game = add_game(user, 0)
+    add_goal(game, scorer, period=1, goal_type='power_play')
+    add_goal(game, scorer, period=1)
+    add_goal(game, scorer, period=3)
+    add_goal(game, scorer, period=4, goal_type=None)
+
+    sam = entry(get_player_analytics(SEASON), scorer)
+
+    assert sam['periods'] == {'1': {'goals': 2, 'share': 0.5}, '3': {'goals': 1, 'share': 0.25},
+                              'OT': {'goals': 1, 'share': 0.25}}
+    assert sam['goal_types'] == {'even_strength': {'goals': 2, 'share': 0.5},
+                                 'power_play': {'goals': 1, 'share': 0.25},
+                                 'unspecified': {'goals': 1, 'share': 0.25}}
+
+
+def test_goal_changes_drop_only_their_season_snapshot(user):
+    scorer = add_player('Sam')
+    game = add_game(user, 0)
+    last_season_game = add_game(user, 0, game_date=date(2023, 10, 1))
+    add_goal(game, scorer)
+    get_player_analytics(SEASON)
+    get_player_analytics('2023-24')
+    assert PlayerAnalyticsSnapshot.query.count() == 2
+
+    goal = add_goal(game, scorer, period=2)
+    assert [snapshot.season for snapshot in PlayerAnalyticsSnapshot.query] == ['2023-24']
+    assert entry(get_player_analytics(SEASON), scorer)['goals'] == 2
+
+    goal.period = 4
+    db.session.commit()
+    assert entry(get_player_analytics(SEASON), scorer)['periods']['OT'] == {'goals': 1, 'share': 0.5}
+
+    db.session.delete(goal)
+    db.session.commit()
+    assert entry(get_player_analytics(SEASON), scorer)['goals'] == 1
+
+    # Scores and notes are not part of the metrics, so the snapshots stay
+    last_season_game.notes = 'Rematch'
+    db.session.commit()
+    assert PlayerAnalyticsSnapshot.query.count() == 2
+
+
+def test_analytics_api_error_is_a_server_error(client, monkeypatch):
+    def fail(*args, **kwargs):
+        raise RuntimeError('database unavailable')
+    monkeypatch.setattr(app.routes, 'get_player_analytics', fail)
+
+    response = client.get(f'/api/statistics/analytics?season={SEASON}')
+
+    assert response.status_code == 500
+    assert response.get_json() == {'success': False, 'error': 'database unavailable'}
@@ -0,0 +1,61 @@
+"""Bulk player import and the natural-key uniqueness of players."""
+
+import io
+
+from app import db
+from app.models import Player
+from app.import_utils import import_players
+
+
+def run_import(csv_text, upsert=False):
+    return import_players(io.BytesIO(csv_text.encode('utf-8')), upsert=upsert)
+
+
+FULL_CSV = (
+    'season,first_name,last_name,birth_year,team,jersey_number,dad_email,paid_tuition,total_tuition_amount,address\n'
+    '2024-25,Sam,Kowalski,2015,8U,17,dad@example.com,yes,1200,1 Main St\n'
+)
+
+
+def test_upsert_leaves_columns_missing_from_the_csv_alone(app):
+    run_import(FULL_CSV)
+
+    stats = run_import('season,first_name,last_name,birth_year,team,address\n'
+                       '2024-25,Sam,Kowalski,2015,8U,2 Broadway\n', upsert=True)
+
+    player = Player.query.one()
+    assert stats['updated'] == 1
+    assert player.address == '2 Broadway'
+    assert (player.jersey_number, player.dad_email) == ('17', 'dad@example.com')
+    assert (player.paid_tuition, player.paid, player.total_tuition_amount) == (True, True, 1200.0)
+
+
+def test_reimport_without_upsert_skips_existing_players(app):
+    run_import(FULL_CSV)
+    stats = run_import(FULL_CSV)
+
+    assert (stats['inserted'], stats['unchanged']) == (0, 1)
+    assert Player.query.count() == 1
+
+
+def test_adding_a_duplicate_player_shows_a_clear_message(client):
+    data = {'season': '2024-25', 'first_name': 'Sam', 'last_name': 'Kowalski', 'birth_year': '2015'}
+    client.post('/player/add', data=data)
+
+    response = client.post('/player/add', data=data, follow_redirects=True)
+
+    assert b'is already on the 2024-25 roster' in response.data
+    assert Player.query.count() == 1
+
+
+def test_renaming_a_player_onto_another_shows_a_clear_message(client):
+    for first_name in ('Sam', 'Alex'):
+        client.post('/player/add', data={'season': '2024-25', 'first_name': first_name,
+                                         'last_name': 'Kowalski', 'birth_year': '2015'})
+    alex = Player.query.filter_by(first_name='Alex').one()
+
+    response = client.post(f'/player/{alex.id}/edit', data={'season': '2024-25', 'first_name': 'Sam',
+                                                             'last_name': 'Kowalski', 'birth_year': '2015'})
+
+    assert b'Another Sam Kowalski is already on the 2024-25 roster' in response.data
+    assert db.session.get(Player, alex.id).first_name == 'Alex'
@@ -0,0 +1,74 @@
+"""Roster full-text search."""
+
+import importlib.util
+import os
+
+from alembic.migration import MigrationContext
+from alembic.operations import Operations
+
+from app import db
+from app.models import Player
+from app.search_utils import apply_player_search, init_search_index
+
+
+def add_player(**fields):
+    player = Player(season='2024-25', birth_year='2015', team='8U', **fields)
+    db.session.add(player)
+    db.session.commit()
+    return player
+
+
+def search(text):
+    return [player.id for player in apply_player_search(Player.query, text).all()]
+
+
+def test_search_matches_prefix_of_email_local_part(app):
+    player = add_player(first_name='Sam', last_name='Kowalski', dad_email='jane.doe@example.com')
+    add_player(first_name='Alex', last_name='Smith', dad_email='other@example.com')
+
+    assert app.config['PLAYER_SEARCH_BACKEND'] == 'fts5'
+    assert search('jan') == [player.id]
+    assert search('jane.doe') == [player.id]
+
+
+def test_startup_keeps_an_existing_search_index(app):
+    player = add_player(first_name='Sam', last_name='Kowalski')
+
+    assert init_search_index(app) == 'fts5'
+    assert search('kowal') == [player.id]
+
+
+def run_migration(revision_file, direction):
+    """Run one migration's upgrade() or downgrade() on the app's database."""
+    path = os.path.join(os.path.dirname(__file__), '..', 'migrations', 'versions', revision_file)
+    spec = importlib.util.spec_from_file_location(revision_file[:-3], path)
+    migration = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(migration)
+    # On the session's connection, so the session never holds locks the DDL waits for
+    with Operations.context(MigrationContext.configure(db.session.connection())):
+        getattr(migration, direction)()
+    db.session.commit()
+
+
+def tsvector_search(text):
+    return db.session.execute(
+        db.select(Player.id).where(db.text("search_vector @@ to_tsquery('simple', :text)")),
+        {'text': text}
+    ).scalars().all()
+
+
+def test_email_local_part_migration_on_postgres(pg_app):
+    player_id = add_player(first_name='Sam', last_name='Kowalski', dad_email='jane.doe@example.com').id
+
+    run_migration('b7e2c94a1d03_add_player_search_index.py', 'upgrade')
+    assert tsvector_search('kowalski') == [player_id]
+    assert tsvector_search('jane') == []
+
+    run_migration('a3d8e6f1b295_index_email_local_parts_in_player_search.py', 'upgrade')
+    assert tsvector_search('jane') == [player_id]
+    assert init_search_index(pg_app) == 'tsvector'
+    assert search('jan') == [player_id]
+
+    run_migration('a3d8e6f1b295_index_email_local_parts_in_player_search.py', 'downgrade')
+    assert tsvector_search('kowalski') == [player_id]
+    assert tsvector_search('jane') == []
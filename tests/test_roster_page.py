@@ -0,0 +1,25 @@
+"""Keyset-paginated roster pages for infinite scrolling."""
+
+import app.routes
+
+
+def test_roster_pages_cover_every_player_once(client, seed_club):
+    seed_club(teams=1, players_per_team=60)
+
+    pages = [client.get('/api/roster/page?cursor=').get_json()]
+    while pages[-1]['has_more']:
+        pages.append(client.get(f"/api/roster/page?cursor={pages[-1]['next_cursor']}").get_json())
+
+    assert len(pages) == 2
+    assert sum(page['rows_html'].count('<tr') for page in pages) == 60
+
+
+def test_roster_page_error_is_a_server_error(client, monkeypatch):
+    def fail(*args, **kwargs):
+        raise RuntimeError('database unavailable')
+    monkeypatch.setattr(app.routes, 'get_roster_page', fail)
+
+    response = client.get('/api/roster/page')
+
+    assert response.status_code == 500
+    assert response.get_json() == {'success': False, 'error': 'database unavailable'}
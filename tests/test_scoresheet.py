@@ -0,0 +1,146 @@
+"""Game scoresheet submission and edits."""
+
+import json
+import re
+
+from app import db
+from app.models import Player, Game, Goal, Assist
+
+
+def game_form(team='8U', notes='', **scoresheet):
+    return {
+        'game_date': '2025-01-05', 'opponent_team': 'Opponent', 'rink_name': 'Rink', 'team_name': team,
+        'badgers_score': '2', 'opponent_score': '1', 'game_status': 'completed', 'notes': notes,
+        'scoresheet': json.dumps({'goals': scoresheet.get('goals', []), 'assists': scoresheet.get('assists', [])})
+    }
+
+
+def roster(team='8U'):
+    return [player.id for player in Player.query.filter_by(team=team).order_by(Player.id)]
+
+
+def add_game(client, **scoresheet):
+    response = client.post('/game-tracker/add', data=game_form(**scoresheet))
+    return int(response.headers['Location'].rsplit('/', 1)[1])
+
+
+def stored_assists(game_id):
+    return sorted((assist.goal_id, assist.assister_id) for assist in Assist.query.filter_by(game_id=game_id))
+
+
+def test_nested_assists_are_linked_to_their_goal(client, seed_club):
+    seed_club(teams=1, players_per_team=4, games_per_team=0)
+    p = roster()
+
+    game_id = add_game(client, goals=[{'scorer_id': p[0], 'assists': [p[1]]},
+                                      {'scorer_id': p[1], 'assists': [p[2], p[3]]}])
+
+    first, second = [goal.id for goal in Goal.query.filter_by(game_id=game_id).order_by(Goal.id)]
+    assert stored_assists(game_id) == [(first, p[1]), (second, p[2]), (second, p[3])]
+
+
+def test_edit_form_round_trips_linked_assists(client, seed_club):
+    seed_club(teams=1, players_per_team=4, games_per_team=0)
+    p = roster()
+    game_id = add_game(client, goals=[{'scorer_id': p[0]}, {'scorer_id': p[1], 'assists': [p[2]]}])
+    first, second = [goal.id for goal in Goal.query.filter_by(game_id=game_id).order_by(Goal.id)]
+
+    page = client.get(f'/game-tracker/{game_id}/edit').get_data(as_text=True)
+    assert f'"assists": [{p[2]}]' in page
+
+    # The form posts the goals back with their linked assists
+    client.post(f'/game-tracker/{game_id}/edit', data=game_form(
+        notes='edited', goals=[{'id': first, 'scorer_id': p[0]}, {'id': second, 'scorer_id': p[1], 'assists': [p[2]]}]))
+
+    assert stored_assists(game_id) == [(second, p[2])]
+
+
+def test_edit_keeps_scorers_who_have_changed_teams(client, seed_club):
+    seed_club(teams=2, players_per_team=3, games_per_team=0)
+    p = roster()
+    game_id = add_game(client, goals=[{'scorer_id': p[0], 'assists': [p[1]]}])
+    goal_id = Goal.query.filter_by(game_id=game_id).one().id
+
+    # Both players move to 10U after the game
+    Player.query.filter(Player.id.in_(p[:2])).update({'team': '10U'})
+    db.session.commit()
+
+    response = client.post(f'/game-tracker/{game_id}/edit', data=game_form(
+        notes='edited', goals=[{'id': goal_id, 'scorer_id': p[0], 'assists': [p[1]]}]))
+
+    assert response.status_code == 302
+    assert db.session.get(Game, game_id).notes == 'edited'
+
+
+def test_edit_still_checks_new_scorers(client, seed_club):
+    seed_club(teams=2, players_per_team=3, games_per_team=0)
+    p, other = roster(), roster('10U')
+    game_id = add_game(client, goals=[{'scorer_id': p[0]}])
+    goal_id = Goal.query.filter_by(game_id=game_id).one().id
+
+    response = client.post(f'/game-tracker/{game_id}/edit', data=game_form(
+        goals=[{'id': goal_id, 'scorer_id': p[0]}, {'scorer_id': other[0]}]))
+
+    assert response.status_code == 200
+    assert Goal.query.filter_by(game_id=game_id).count() == 1
+
+
+def goal_rows(game_id):
+    return [(goal.scorer_id, goal.period, goal.time_scored, goal.goal_type)
+            for goal in Goal.query.filter_by(game_id=game_id).order_by(Goal.id)]
+
+
+def assist_rows(game_id):
+    return [(assist.assister_id, assist.period, assist.time_assisted, assist.assist_type)
+            for assist in Assist.query.filter_by(game_id=game_id).order_by(Assist.id)]
+
+
+def scoresheet_writes(statements):
+    return [statement for statement in statements
+            if re.match(r'(INSERT INTO|UPDATE|DELETE FROM) (goal|assist)\b', statement)]
+
+
+def test_edit_without_goal_fields_keeps_stored_goals(client, count_queries, seed_club):
+    seed_club(teams=1, players_per_team=3, games_per_team=0)
+    p = roster()
+    game_id = add_game(client, goals=[{'scorer_id': p[0], 'period': 2, 'time_scored': '5:30',
+                                       'goal_type': 'power_play', 'assists': [p[1]]}])
+    goal_id = Goal.query.filter_by(game_id=game_id).one().id
+    goals, assists = goal_rows(game_id), assist_rows(game_id)
+
+    # An older form posts only the goal id and scorer
+    statements = count_queries(lambda: client.post(f'/game-tracker/{game_id}/edit', data=game_form(
+        notes='edited', goals=[{'id': goal_id, 'scorer_id': p[0], 'assists': [p[1]]}])))
+
+    assert goal_rows(game_id) == goals == [(p[0], 2, '5:30', 'power_play')]
+    assert assist_rows(game_id) == assists
+    assert scoresheet_writes(statements) == []
+
+
+def test_edit_page_posts_back_stored_goal_fields(client, count_queries, seed_club):
+    seed_club(teams=1, players_per_team=3, games_per_team=0)
+    p = roster()
+    game_id = add_game(client, goals=[{'scorer_id': p[0], 'period': 3, 'time_scored': '1:15',
+                                       'goal_type': 'short_handed', 'assists': [p[1]]}])
+
+    page = client.get(f'/game-tracker/{game_id}/edit').get_data(as_text=True)
+    existing = json.loads(page.split('const existingGoals = ', 1)[1].split(';\n', 1)[0])
+    statements = count_queries(lambda: client.post(f'/game-tracker/{game_id}/edit', data=game_form(
+        notes='edited', goals=existing)))
+
+    assert existing[0]['period'] == 3 and existing[0]['goal_type'] == 'short_handed'
+    assert scoresheet_writes(statements) == []
+
+
+def test_edit_updates_only_the_goal_fields_sent(client, seed_club):
+    seed_club(teams=1, players_per_team=3, games_per_team=0)
+    p = roster()
+    game_id = add_game(client, goals=[{'scorer_id': p[0], 'period': 2, 'time_scored': '5:30',
+                                       'goal_type': 'power_play', 'assists': [p[1]]}])
+    goal_id = Goal.query.filter_by(game_id=game_id).one().id
+
+    client.post(f'/game-tracker/{game_id}/edit', data=game_form(
+        goals=[{'id': goal_id, 'scorer_id': p[0], 'period': 3, 'assists': [p[1]]}, {'scorer_id': p[2]}]))
+
+    assert goal_rows(game_id) == [(p[0], 3, '5:30', 'power_play'), (p[2], 1, '', 'even_strength')]
+    assert assist_rows(game_id) == [(p[1], 3, '5:30', 'primary')]
@@ -0,0 +1,113 @@
+"""Cached team standings."""
+
+from datetime import date, timedelta
+
+import app.routes
+from app import db
+from app.models import Game, TeamSeasonStanding
+from app.standings_utils import get_standings
+
+SEASON = '2024-25'
+SEASON_START = date(2024, 10, 1)
+
+
+def add_games(user, team_name, *scores, status='completed', rink='Away Rink', first_day=0):
+    """Add games a day apart, oldest first; scores are (badgers, opponent) pairs."""
+    games = [Game(game_date=SEASON_START + timedelta(days=first_day + day), opponent_team='Opponent',
+                  rink_name=rink, team_name=team_name, badgers_score=badgers, opponent_score=opponent,
+                  game_status=status, user_id=user.id)
+             for day, (badgers, opponent) in enumerate(scores)]
+    db.session.add_all(games)
+    db.session.commit()
+    return games
+
+
+def standings_by_team(team_names=None):
+    return {standing.team_name: standing for standing in get_standings(SEASON, team_names)}
+
+
+def test_records_points_and_order(user):
+    add_games(user, '8U', (3, 1), (0, 2), (2, 2), (4, 0), (1, 0))
+    add_games(user, '10U', (1, 1), (2, 3))
+    add_games(user, '12U', (5, 0), (6, 1), (2, 0), (1, 1))
+
+    standings = get_standings(SEASON)
+
+    assert [standing.team_name for standing in standings] == ['12U', '8U', '10U']
+    eight = standings[1]
+    assert (eight.games_played, eight.wins, eight.losses, eight.ties, eight.points) == (5, 3, 1, 1, 7)
+    assert (eight.goals_for, eight.goals_against, eight.goal_differential) == (10, 5, 5)
+    assert (standings[0].points, standings[2].points) == (7, 1)
+
+
+def test_scheduled_and_cancelled_games_are_left_out(user):
+    add_games(user, '8U', (2, 1))
+    add_games(user, '8U', (0, 0), status='scheduled', first_day=1)
+    add_games(user, '8U', (0, 5), status='cancelled', first_day=2)
+
+    standing = standings_by_team()['8U']
+
+    assert (standing.games_played, standing.wins, standing.losses, standing.points) == (1, 1, 0, 2)
+    assert standing.streak == 'W1'
+
+
+def test_streak_counts_back_from_the_latest_game(user):
+    add_games(user, '8U', (1, 0), (0, 1), (2, 1), (3, 0))
+    add_games(user, '10U', (1, 1), (0, 3), (0, 2), (1, 4))
+    add_games(user, '12U', (1, 0), (2, 2))
+    # Same day as 12U's tie but stored later, so it ranks as the latest game
+    add_games(user, '12U', (3, 1), first_day=1)
+
+    streaks = {team: standing.streak for team, standing in standings_by_team().items()}
+
+    assert streaks == {'8U': 'W2', '10U': 'L3', '12U': 'W1'}
+
+
+def test_home_rinks_split_home_and_away_records(app, user):
+    app.config['HOME_RINKS'] = ['Bayonne Rink']
+    add_games(user, '8U', (3, 1), (0, 2), rink='bayonne rink')
+    add_games(user, '8U', (2, 2), first_day=2)
+
+    standing = standings_by_team()['8U']
+
+    assert (standing.home_wins, standing.home_losses, standing.home_ties) == (1, 1, 0)
+    assert (standing.away_wins, standing.away_losses, standing.away_ties) == (0, 0, 1)
+
+
+def test_game_edit_drops_only_the_affected_cached_standing(user):
+    eight_games = add_games(user, '8U', (3, 1), (2, 0))
+    ten_games = add_games(user, '10U', (1, 0))
+    get_standings(SEASON)
+    assert TeamSeasonStanding.query.count() == 2
+
+    ten_games[0].notes = 'Great game'
+    db.session.commit()
+    assert TeamSeasonStanding.query.count() == 2
+
+    eight_games[1].opponent_score = 5
+    db.session.commit()
+    assert [standing.team_name for standing in TeamSeasonStanding.query] == ['10U']
+
+    standing = standings_by_team()['8U']
+    assert (standing.wins, standing.losses, standing.points, standing.streak) == (1, 1, 2, 'L1')
+    assert TeamSeasonStanding.query.count() == 2
+
+
+def test_standings_api(client, user):
+    add_games(user, '8U', (3, 1))
+
+    data = client.get(f'/api/standings?season={SEASON}').get_json()
+
+    assert data['success'] and data['season'] == SEASON
+    assert [(row['team_name'], row['points'], row['streak']) for row in data['standings']] == [('8U', 2, 'W1')]
+
+
+def test_standings_api_error_is_a_server_error(client, monkeypatch):
+    def fail(*args, **kwargs):
+        raise RuntimeError('database unavailable')
+    monkeypatch.setattr(app.routes, 'get_standings', fail)
+
+    response = client.get(f'/api/standings?season={SEASON}')
+
+    assert response.status_code == 500
+    assert response.get_json() == {'success': False, 'error': 'database unavailable'}
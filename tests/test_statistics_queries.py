@@ -0,0 +1,28 @@
+"""The statistics leaderboard and the roster do not issue a query per player."""
+
+import pytest
+
+from app.stats_utils import get_player_leaderboard
+
+
+@pytest.mark.parametrize('url', ['/game-tracker/statistics', '/roster'])
+def test_query_count_does_not_grow_with_players(client, count_queries, seed_club, url):
+    seed_club(teams=1, players_per_team=5)
+    client.get(url)
+    small = len(count_queries(lambda: client.get(url)))
+
+    seed_club(teams=1, players_per_team=50, first_team=1)
+    client.get(url)
+    large = len(count_queries(lambda: client.get(url)))
+
+    assert large == small
+
+
+def test_leaderboard_counts_goals_per_player(client, seed_club):
+    # Six games with one goal each, scored in turn by three players
+    seed_club(teams=1, players_per_team=3, games_per_team=6)
+
+    leaderboard = get_player_leaderboard(team='8U')
+
+    assert [(row['goals'], row['points']) for row in leaderboard] == [(2, 2)] * 3
+    assert client.get('/game-tracker/statistics').status_code == 200